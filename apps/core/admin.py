@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from .counters import recount_alert_counters
 from .models import (
     Alert,
     Campaign,
@@ -56,8 +57,30 @@ class UserAdmin(admin.ModelAdmin):
         return User.all_objects.all()
 
 
+class AlertCounterAdminMixin:
+    """Edicoes e exclusoes pelo admin recalculam os contadores diarios dos dias afetados."""
+
+    def save_model(self, request, obj, form, change):
+        company_days = {(obj.company_id, obj.record_date)}
+        if change:
+            company_days.update(
+                type(obj).all_objects.filter(pk=obj.pk).values_list('company_id', 'record_date')
+            )
+        super().save_model(request, obj, form, change)
+        recount_alert_counters(company_days)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        recount_alert_counters({(obj.company_id, obj.record_date)})
+
+    def delete_queryset(self, request, queryset):
+        company_days = set(queryset.values_list('company_id', 'record_date'))
+        super().delete_queryset(request, queryset)
+        recount_alert_counters(company_days)
+
+
 @admin.register(MoodRecord)
-class MoodRecordAdmin(admin.ModelAdmin):
+class MoodRecordAdmin(AlertCounterAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'company', 'totem', 'record_date', 'sentiment', 'mood_score', 'channel')
     list_filter = ('company', 'totem', 'record_date', 'sentiment', 'channel')
 
@@ -76,7 +99,7 @@ class RiskIndicatorAdmin(admin.ModelAdmin):
 
 
 @admin.register(Complaint)
-class ComplaintAdmin(admin.ModelAdmin):
+class ComplaintAdmin(AlertCounterAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'company', 'totem', 'record_date', 'category', 'channel')
     list_filter = ('company', 'totem', 'record_date', 'category')
 
@@ -0,0 +1,21 @@
+"""Leitura em streaming das respostas de campanha para os relatorios.
+
+Busca apenas o JSON ``responses`` (e o id do grupo) em lotes de
+``CAMPAIGN_ANALYTICS_CHUNK_SIZE``. No PostgreSQL ``iterator()`` abre um cursor
+do lado do servidor, entao o pico de memoria nao cresce com o numero de
+respondentes; atras de pgbouncer em modo transaction use
+``DB_DISABLE_SERVER_SIDE_CURSORS=1``.
+"""
+
+from django.conf import settings
+
+
+def iter_campaign_answers(responses_qs, group_id_field=None, chunk_size=None):
+    """Gera ``(responses, group_id)`` sem montar instancias de CampaignResponse."""
+    chunk_size = chunk_size or settings.CAMPAIGN_ANALYTICS_CHUNK_SIZE
+    responses_qs = responses_qs.order_by()
+    if group_id_field is None:
+        for answers_by_step in responses_qs.values_list('responses', flat=True).iterator(chunk_size=chunk_size):
+            yield answers_by_step, None
+        return
+    yield from responses_qs.values_list('responses', group_id_field).iterator(chunk_size=chunk_size)
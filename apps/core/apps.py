@@ -5,3 +5,11 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     label = 'core'
+
+    def ready(self) -> None:
+        from django.db.backends.signals import connection_created
+
+        from ciss_gestao.metrics import install_query_wrapper
+        from . import signals  # noqa: F401
+
+        connection_created.connect(install_query_wrapper, dispatch_uid='request_metrics_query_wrapper')
@@ -0,0 +1,203 @@
+"""Benchmark das telas pesadas sobre as empresas sinteticas.
+
+Usado pelo comando ``run_benchmarks``: mede cada endpoint com o cliente de
+teste do Django (middlewares inclusos) e grava o resultado em JSON para
+comparar entre commits. ``measure_report_memory`` mede o pico de memoria
+Python (tracemalloc) da agregacao do relatorio de campanha.
+"""
+
+import statistics
+import subprocess
+import tracemalloc
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.tenancy.models import Company
+
+from .analytics import iter_campaign_answers
+from .models import Campaign, CampaignResponse
+from .synthetic import SYNTHETIC_SLUG_PREFIX, synthetic_dataset_summary
+
+
+BENCHMARK_USERNAME = 'benchmark-master'
+
+
+def benchmark_targets(company, campaign):
+    targets = [
+        ('dashboard', reverse('dashboard')),
+        ('complaints-list', reverse('complaints-list')),
+        ('master-dashboard', reverse('master-dashboard')),
+        ('master-metrics', f"{reverse('master-metrics')}?company_id={company.id}"),
+    ]
+    if campaign is not None:
+        targets += [
+            ('campaigns-report', reverse('campaigns-report', args=[campaign.uuid])),
+            ('campaigns-report-pdf', reverse('campaigns-report-pdf', args=[campaign.uuid])),
+        ]
+    return targets
+
+
+def _benchmark_client(company):
+    user, created = get_user_model().objects.get_or_create(
+        username=BENCHMARK_USERNAME,
+        defaults={'is_superuser': True, 'is_staff': True},
+    )
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=['password'])
+    # 127.0.0.1 esta sempre em ALLOWED_HOSTS (testserver nao).
+    client = Client(SERVER_NAME='127.0.0.1')
+    client.force_login(user)
+    session = client.session
+    session['company_id'] = company.id
+    session.save()
+    return client
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run_benchmarks(company=None, repeat=5, warmup=1, keep_cache=False, only=None, log=None):
+    log = log or (lambda message: None)
+    company = company or Company.objects.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX).order_by('id').first()
+    if company is None:
+        raise ValueError('Nenhuma empresa sintetica encontrada. Rode generate_synthetic_tenants antes.')
+    campaign = (
+        Campaign.all_objects.filter(company=company, status=Campaign.Status.FINISHED)
+        .order_by('-end_date')
+        .first()
+    )
+    client = _benchmark_client(company)
+
+    results = {}
+    for name, url in benchmark_targets(company, campaign):
+        if only and name not in only:
+            continue
+        for _ in range(warmup):
+            client.get(url)
+
+        timings = []
+        status_code = None
+        for _ in range(repeat):
+            if not keep_cache:
+                cache.clear()
+            started_at = perf_counter()
+            response = client.get(url)
+            timings.append((perf_counter() - started_at) * 1000)
+            status_code = response.status_code
+
+        # Contagem de SQL numa execucao separada para nao pesar no tempo medido.
+        if not keep_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            client.get(url)
+
+        results[name] = {
+            'url': url,
+            'status': status_code,
+            'runs': len(timings),
+            'min_ms': round(min(timings), 2),
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(_percentile(timings, 95), 2),
+            'mean_ms': round(statistics.fmean(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'queries': len(captured.captured_queries),
+        }
+        log(f"{name}: p50 {results[name]['p50_ms']} ms, {results[name]['queries']} consultas (HTTP {status_code}).")
+
+    return {
+        'commit': _git_commit(),
+        'created_at': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'company_id': company.id,
+        'campaign_uuid': str(campaign.uuid) if campaign else None,
+        'repeat': repeat,
+        'keep_cache': keep_cache,
+        'dataset': synthetic_dataset_summary(),
+        'results': results,
+    }
+
+
+def compare_benchmarks(previous, current):
+    rows = []
+    for name, result in current['results'].items():
+        before = previous.get('results', {}).get(name)
+        if not before:
+            continue
+        delta = result['p50_ms'] - before['p50_ms']
+        percent = (delta * 100 / before['p50_ms']) if before['p50_ms'] else 0
+        rows.append(
+            {
+                'name': name,
+                'before_ms': before['p50_ms'],
+                'after_ms': result['p50_ms'],
+                'delta_percent': round(percent, 1),
+                'queries_before': before.get('queries'),
+                'queries_after': result['queries'],
+            }
+        )
+    return rows
+
+
+def _peak_memory_kb(func):
+    tracemalloc.start()
+    try:
+        started_at = perf_counter()
+        func()
+        elapsed = perf_counter() - started_at
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1), round(elapsed * 1000, 2)
+
+
+def measure_report_memory(campaign, log=None):
+    """Pico de memoria: instancias completas (modo antigo) x streaming x _build_results."""
+    from ciss_gestao.views import CampaignReportView
+
+    log = log or (lambda message: None)
+    responses_qs = CampaignResponse.all_objects.filter(campaign=campaign)
+
+    def load_instances():
+        for response in list(responses_qs):
+            response.responses
+
+    def stream_answers():
+        for _ in iter_campaign_answers(responses_qs, 'ghe_id'):
+            pass
+
+    def build_results():
+        CampaignReportView()._build_results(responses_qs, {}, {})
+
+    results = {'responses': responses_qs.count()}
+    for name, func in (
+        ('model_instances', load_instances),
+        ('streaming', stream_answers),
+        ('build_results', build_results),
+    ):
+        peak_kb, elapsed_ms = _peak_memory_kb(func)
+        results[name] = {'peak_kb': peak_kb, 'elapsed_ms': elapsed_ms}
+        log(f'memoria {name}: pico {peak_kb} KB em {elapsed_ms} ms.')
+    return results
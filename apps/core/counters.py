@@ -0,0 +1,289 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from apps.tenancy.models import Company
+
+from .models import (
+    AlertDailyCounter,
+    Campaign,
+    CampaignDomainScoreCounter,
+    CampaignResponse,
+    CampaignResponseMonthlyCounter,
+    Complaint,
+    MoodRecord,
+)
+
+
+NEGATIVE_SENTIMENTS = ('bad', 'very_bad')
+MASTER_DASHBOARD_CACHE_KEY = 'master-dashboard:counters'
+# Rede de seguranca para escritas que nao disparam signals (update/bulk_create).
+MASTER_DASHBOARD_CACHE_TIMEOUT = 10 * 60
+
+
+def _increment_row(model, lookup, create=True, **values):
+    increments = {field: F(field) + value for field, value in values.items()}
+    queryset = model.all_objects.filter(**lookup)
+    if queryset.update(**increments) or not create:
+        return
+    try:
+        with transaction.atomic():
+            model.all_objects.create(**lookup, **values)
+    except IntegrityError:
+        # Outro processo criou a linha entre o UPDATE e o INSERT.
+        queryset.update(**increments)
+
+
+# Os contadores diarios sao mantidos so por chamadas explicitas (nao ha
+# signals): quem grava humor/denuncia chama increment_* na mesma transacao;
+# quem altera ou remove chama recount_alert_counters para os dias afetados.
+def increment_alert_counters(company_id, record_date, moods=0, negative_moods=0, complaints=0):
+    if not (moods or negative_moods or complaints):
+        return
+    _increment_row(
+        AlertDailyCounter,
+        {'company_id': company_id, 'record_date': record_date},
+        mood_count=moods,
+        negative_mood_count=negative_moods,
+        complaint_count=complaints,
+    )
+
+
+def increment_counters_for_records(mood_records=(), complaints=()):
+    moods = Counter()
+    negative_moods = Counter()
+    complaint_totals = Counter()
+    for record in mood_records:
+        key = (record.company_id, record.record_date)
+        moods[key] += 1
+        if record.sentiment in NEGATIVE_SENTIMENTS:
+            negative_moods[key] += 1
+    for complaint in complaints:
+        complaint_totals[(complaint.company_id, complaint.record_date)] += 1
+    # Ordem fixa de linhas: dois lotes concorrentes travam os contadores na mesma sequencia.
+    for company_id, record_date in sorted(set(moods) | set(complaint_totals)):
+        key = (company_id, record_date)
+        increment_alert_counters(
+            company_id,
+            record_date,
+            moods=moods[key],
+            negative_moods=negative_moods[key],
+            complaints=complaint_totals[key],
+        )
+
+
+def window_totals(company_id, period_start, period_end):
+    totals = AlertDailyCounter.objects.for_tenant(company_id).filter(
+        record_date__gte=period_start,
+        record_date__lte=period_end,
+    ).aggregate(
+        mood_count=Sum('mood_count'),
+        negative_mood_count=Sum('negative_mood_count'),
+        complaint_count=Sum('complaint_count'),
+    )
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def window_totals_by_company(company_ids, period_start, period_end):
+    rows = AlertDailyCounter.all_objects.filter(
+        company_id__in=company_ids,
+        record_date__gte=period_start,
+        record_date__lte=period_end,
+    ).values('company_id').annotate(
+        moods=Sum('mood_count'),
+        negative_moods=Sum('negative_mood_count'),
+        complaints=Sum('complaint_count'),
+    ).order_by()
+    return {
+        row['company_id']: {
+            'mood_count': row['moods'] or 0,
+            'negative_mood_count': row['negative_moods'] or 0,
+            'complaint_count': row['complaints'] or 0,
+        }
+        for row in rows
+    }
+
+
+def rebuild_alert_counters(company_ids, days=None):
+    """Recalcula os contadores diarios (todos ou so ``days``) a partir das tabelas de coleta."""
+    day_filter = {} if days is None else {'record_date__in': sorted(set(days))}
+    counters = {}
+    mood_rows = (
+        MoodRecord.all_objects.filter(company_id__in=company_ids, **day_filter)
+        .values('company_id', 'record_date')
+        .annotate(
+            total=Count('id'),
+            negative=Count('id', filter=Q(sentiment__in=NEGATIVE_SENTIMENTS)),
+        )
+        .order_by()
+    )
+    for row in mood_rows.iterator():
+        counter = counters.setdefault(
+            (row['company_id'], row['record_date']),
+            AlertDailyCounter(company_id=row['company_id'], record_date=row['record_date']),
+        )
+        counter.mood_count = row['total']
+        counter.negative_mood_count = row['negative']
+
+    complaint_rows = (
+        Complaint.all_objects.filter(company_id__in=company_ids, **day_filter)
+        .values('company_id', 'record_date')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in complaint_rows.iterator():
+        counter = counters.setdefault(
+            (row['company_id'], row['record_date']),
+            AlertDailyCounter(company_id=row['company_id'], record_date=row['record_date']),
+        )
+        counter.complaint_count = row['total']
+
+    with transaction.atomic():
+        AlertDailyCounter.all_objects.filter(company_id__in=company_ids, **day_filter).delete()
+        AlertDailyCounter.all_objects.bulk_create(counters.values(), batch_size=1000)
+    return len(counters)
+
+
+def recount_alert_counters(company_days):
+    """Recalcula os dias de ``company_days`` (pares empresa/data) apos editar ou remover registros."""
+    days_by_company = {}
+    for company_id, record_date in company_days:
+        days_by_company.setdefault(company_id, set()).add(record_date)
+    for company_id, days in days_by_company.items():
+        rebuild_alert_counters([company_id], days=days)
+
+
+def _response_month(completed_at):
+    return timezone.localdate(completed_at).replace(day=1)
+
+
+def campaign_response_contributions(rows):
+    """Soma (completed_at, responses) em contadores por mes e por dominio."""
+    from ciss_gestao.views import CampaignReportView
+
+    answer_score = CampaignReportView.ANSWER_SCORE
+    domain_steps = CampaignReportView.DOMAIN_BY_STEP
+    months = Counter()
+    score_sums = Counter()
+    answer_counts = Counter()
+    for completed_at, responses in rows:
+        if completed_at is not None:
+            months[_response_month(completed_at)] += 1
+        for step_key, answers in (responses or {}).items():
+            if step_key not in domain_steps or not answers:
+                continue
+            for item in answers:
+                score = answer_score.get(item.get('answer', ''))
+                if score:
+                    score_sums[step_key] += score
+                    answer_counts[step_key] += 1
+    return months, score_sums, answer_counts
+
+
+def _apply_response_contributions(company_id, contributions, sign=1):
+    months, score_sums, answer_counts = contributions
+    # Ordem fixa de linhas (mes, depois dominio) evita deadlock entre respostas concorrentes.
+    for month, total in sorted(months.items()):
+        _increment_row(
+            CampaignResponseMonthlyCounter,
+            {'company_id': company_id, 'month': month},
+            create=sign > 0,
+            response_count=sign * total,
+        )
+    for step_key, total in sorted(answer_counts.items()):
+        _increment_row(
+            CampaignDomainScoreCounter,
+            {'company_id': company_id, 'step_key': step_key},
+            create=sign > 0,
+            score_sum=sign * score_sums[step_key],
+            answer_count=sign * total,
+        )
+
+
+def increment_campaign_response_counters(response):
+    contributions = campaign_response_contributions([(response.completed_at, response.responses)])
+    _apply_response_contributions(response.company_id, contributions)
+
+
+def campaign_contributions(campaign):
+    rows = CampaignResponse.all_objects.filter(campaign=campaign).order_by().values_list('completed_at', 'responses')
+    return campaign_response_contributions(rows.iterator(chunk_size=settings.CAMPAIGN_ANALYTICS_CHUNK_SIZE))
+
+
+def subtract_campaign_response_counters(company_id, contributions):
+    _apply_response_contributions(company_id, contributions, sign=-1)
+
+
+def rebuild_campaign_response_counters(company_ids):
+    """Recalcula os contadores de respostas a partir de CampaignResponse."""
+    monthly = []
+    domains = []
+    for company_id in company_ids:
+        rows = (
+            CampaignResponse.all_objects.filter(company_id=company_id)
+            .order_by()
+            .values_list('completed_at', 'responses')
+            .iterator(chunk_size=settings.CAMPAIGN_ANALYTICS_CHUNK_SIZE)
+        )
+        months, score_sums, answer_counts = campaign_response_contributions(rows)
+        monthly += [
+            CampaignResponseMonthlyCounter(company_id=company_id, month=month, response_count=total)
+            for month, total in months.items()
+        ]
+        domains += [
+            CampaignDomainScoreCounter(
+                company_id=company_id,
+                step_key=step_key,
+                score_sum=score_sums[step_key],
+                answer_count=total,
+            )
+            for step_key, total in answer_counts.items()
+        ]
+
+    with transaction.atomic():
+        CampaignResponseMonthlyCounter.all_objects.filter(company_id__in=company_ids).delete()
+        CampaignDomainScoreCounter.all_objects.filter(company_id__in=company_ids).delete()
+        CampaignResponseMonthlyCounter.all_objects.bulk_create(monthly, batch_size=1000)
+        CampaignDomainScoreCounter.all_objects.bulk_create(domains, batch_size=1000)
+    return len(monthly) + len(domains)
+
+
+def _compute_master_dashboard_counters():
+    company_totals = Company.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    campaign_totals = Campaign.all_objects.aggregate(
+        total=Count('id'),
+        **{status: Count('id', filter=Q(status=status)) for status in Campaign.Status.values},
+    )
+    initial_company = Company.objects.filter(is_active=True).order_by('name').values('id', 'name').first()
+    return {
+        'initial_company_id': initial_company['id'] if initial_company else '',
+        'initial_company_name': initial_company['name'] if initial_company else '',
+        'total_companies': company_totals['total'],
+        'active_companies': company_totals['active'],
+        'total_campaigns': campaign_totals['total'],
+        'active_campaigns': campaign_totals[Campaign.Status.ACTIVE],
+        'paused_campaigns': campaign_totals[Campaign.Status.PAUSED],
+        'planned_campaigns': campaign_totals[Campaign.Status.PLANNED],
+        'finished_campaigns': campaign_totals[Campaign.Status.FINISHED],
+    }
+
+
+def master_dashboard_counters():
+    counters = cache.get(MASTER_DASHBOARD_CACHE_KEY)
+    if counters is None:
+        counters = _compute_master_dashboard_counters()
+        cache.set(MASTER_DASHBOARD_CACHE_KEY, counters, MASTER_DASHBOARD_CACHE_TIMEOUT)
+    return counters
+
+
+def invalidate_master_dashboard_counters():
+    # Apos o commit: invalidar antes deixaria outra requisicao recalcular
+    # com os dados antigos e guardar no cache.
+    transaction.on_commit(lambda: cache.delete(MASTER_DASHBOARD_CACHE_KEY))
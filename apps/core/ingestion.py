@@ -0,0 +1,159 @@
+"""Ingestao write-behind dos toques de humor do totem via Redis stream.
+
+Opcional (``TOTEM_MOOD_INGESTION = 'stream'``). A view grava um evento
+compacto no stream e responde; o comando ``drain_mood_stream`` consome em
+lote com ``bulk_create``. Se o Redis falhar, a view grava de forma sincrona.
+"""
+
+import logging
+import socket
+from datetime import date
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import transaction
+
+from .counters import increment_counters_for_records
+from .models import MoodRecord
+
+try:
+    import django_rq
+except ImportError:  # optional dependency in local setup
+    django_rq = None
+
+try:
+    from redis.exceptions import ResponseError
+except ImportError:  # optional dependency in local setup
+    ResponseError = Exception
+
+
+logger = logging.getLogger(__name__)
+
+MOOD_STREAM_GROUP = 'mood-ingestion'
+
+
+def stream_ingestion_enabled() -> bool:
+    return settings.TOTEM_MOOD_INGESTION == 'stream' and django_rq is not None
+
+
+def _connection():
+    return django_rq.get_connection('default')
+
+
+def append_mood_event(company_id, totem_id, department_id, sentiment, mood_score, record_date) -> bool:
+    if not stream_ingestion_enabled():
+        return False
+    try:
+        _connection().xadd(
+            settings.TOTEM_MOOD_STREAM_KEY,
+            {
+                'e': uuid4().hex,
+                'c': company_id,
+                't': totem_id or '',
+                'd': department_id or '',
+                's': sentiment,
+                'm': mood_score,
+                'r': record_date.isoformat(),
+            },
+            maxlen=settings.TOTEM_MOOD_STREAM_MAXLEN,
+            approximate=True,
+        )
+    except Exception:
+        logger.exception('Falha ao gravar humor no stream; usando gravacao sincrona.')
+        return False
+    return True
+
+
+def _ensure_group(connection):
+    try:
+        connection.xgroup_create(
+            settings.TOTEM_MOOD_STREAM_KEY,
+            MOOD_STREAM_GROUP,
+            id='0',
+            mkstream=True,
+        )
+    except ResponseError as exc:
+        if 'BUSYGROUP' not in str(exc):
+            raise
+
+
+def _decode(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+
+def _build_record(fields):
+    fields = {_decode(key): _decode(value) for key, value in fields.items()}
+    record_date = date.fromisoformat(fields['r'])
+    return MoodRecord(
+        company_id=int(fields['c']),
+        totem_id=int(fields['t']) if fields.get('t') else None,
+        department_id=int(fields['d']) if fields.get('d') else None,
+        sentiment=fields['s'],
+        mood_score=int(fields['m']),
+        record_date=record_date,
+        period_start=record_date.replace(day=1),
+        period_end=record_date,
+        channel='totem',
+        client_event_id=fields['e'],
+    )
+
+
+def drain_mood_events(batch_size=None, block_ms=1000, consumer=None, claim_idle_ms=60000):
+    """Le um lote do stream, grava com bulk_create e confirma (XACK).
+
+    Retorna o conjunto de company_ids com registros gravados. Mensagens
+    pendentes de consumidores que cairam sao reprocessadas; o
+    ``client_event_id`` (unico por empresa/data) evita duplicidade.
+    """
+    connection = _connection()
+    stream_key = settings.TOTEM_MOOD_STREAM_KEY
+    batch_size = batch_size or settings.TOTEM_MOOD_STREAM_BATCH_SIZE
+    consumer = consumer or socket.gethostname()
+    _ensure_group(connection)
+
+    _, messages, *_ = connection.xautoclaim(
+        stream_key,
+        MOOD_STREAM_GROUP,
+        consumer,
+        min_idle_time=claim_idle_ms,
+        start_id='0-0',
+        count=batch_size,
+    )
+    if not messages:
+        response = connection.xreadgroup(
+            MOOD_STREAM_GROUP,
+            consumer,
+            {stream_key: '>'},
+            count=batch_size,
+            block=block_ms,
+        )
+        messages = response[0][1] if response else []
+    if not messages:
+        return set()
+
+    records = []
+    for _, fields in messages:
+        if not fields:
+            continue
+        try:
+            records.append(_build_record(fields))
+        except (KeyError, ValueError):
+            logger.warning('Evento de humor invalido descartado do stream: %s', fields)
+    if records:
+        # Mensagens reentregues ja gravadas nao entram de novo nem nos contadores.
+        existing = set(
+            MoodRecord.all_objects.filter(
+                company_id__in={record.company_id for record in records},
+                record_date__in={record.record_date for record in records},
+                client_event_id__in=[record.client_event_id for record in records],
+            ).values_list('company_id', 'client_event_id')
+        )
+        records = [
+            record for record in records
+            if (record.company_id, record.client_event_id) not in existing
+        ]
+        with transaction.atomic():
+            MoodRecord.all_objects.bulk_create(records, ignore_conflicts=True)
+            increment_counters_for_records(mood_records=records)
+    connection.xack(stream_key, MOOD_STREAM_GROUP, *[message_id for message_id, _ in messages])
+    return {record.company_id for record in records}
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.ingestion import drain_mood_events, stream_ingestion_enabled
+from apps.tenancy.models import Company
+
+
+class Command(BaseCommand):
+    help = 'Consome o stream Redis de humor do totem e grava os registros em lote.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Processa um unico lote e encerra.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Quantidade maxima de eventos por lote.',
+        )
+        parser.add_argument(
+            '--consumer',
+            help='Nome do consumidor no grupo do stream (padrao: hostname).',
+        )
+
+    def handle(self, *args, **options):
+        if not stream_ingestion_enabled():
+            raise CommandError("Ingestao via stream desativada (TOTEM_MOOD_INGESTION='stream' e django_rq).")
+
+        from ciss_gestao.views import enqueue_automatic_alerts_evaluation
+
+        while True:
+            company_ids = drain_mood_events(
+                batch_size=options.get('batch_size'),
+                consumer=options.get('consumer'),
+            )
+            if company_ids:
+                for company in Company.objects.filter(id__in=company_ids).only('id'):
+                    enqueue_automatic_alerts_evaluation(company)
+                self.stdout.write(f'Lote gravado para {len(company_ids)} empresa(s).')
+            if options['once']:
+                break
+        self.stdout.write(self.style.SUCCESS('Stream de humor processado.'))
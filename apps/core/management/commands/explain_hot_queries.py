@@ -0,0 +1,127 @@
+import re
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+
+from apps.core.models import Alert, Complaint, HelpRequest, MoodRecord
+from apps.tenancy.models import Company
+
+
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (?P<table>\w+)'),
+    'sqlite': re.compile(r'\bSCAN (?P<table>\w+)\b(?! USING (?:COVERING )?INDEX)'),
+}
+
+
+def build_hot_queries(company_id, period_start, period_end):
+    mood_qs = MoodRecord.objects.for_tenant(company_id).filter(
+        record_date__gte=period_start,
+        record_date__lte=period_end,
+    )
+    complaint_qs = Complaint.objects.for_tenant(company_id).filter(
+        record_date__gte=period_start,
+        record_date__lte=period_end,
+    )
+    any_totem_id = mood_qs.exclude(totem_id=None).values_list('totem_id', flat=True).first() or 0
+    any_department_id = mood_qs.exclude(department_id=None).values_list('department_id', flat=True).first() or 0
+    return [
+        ('mood_by_sentiment', mood_qs.values('sentiment').annotate(total=Count('id'))),
+        ('mood_by_department', mood_qs.values('department__name').annotate(total=Count('id'))),
+        ('mood_by_totem', mood_qs.filter(totem_id=any_totem_id).values('sentiment').annotate(total=Count('id'))),
+        ('mood_by_department_filter', mood_qs.filter(department_id=any_department_id).values('sentiment').annotate(total=Count('id'))),
+        ('complaint_by_category', complaint_qs.values('category').annotate(total=Count('id'))),
+        ('complaint_by_status', complaint_qs.values('complaint_status').annotate(total=Count('id'))),
+        ('complaint_by_totem', complaint_qs.filter(totem_id=any_totem_id).values('totem__name').annotate(total=Count('id'))),
+        (
+            'alert_open_today',
+            Alert.objects.for_tenant(company_id).filter(
+                alert_type='risk',
+                record_date=period_end,
+                status='open',
+            ),
+        ),
+        (
+            'alert_list_by_status',
+            Alert.objects.for_tenant(company_id).filter(status='open').order_by('-record_date'),
+        ),
+        (
+            'help_request_open',
+            HelpRequest.objects.for_tenant(company_id).filter(
+                status__in=[HelpRequest.Status.OPEN, HelpRequest.Status.IN_PROGRESS],
+            ),
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Executa EXPLAIN nas consultas do dashboard/relatorios/alertas e aponta varreduras sequenciais.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--company-id',
+            type=int,
+            help='ID da empresa usada nas consultas. Se omitido, usa a primeira empresa ativa.',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Janela (em dias) usada nos filtros de record_date.',
+        )
+        parser.add_argument(
+            '--force-index',
+            action='store_true',
+            help='PostgreSQL: desliga enable_seqscan para revelar consultas sem indice utilizavel.',
+        )
+        parser.add_argument(
+            '--verbose-plan',
+            action='store_true',
+            help='Exibe o plano completo de cada consulta.',
+        )
+        parser.add_argument(
+            '--fail-on-seq-scan',
+            action='store_true',
+            help='Retorna erro se alguma consulta usar varredura sequencial.',
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'Banco nao suportado: {connection.vendor}.')
+
+        company_id = options.get('company_id')
+        if company_id is None:
+            company_id = Company.objects.filter(is_active=True).order_by('id').values_list('id', flat=True).first()
+        if company_id is None:
+            raise CommandError('Nenhuma empresa encontrada.')
+
+        period_end = date.today()
+        period_start = period_end - timedelta(days=max(options['days'], 1) - 1)
+
+        flagged = []
+        with transaction.atomic():
+            if options['force_index'] and connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+
+            for label, queryset in build_hot_queries(company_id, period_start, period_end):
+                plan = queryset.explain()
+                tables = sorted({match.group('table') for match in pattern.finditer(plan)})
+                if tables:
+                    flagged.append(label)
+                    self.stdout.write(self.style.WARNING(f'[seq scan] {label}: {", ".join(tables)}'))
+                else:
+                    self.stdout.write(f'[ok] {label}')
+                if options['verbose_plan']:
+                    self.stdout.write(plan)
+                    self.stdout.write('')
+
+        if not flagged:
+            self.stdout.write(self.style.SUCCESS('Nenhuma varredura sequencial encontrada.'))
+            return
+        message = f'{len(flagged)} consulta(s) com varredura sequencial.'
+        if options['fail_on_seq_scan']:
+            raise CommandError(message)
+        self.stdout.write(self.style.WARNING(message))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.synthetic import delete_synthetic_tenants, generate_synthetic_tenants
+
+
+class Command(BaseCommand):
+    help = 'Gera empresas sinteticas (totens, estrutura, humores, denuncias e campanhas) para benchmarks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=1)
+        parser.add_argument('--totems', type=int, default=3)
+        parser.add_argument('--mood-records', type=int, default=100000, help='Registros de humor por empresa.')
+        parser.add_argument('--complaints', type=int, default=2000, help='Denuncias por empresa.')
+        parser.add_argument('--help-requests', type=int, default=200, help='Pedidos de ajuda por empresa.')
+        parser.add_argument('--campaigns', type=int, default=1, help='Campanhas encerradas por empresa.')
+        parser.add_argument('--campaign-responses', type=int, default=5000, help='Respostas por campanha.')
+        parser.add_argument('--days', type=int, default=365, help='Janela (dias ate hoje) dos registros.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Remove as empresas sinteticas existentes antes de gerar.',
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            removed = delete_synthetic_tenants()
+            self.stdout.write(f'{removed} empresas sinteticas removidas.')
+
+        companies = generate_synthetic_tenants(
+            companies=options['companies'],
+            totems=options['totems'],
+            mood_records=options['mood_records'],
+            complaints=options['complaints'],
+            help_requests=options['help_requests'],
+            campaigns=options['campaigns'],
+            campaign_responses=options['campaign_responses'],
+            days=options['days'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(f'{len(companies)} empresas sinteticas geradas.'))
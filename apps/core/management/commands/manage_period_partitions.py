@@ -0,0 +1,89 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.core.partitioning import (
+    PARTITIONED_TABLES,
+    convert_to_partitioned,
+    detach_old_partitions,
+    ensure_future_partitions,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = 'Particionamento mensal (PostgreSQL) de mood_records/complaints: converte, cria particoes futuras e arquiva antigas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            action='append',
+            choices=PARTITIONED_TABLES,
+            help='Tabela alvo (pode repetir). Se omitido, usa todas as suportadas.',
+        )
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Converte a tabela atual em tabela particionada (operacao unica, copia os dados).',
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Quantidade de meses futuros com particao pre-criada.',
+        )
+        parser.add_argument(
+            '--detach-older-than',
+            type=int,
+            help='Desanexa particoes com mais de N meses.',
+        )
+        parser.add_argument(
+            '--archive-schema',
+            default='archive',
+            help='Schema que recebe as particoes desanexadas.',
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Remove as particoes desanexadas em vez de arquivar.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Com --convert, remove as FKs de outras tabelas que apontam para a tabela convertida.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Particionamento disponivel apenas no PostgreSQL.')
+
+        tables = options.get('table') or list(PARTITIONED_TABLES)
+        for table in tables:
+            if options['convert']:
+                try:
+                    created = convert_to_partitioned(
+                        table,
+                        months_ahead=options['months_ahead'],
+                        force=options['force'],
+                    )
+                except RuntimeError as exc:
+                    raise CommandError(str(exc)) from exc
+                self.stdout.write(f'{table}: convertida ({len(created)} particoes criadas).')
+            elif not is_partitioned(table):
+                self.stdout.write(self.style.WARNING(f'{table}: nao particionada (use --convert).'))
+                continue
+
+            created = ensure_future_partitions(table, options['months_ahead'])
+            self.stdout.write(f'{table}: {len(created)} particoes futuras criadas.')
+
+            keep_months = options.get('detach_older_than')
+            if keep_months is not None:
+                detached = detach_old_partitions(
+                    table,
+                    keep_months,
+                    archive_schema=None if options['drop'] else options['archive_schema'],
+                    drop=options['drop'],
+                )
+                action = 'removidas' if options['drop'] else f"arquivadas em {options['archive_schema']}"
+                self.stdout.write(f'{table}: {len(detached)} particoes {action}.')
+
+        self.stdout.write(self.style.SUCCESS('Particionamento atualizado.'))
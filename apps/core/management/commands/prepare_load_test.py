@@ -0,0 +1,81 @@
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.models import Campaign, Department, GHE, JobFunction, MoodType, Totem
+from apps.core.synthetic import SYNTHETIC_SLUG_PREFIX
+from apps.tenancy.models import Company
+
+
+LOAD_TEST_CAMPAIGN_TITLE = 'Campanha Teste de Carga'
+
+
+class Command(BaseCommand):
+    help = 'Gera o JSON de configuracao usado por loadtests/locustfile.py (totens, humores e campanha ativa).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company-id', type=int, help='Empresa alvo (padrao: primeira empresa sintetica).')
+        parser.add_argument('--output', default='loadtests/config.json')
+
+    def handle(self, *args, **options):
+        companies = Company.objects.filter(is_active=True)
+        if options.get('company_id'):
+            company = companies.filter(id=options['company_id']).first()
+        else:
+            company = companies.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX).order_by('id').first()
+        if company is None:
+            raise CommandError('Empresa nao encontrada. Rode generate_synthetic_tenants ou informe --company-id.')
+
+        totems = list(Totem.all_objects.filter(company=company, is_active=True).values_list('slug', flat=True))
+        moods = list(MoodType.all_objects.filter(company=company, is_active=True).values_list('id', flat=True))
+        departments = list(
+            Department.all_objects.filter(company=company, is_active=True).values('id', 'ghe_id')
+        )
+        if not totems or not moods or not departments:
+            raise CommandError('A empresa precisa de totens, tipos de humor e setores ativos.')
+
+        campaign, _ = Campaign.all_objects.get_or_create(
+            company=company,
+            title=LOAD_TEST_CAMPAIGN_TITLE,
+            defaults={
+                'start_date': date.today(),
+                'end_date': date.today() + timedelta(days=30),
+                'status': Campaign.Status.ACTIVE,
+            },
+        )
+        if campaign.status != Campaign.Status.ACTIVE or campaign.end_date < date.today():
+            campaign.status = Campaign.Status.ACTIVE
+            campaign.end_date = max(campaign.end_date, date.today() + timedelta(days=30))
+            campaign.save(update_fields=['status', 'end_date', 'updated_at'])
+
+        ghe_ids = list(GHE.all_objects.filter(company=company, is_active=True).values_list('id', flat=True))
+        job_function_ids = list(
+            JobFunction.all_objects.filter(company=company, is_active=True).values_list('id', flat=True)
+        )
+        from ciss_gestao.views import CampaignAccessView
+
+        config = {
+            'company_slug': company.slug,
+            'totems': totems,
+            'mood_type_ids': moods,
+            'department_ids': [item['id'] for item in departments],
+            'campaign_uuid': str(campaign.uuid),
+            'campaign_profiles': [
+                {
+                    'ghe_id': item['ghe_id'] or (ghe_ids[0] if ghe_ids else ''),
+                    'department_id': item['id'],
+                    'job_function_id': job_function_ids[index % len(job_function_ids)] if job_function_ids else '',
+                }
+                for index, item in enumerate(departments)
+            ],
+            'campaign_step_questions': {
+                str(step): len(getattr(CampaignAccessView, f'_build_step{step}_context')({})['questions'])
+                for step in range(2, 9)
+            },
+        }
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(config, indent=2), encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(f'Configuracao de carga gravada em {output} (campanha {campaign.uuid}).'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.counters import rebuild_alert_counters
+from apps.tenancy.models import Company
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os contadores diarios de humor/denuncia usados pelos alertas a partir de MoodRecord e Complaint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company-id', type=int, action='append', dest='company_ids', help='Empresa (repetivel). Padrao: todas.')
+
+    def handle(self, *args, **options):
+        company_ids = options['company_ids'] or list(Company.objects.values_list('id', flat=True))
+        total = 0
+        for company_id in company_ids:
+            total += rebuild_alert_counters([company_id])
+        self.stdout.write(self.style.SUCCESS(f'Contadores recalculados: {total} dias em {len(company_ids)} empresas.'))
@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.benchmarks import compare_benchmarks, measure_report_memory, run_benchmarks
+from apps.core.models import Campaign
+from apps.tenancy.models import Company
+
+
+class Command(BaseCommand):
+    help = 'Mede dashboard, denuncias, relatorio/PDF de campanha e metricas master e grava o resultado em JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company-id', type=int, help='Empresa alvo (padrao: primeira empresa sintetica).')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument(
+            '--keep-cache',
+            action='store_true',
+            help='Nao limpa o cache entre as execucoes (mede o caminho com cache quente).',
+        )
+        parser.add_argument('--only', action='append', help='Endpoint a medir (pode repetir).')
+        parser.add_argument('--output', default='benchmarks/latest.json')
+        parser.add_argument('--compare', help='JSON de uma execucao anterior para comparar.')
+        parser.add_argument(
+            '--memory',
+            action='store_true',
+            help='Mede tambem o pico de memoria da agregacao do relatorio de campanha.',
+        )
+
+    def handle(self, *args, **options):
+        company = None
+        if options.get('company_id'):
+            company = Company.objects.filter(id=options['company_id']).first()
+            if company is None:
+                raise CommandError('Empresa nao encontrada.')
+        try:
+            report = run_benchmarks(
+                company=company,
+                repeat=max(options['repeat'], 1),
+                warmup=max(options['warmup'], 0),
+                keep_cache=options['keep_cache'],
+                only=options.get('only'),
+                log=self.stdout.write,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options['memory'] and report['campaign_uuid']:
+            campaign = Campaign.all_objects.get(uuid=report['campaign_uuid'])
+            report['memory'] = measure_report_memory(campaign, log=self.stdout.write)
+
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(f'Resultado gravado em {output}.'))
+
+        if options.get('compare'):
+            previous = json.loads(Path(options['compare']).read_text(encoding='utf-8'))
+            for row in compare_benchmarks(previous, report):
+                self.stdout.write(
+                    f"{row['name']}: {row['before_ms']} -> {row['after_ms']} ms "
+                    f"({row['delta_percent']:+.1f}%), consultas {row['queries_before']} -> {row['queries_after']}"
+                )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Avalia os alertas automaticos de todas as empresas ativas em lote (rodar periodicamente).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--inline',
+            action='store_true',
+            help='Cria os alertas neste processo em vez de distribuir pelos workers do RQ.',
+        )
+
+    def handle(self, *args, **options):
+        from ciss_gestao.views import sweep_automatic_alerts
+
+        total = sweep_automatic_alerts(inline=options['inline'])
+        self.stdout.write(self.style.SUCCESS(f'Alertas automaticos avaliados: {total} empresas com novos alertas.'))
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('core', '0037_totem_assessment_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='moodrecord',
+            index=models.Index(fields=['company', 'record_date', 'sentiment'], name='mood_company_date_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moodrecord',
+            index=models.Index(fields=['company', 'totem', 'record_date'], name='mood_company_totem_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moodrecord',
+            index=models.Index(fields=['company', 'department', 'record_date'], name='mood_company_dept_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['company', 'record_date', 'category'], name='complaint_company_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['company', 'totem', 'record_date'], name='complaint_co_totem_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['company', 'status', 'record_date'], name='alert_company_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['company', 'alert_type', 'record_date'], name='alert_company_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='helprequest',
+            index=models.Index(fields=['company', 'status'], name='helpreq_company_status_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations, models
+from django.db.models import Q
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('core', '0038_hot_path_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moodrecord',
+            name='client_event_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='complaint',
+            name='client_event_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='helprequest',
+            name='client_event_id',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='moodrecord',
+            constraint=models.UniqueConstraint(
+                condition=Q(client_event_id__isnull=False),
+                fields=('company', 'record_date', 'client_event_id'),
+                name='core_mood_records_client_event_unique',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='complaint',
+            constraint=models.UniqueConstraint(
+                condition=Q(client_event_id__isnull=False),
+                fields=('company', 'record_date', 'client_event_id'),
+                name='core_complaints_client_event_unique',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='helprequest',
+            constraint=models.UniqueConstraint(
+                condition=Q(client_event_id__isnull=False),
+                fields=('company', 'client_event_id'),
+                name='core_help_requests_client_event_unique',
+            ),
+        ),
+    ]
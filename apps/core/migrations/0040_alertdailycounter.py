@@ -0,0 +1,71 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    MoodRecord = apps.get_model('core', 'MoodRecord')
+    Complaint = apps.get_model('core', 'Complaint')
+    AlertDailyCounter = apps.get_model('core', 'AlertDailyCounter')
+
+    counters = {}
+    mood_rows = (
+        MoodRecord.objects.values('company_id', 'record_date')
+        .annotate(
+            total=Count('id'),
+            negative=Count('id', filter=Q(sentiment__in=['bad', 'very_bad'])),
+        )
+        .order_by()
+    )
+    for row in mood_rows.iterator():
+        counter = counters.setdefault(
+            (row['company_id'], row['record_date']),
+            AlertDailyCounter(company_id=row['company_id'], record_date=row['record_date']),
+        )
+        counter.mood_count = row['total']
+        counter.negative_mood_count = row['negative']
+
+    complaint_rows = (
+        Complaint.objects.values('company_id', 'record_date')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    for row in complaint_rows.iterator():
+        counter = counters.setdefault(
+            (row['company_id'], row['record_date']),
+            AlertDailyCounter(company_id=row['company_id'], record_date=row['record_date']),
+        )
+        counter.complaint_count = row['total']
+
+    AlertDailyCounter.objects.bulk_create(counters.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('core', '0039_kiosk_client_event_id'),
+        ('tenancy', '0016_company_catalog_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertDailyCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('record_date', models.DateField()),
+                ('mood_count', models.PositiveIntegerField(default=0)),
+                ('negative_mood_count', models.PositiveIntegerField(default=0)),
+                ('complaint_count', models.PositiveIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='core_alertdailycounter_set', to='tenancy.company')),
+            ],
+            options={
+                'db_table': 'alert_daily_counters',
+                'ordering': ['-record_date'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('company', 'record_date'), name='core_alert_daily_counters_unique_day'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def close_duplicate_open_alerts(apps, schema_editor):
+    Alert = apps.get_model('core', 'Alert')
+    duplicates = (
+        Alert.objects.filter(status='open')
+        .values('company_id', 'alert_type', 'record_date')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    for row in duplicates.iterator():
+        keep_id = (
+            Alert.objects.filter(status='open', **row_filter(row))
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)
+            .first()
+        )
+        Alert.objects.filter(status='open', **row_filter(row)).exclude(id=keep_id).update(status='closed')
+
+
+def row_filter(row):
+    return {
+        'company_id': row['company_id'],
+        'alert_type': row['alert_type'],
+        'record_date': row['record_date'],
+    }
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('core', '0040_alertdailycounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_open_alerts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='alert',
+            constraint=models.UniqueConstraint(
+                condition=Q(status='open'),
+                fields=('company', 'alert_type', 'record_date'),
+                name='core_alerts_open_unique_per_day',
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+ANSWER_SCORE = {'Nunca': 1, 'Raramente': 2, 'As vezes': 3, 'Frequentemente': 4, 'Sempre': 5}
+DOMAIN_STEPS = ('step2', 'step3', 'step4', 'step5', 'step6', 'step7', 'step8')
+
+
+def backfill_counters(apps, schema_editor):
+    CampaignResponse = apps.get_model('core', 'CampaignResponse')
+    MonthlyCounter = apps.get_model('core', 'CampaignResponseMonthlyCounter')
+    DomainCounter = apps.get_model('core', 'CampaignDomainScoreCounter')
+
+    months = Counter()
+    score_sums = Counter()
+    answer_counts = Counter()
+    rows = CampaignResponse.objects.values_list('company_id', 'completed_at', 'responses')
+    for company_id, completed_at, responses in rows.iterator(chunk_size=2000):
+        if completed_at is not None:
+            months[(company_id, timezone.localdate(completed_at).replace(day=1))] += 1
+        for step_key, answers in (responses or {}).items():
+            if step_key not in DOMAIN_STEPS or not answers:
+                continue
+            for item in answers:
+                score = ANSWER_SCORE.get(item.get('answer', ''))
+                if score:
+                    score_sums[(company_id, step_key)] += score
+                    answer_counts[(company_id, step_key)] += 1
+
+    MonthlyCounter.objects.bulk_create(
+        [
+            MonthlyCounter(company_id=company_id, month=month, response_count=total)
+            for (company_id, month), total in months.items()
+        ],
+        batch_size=1000,
+    )
+    DomainCounter.objects.bulk_create(
+        [
+            DomainCounter(
+                company_id=company_id,
+                step_key=step_key,
+                score_sum=score_sums[(company_id, step_key)],
+                answer_count=total,
+            )
+            for (company_id, step_key), total in answer_counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('core', '0041_alert_open_unique_per_day'),
+        ('tenancy', '0016_company_catalog_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampaignResponseMonthlyCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('month', models.DateField()),
+                ('response_count', models.PositiveIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='core_campaignresponsemonthlycounter_set', to='tenancy.company')),
+            ],
+            options={
+                'db_table': 'campaign_response_monthly_counters',
+                'ordering': ['-month'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('company', 'month'), name='core_campaign_response_monthly_unique_month'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='CampaignDomainScoreCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('step_key', models.CharField(max_length=20)),
+                ('score_sum', models.PositiveBigIntegerField(default=0)),
+                ('answer_count', models.PositiveBigIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='core_campaigndomainscorecounter_set', to='tenancy.company')),
+            ],
+            options={
+                'db_table': 'campaign_domain_score_counters',
+                'ordering': ['step_key'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('company', 'step_key'), name='core_campaign_domain_score_unique_step'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
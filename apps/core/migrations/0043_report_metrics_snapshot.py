@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('core', '0042_campaign_response_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='metrics_snapshot',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -269,10 +269,21 @@ class HelpRequest(TenantModel):
         blank=True,
         related_name='help_requests',
     )
+    client_event_id = models.CharField(max_length=64, null=True, blank=True)
 
     class Meta:
         db_table = 'help_requests'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['company', 'status'], name='helpreq_company_status_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'client_event_id'],
+                condition=Q(client_event_id__isnull=False),
+                name='core_help_requests_client_event_unique',
+            ),
+        ]
 
 
 class HelpRequestActionHistory(TenantModel):
@@ -314,6 +325,54 @@ class AlertSetting(TenantModel):
         ]
 
 
+class AlertDailyCounter(TenantModel):
+    record_date = models.DateField()
+    mood_count = models.PositiveIntegerField(default=0)
+    negative_mood_count = models.PositiveIntegerField(default=0)
+    complaint_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'alert_daily_counters'
+        ordering = ['-record_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'record_date'],
+                name='core_alert_daily_counters_unique_day',
+            ),
+        ]
+
+
+class CampaignResponseMonthlyCounter(TenantModel):
+    month = models.DateField()
+    response_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'campaign_response_monthly_counters'
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'month'],
+                name='core_campaign_response_monthly_unique_month',
+            ),
+        ]
+
+
+class CampaignDomainScoreCounter(TenantModel):
+    step_key = models.CharField(max_length=20)
+    score_sum = models.PositiveBigIntegerField(default=0)
+    answer_count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'campaign_domain_score_counters'
+        ordering = ['step_key']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'step_key'],
+                name='core_campaign_domain_score_unique_step',
+            ),
+        ]
+
+
 class AlertRecipient(TenantModel):
     name = models.CharField(max_length=150, blank=True)
     email = models.EmailField()
@@ -383,11 +442,17 @@ class MoodRecord(StandardPeriodModel):
         blank=True,
         related_name='mood_records',
     )
+    client_event_id = models.CharField(max_length=64, null=True, blank=True)
     is_anonymous = models.BooleanField(default=True, editable=False)
 
     class Meta(StandardPeriodModel.Meta):
         db_table = 'mood_records'
         ordering = ['-record_date', '-created_at']
+        indexes = [
+            models.Index(fields=['company', 'record_date', 'sentiment'], name='mood_company_date_sent_idx'),
+            models.Index(fields=['company', 'totem', 'record_date'], name='mood_company_totem_date_idx'),
+            models.Index(fields=['company', 'department', 'record_date'], name='mood_company_dept_date_idx'),
+        ]
         constraints = StandardPeriodModel.Meta.constraints + [
             models.CheckConstraint(
                 condition=Q(mood_score__gte=1) & Q(mood_score__lte=5),
@@ -397,6 +462,12 @@ class MoodRecord(StandardPeriodModel):
                 condition=Q(is_anonymous=True),
                 name='core_mood_records_anonymous_only',
             ),
+            # record_date na chave: compativel com o particionamento mensal.
+            models.UniqueConstraint(
+                fields=['company', 'record_date', 'client_event_id'],
+                condition=Q(client_event_id__isnull=False),
+                name='core_mood_records_client_event_unique',
+            ),
         ]
 
 
@@ -450,11 +521,16 @@ class Complaint(StandardPeriodModel):
     )
     occurrence_count = models.PositiveIntegerField(default=1)
     details = models.TextField(blank=True, null=True)
+    client_event_id = models.CharField(max_length=64, null=True, blank=True)
     is_anonymous = models.BooleanField(default=True, editable=False)
 
     class Meta(StandardPeriodModel.Meta):
         db_table = 'complaints'
         ordering = ['-record_date', '-created_at']
+        indexes = [
+            models.Index(fields=['company', 'record_date', 'category'], name='complaint_company_date_idx'),
+            models.Index(fields=['company', 'totem', 'record_date'], name='complaint_co_totem_date_idx'),
+        ]
         constraints = StandardPeriodModel.Meta.constraints + [
             models.CheckConstraint(
                 condition=Q(occurrence_count__gte=1),
@@ -464,6 +540,11 @@ class Complaint(StandardPeriodModel):
                 condition=Q(is_anonymous=True),
                 name='core_complaints_anonymous_only',
             ),
+            models.UniqueConstraint(
+                fields=['company', 'record_date', 'client_event_id'],
+                condition=Q(client_event_id__isnull=False),
+                name='core_complaints_client_event_unique',
+            ),
         ]
 
 
@@ -558,6 +639,17 @@ class Alert(StandardPeriodModel):
     class Meta(StandardPeriodModel.Meta):
         db_table = 'alerts'
         ordering = ['-record_date', '-created_at']
+        indexes = [
+            models.Index(fields=['company', 'status', 'record_date'], name='alert_company_status_date_idx'),
+            models.Index(fields=['company', 'alert_type', 'record_date'], name='alert_company_type_date_idx'),
+        ]
+        constraints = StandardPeriodModel.Meta.constraints + [
+            models.UniqueConstraint(
+                fields=['company', 'alert_type', 'record_date'],
+                condition=Q(status='open'),
+                name='core_alerts_open_unique_per_day',
+            ),
+        ]
 
 
 class Report(StandardPeriodModel):
@@ -591,6 +683,8 @@ class Report(StandardPeriodModel):
     mood_analysis = models.TextField(blank=True, default='')
     complaint_analysis = models.TextField(blank=True, default='')
     technical_recommendations = models.TextField(blank=True, default='')
+    # Metricas congeladas na geracao; o relatorio nao muda com registros atrasados.
+    metrics_snapshot = models.JSONField(null=True, blank=True)
 
     class Meta(StandardPeriodModel.Meta):
         db_table = 'reports'
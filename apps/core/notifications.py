@@ -0,0 +1,173 @@
+"""Entrega de e-mails de alerta via fila RQ dedicada.
+
+Os alertas entram numa caixa de saida por empresa no Redis; um unico job
+(agendado com debounce de ``ALERT_EMAIL_DIGEST_SECONDS``) junta os alertas
+de cada empresa num e-mail de resumo e envia todos por uma conexao SMTP.
+"""
+
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import AlertRecipient
+
+try:
+    import django_rq
+except ImportError:  # optional dependency in local setup
+    django_rq = None
+
+
+logger = logging.getLogger(__name__)
+
+ALERT_EMAIL_QUEUE = 'alerts_email'
+_OUTBOX_COMPANIES_KEY = 'alerts:email-outbox-companies'
+_DELIVERY_PENDING_KEY = 'alerts:email-delivery-pending'
+
+
+def _outbox_key(company_id):
+    return f'alerts:email-outbox:{company_id}'
+
+
+def _rate_key(company_id, now):
+    return f'alerts:email-rate:{company_id}:{now:%Y%m%d%H}'
+
+
+def _recipients_for(company_id):
+    return list(
+        AlertRecipient.objects.for_tenant(company_id)
+        .filter(is_active=True)
+        .values_list('email', flat=True)
+    )
+
+
+def build_alert_email(notifications, recipients):
+    if len(notifications) == 1:
+        subject = notifications[0]['subject']
+        body = notifications[0]['body']
+    else:
+        subject = f'Alertas automaticos ({len(notifications)})'
+        body = '\n\n'.join(
+            f"{item['subject']}\n{item['body']}" for item in notifications
+        )
+    return EmailMessage(subject, body, None, recipients)
+
+
+def send_alert_emails(messages, connection=None):
+    if not messages:
+        return 0
+    connection = connection or get_connection(fail_silently=False)
+    return connection.send_messages(messages) or 0
+
+
+def _send_inline(company_id, subject, body):
+    recipients = _recipients_for(company_id)
+    if not recipients:
+        return
+    try:
+        send_alert_emails([EmailMessage(subject, body, None, recipients)])
+    except Exception:
+        logger.exception('Falha ao enviar e-mail de alerta da empresa %s.', company_id)
+
+
+def _schedule_delivery(queue):
+    delay = settings.ALERT_EMAIL_DIGEST_SECONDS
+    if delay <= 0:
+        queue.enqueue(deliver_alert_notifications_job)
+        return
+    if queue.connection.set(_DELIVERY_PENDING_KEY, 1, nx=True, ex=delay * 2 + 60):
+        queue.enqueue_in(timedelta(seconds=delay), deliver_alert_notifications_job)
+
+
+def queue_alert_notification(company_id, subject, body):
+    if django_rq is None:
+        _send_inline(company_id, subject, body)
+        return
+    try:
+        queue = django_rq.get_queue(ALERT_EMAIL_QUEUE)
+        pipe = queue.connection.pipeline()
+        pipe.rpush(_outbox_key(company_id), json.dumps({'subject': subject, 'body': body}))
+        pipe.sadd(_OUTBOX_COMPANIES_KEY, company_id)
+        pipe.execute()
+    except Exception:
+        # Redis fora do ar: o alerta nao entrou na caixa de saida, envia agora.
+        logger.exception('Falha ao enfileirar e-mail de alerta da empresa %s; enviando direto.', company_id)
+        _send_inline(company_id, subject, body)
+        return
+    try:
+        _schedule_delivery(queue)
+    except Exception:
+        # O alerta ja esta na caixa de saida e sai no proximo resumo agendado.
+        logger.exception('Falha ao agendar entrega de e-mails de alerta da empresa %s.', company_id)
+
+
+def _pop_outbox(redis, company_id):
+    pipe = redis.pipeline()
+    pipe.lrange(_outbox_key(company_id), 0, -1)
+    pipe.delete(_outbox_key(company_id))
+    raw_items, _ = pipe.execute()
+    return [json.loads(item) for item in raw_items]
+
+
+def _restore_outbox(redis, company_id, notifications):
+    if not notifications:
+        return
+    pipe = redis.pipeline()
+    pipe.lpush(_outbox_key(company_id), *[json.dumps(item) for item in reversed(notifications)])
+    pipe.sadd(_OUTBOX_COMPANIES_KEY, company_id)
+    pipe.execute()
+
+
+def deliver_alert_notifications_job():
+    queue = django_rq.get_queue(ALERT_EMAIL_QUEUE)
+    redis = queue.connection
+    redis.delete(_DELIVERY_PENDING_KEY)
+    now = timezone.now()
+    limit = settings.ALERT_EMAIL_RATE_LIMIT_PER_HOUR
+
+    batch = []
+    deferred = False
+    for raw_company_id in redis.smembers(_OUTBOX_COMPANIES_KEY):
+        company_id = int(raw_company_id)
+        redis.srem(_OUTBOX_COMPANIES_KEY, raw_company_id)
+        notifications = _pop_outbox(redis, company_id)
+        if not notifications:
+            continue
+        if limit > 0 and int(redis.get(_rate_key(company_id, now)) or 0) >= limit:
+            # Limite por empresa atingido: segura os alertas para o proximo resumo.
+            _restore_outbox(redis, company_id, notifications)
+            deferred = True
+            continue
+        recipients = _recipients_for(company_id)
+        if recipients:
+            batch.append((company_id, notifications, build_alert_email(notifications, recipients)))
+
+    sent = 0
+    if batch:
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for company_id, notifications, message in batch:
+                send_alert_emails([message], connection=connection)
+                sent += 1
+                if limit > 0:
+                    # Conta so o que saiu de fato: falhas e empresas sem destinatarios nao gastam o limite.
+                    rate_key = _rate_key(company_id, now)
+                    redis.incr(rate_key)
+                    redis.expire(rate_key, 60 * 60)
+        except Exception:
+            # Resumos ja entregues nao voltam para a fila; so os que nao sairam.
+            for company_id, notifications, _ in batch[sent:]:
+                _restore_outbox(redis, company_id, notifications)
+            _schedule_delivery(queue)
+            raise
+        finally:
+            connection.close()
+
+    if deferred:
+        next_hour = (now + timedelta(hours=1)).replace(minute=0, second=5, microsecond=0)
+        queue.enqueue_at(next_hour, deliver_alert_notifications_job)
+    return sent
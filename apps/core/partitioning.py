@@ -0,0 +1,252 @@
+"""Particionamento mensal (PostgreSQL) das tabelas de coleta por record_date.
+
+Opcional: nada aqui roda automaticamente. A conversao e a manutencao das
+particoes sao feitas pelo comando ``manage_period_partitions``.
+"""
+
+import re
+from datetime import date
+
+from django.db import connection, transaction
+
+
+PARTITIONED_TABLES = ('mood_records', 'complaints')
+PARTITION_KEY = 'record_date'
+_PARTITION_SUFFIX_RE = re.compile(r'_p(?P<year>\d{4})(?P<month>\d{2})$')
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + (value.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(table: str, start: date) -> str:
+    return f'{table}_p{start:%Y%m}'
+
+
+def default_partition_name(table: str) -> str:
+    return f'{table}_default'
+
+
+def _require_postgresql():
+    if connection.vendor != 'postgresql':
+        raise RuntimeError('Particionamento disponivel apenas no PostgreSQL.')
+
+
+def _validate_table(table: str):
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f'Tabela nao suportada para particionamento: {table}.')
+
+
+def is_partitioned(table: str) -> bool:
+    _require_postgresql()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            '''
+            SELECT 1
+            FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = %s AND pg_table_is_visible(c.oid)
+            ''',
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_month_partitions(table: str) -> list[tuple[str, date]]:
+    _require_postgresql()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            '''
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)
+            ''',
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        match = _PARTITION_SUFFIX_RE.search(name)
+        if match and name.startswith(f'{table}_p'):
+            partitions.append(
+                (name, date(int(match.group('year')), int(match.group('month')), 1))
+            )
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def _create_month_partition(cursor, table: str, start: date):
+    name = partition_name(table, start)
+    end = add_months(start, 1)
+    qn = connection.ops.quote_name
+    default_name = default_partition_name(table)
+    cursor.execute(
+        f'SELECT 1 FROM {qn(default_name)} WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s LIMIT 1',
+        [start, end],
+    )
+    has_rows_in_default = cursor.fetchone() is not None
+    if has_rows_in_default:
+        # Postgres nao cria particao se a default ja tem linhas do intervalo.
+        cursor.execute(f'ALTER TABLE {qn(table)} DETACH PARTITION {qn(default_name)}')
+    cursor.execute(
+        f'CREATE TABLE {qn(name)} PARTITION OF {qn(table)} FOR VALUES FROM (%s) TO (%s)',
+        [start.isoformat(), end.isoformat()],
+    )
+    if has_rows_in_default:
+        cursor.execute(
+            f'INSERT INTO {qn(name)} SELECT * FROM {qn(default_name)} '
+            f'WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s',
+            [start, end],
+        )
+        cursor.execute(
+            f'DELETE FROM {qn(default_name)} WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s',
+            [start, end],
+        )
+        cursor.execute(f'ALTER TABLE {qn(table)} ATTACH PARTITION {qn(default_name)} DEFAULT')
+    return name
+
+
+def ensure_month_partitions(table: str, first_month: date, last_month: date) -> list[str]:
+    _validate_table(table)
+    _require_postgresql()
+    existing = {start for _, start in list_month_partitions(table)}
+    created = []
+    current = month_start(first_month)
+    last_month = month_start(last_month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        while current <= last_month:
+            if current not in existing:
+                created.append(_create_month_partition(cursor, table, current))
+            current = add_months(current, 1)
+    return created
+
+
+def ensure_future_partitions(table: str, months_ahead: int, today: date | None = None) -> list[str]:
+    today = today or date.today()
+    start = month_start(today)
+    return ensure_month_partitions(table, start, add_months(start, max(months_ahead, 0)))
+
+
+def detach_old_partitions(
+    table: str,
+    keep_months: int,
+    archive_schema: str | None = None,
+    drop: bool = False,
+    today: date | None = None,
+) -> list[str]:
+    _validate_table(table)
+    _require_postgresql()
+    cutoff = add_months(month_start(today or date.today()), -max(keep_months, 0))
+    qn = connection.ops.quote_name
+    detached = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name, start in list_month_partitions(table):
+            if start >= cutoff:
+                continue
+            cursor.execute(f'ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}')
+            if drop:
+                cursor.execute(f'DROP TABLE {qn(name)}')
+            elif archive_schema:
+                cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {qn(archive_schema)}')
+                cursor.execute(f'ALTER TABLE {qn(name)} SET SCHEMA {qn(archive_schema)}')
+            detached.append(name)
+    return detached
+
+
+def incoming_foreign_keys(table: str) -> list[tuple[str, str]]:
+    """FKs de outras tabelas que apontam para ``table``: (tabela, constraint)."""
+    _require_postgresql()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            '''
+            SELECT conrelid::regclass::text, conname
+            FROM pg_constraint
+            WHERE confrelid = %s::regclass AND contype = 'f' AND conrelid <> confrelid
+            ORDER BY 1, 2
+            ''',
+            [table],
+        )
+        return cursor.fetchall()
+
+
+def convert_to_partitioned(table: str, months_ahead: int = 3, force: bool = False) -> list[str]:
+    """Recria ``table`` como tabela particionada por mes, copiando os dados.
+
+    A chave primaria passa a ser (id, record_date), entao FKs de outras tabelas
+    apontando para ``table`` nao podem ser recriadas. Sem ``force`` a conversao
+    e abortada listando essas FKs; com ``force`` elas sao removidas
+    explicitamente (o Django continua aplicando on_delete na aplicacao).
+    """
+    _validate_table(table)
+    _require_postgresql()
+    if is_partitioned(table):
+        return []
+
+    qn = connection.ops.quote_name
+    legacy = f'{table}_legacy'
+    sequence = f'{table}_part_id_seq'
+    today = date.today()
+    with transaction.atomic(), connection.cursor() as cursor:
+        incoming = incoming_foreign_keys(table)
+        if incoming and not force:
+            listed = ', '.join(f'{source}.{name}' for source, name in incoming)
+            raise RuntimeError(
+                f'{table} e referenciada por FKs que nao podem apontar para a tabela particionada: '
+                f'{listed}. Use --force para remove-las.'
+            )
+        for source, name in incoming:
+            # Sem CASCADE no DROP abaixo: so somem as FKs listadas aqui.
+            cursor.execute(f'ALTER TABLE {source} DROP CONSTRAINT {qn(name)}')
+        cursor.execute(
+            '''
+            SELECT indexdef
+            FROM pg_indexes
+            WHERE tablename = %s AND indexname <> %s
+            ''',
+            [table, f'{table}_pkey'],
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            '''
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+            ''',
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            f'SELECT MIN({PARTITION_KEY}), MAX({PARTITION_KEY}), COALESCE(MAX(id), 0) FROM {qn(table)}'
+        )
+        min_date, max_date, max_id = cursor.fetchone()
+
+        cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}')
+        cursor.execute(
+            f'CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE ({PARTITION_KEY})'
+        )
+        cursor.execute(f'CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id')
+        cursor.execute('SELECT setval(%s, %s, false)', [sequence, max_id + 1])
+        cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        cursor.execute(f'ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, {PARTITION_KEY})')
+        cursor.execute(
+            f'CREATE TABLE {qn(default_partition_name(table))} PARTITION OF {qn(table)} DEFAULT'
+        )
+
+        first_month = month_start(min_date or today)
+        last_month = add_months(month_start(max(max_date or today, today)), max(months_ahead, 0))
+        created = ensure_month_partitions(table, first_month, last_month)
+
+        cursor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}')
+        cursor.execute(f'DROP TABLE {qn(legacy)}')
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}')
+    return created
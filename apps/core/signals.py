@@ -0,0 +1,93 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from apps.tenancy.models import Company
+
+from .counters import (
+    campaign_contributions,
+    invalidate_master_dashboard_counters,
+    subtract_campaign_response_counters,
+)
+from .models import (
+    Campaign,
+    ComplaintType,
+    Department,
+    GHE,
+    MoodType,
+    Totem,
+)
+
+
+KIOSK_CATALOG_MODELS = (GHE, Department, MoodType, ComplaintType, Totem)
+# Campos da empresa que entram no payload de bootstrap do totem.
+KIOSK_CATALOG_COMPANY_FIELDS = ('name', 'slug')
+
+
+def bump_catalog_version(company_id):
+    if not company_id:
+        return
+    Company.objects.filter(pk=company_id).update(catalog_version=F('catalog_version') + 1)
+
+
+def bump_catalog_version_on_change(sender, instance, **kwargs):
+    bump_catalog_version(instance.company_id)
+
+
+for _model in KIOSK_CATALOG_MODELS:
+    post_save.connect(bump_catalog_version_on_change, sender=_model)
+    post_delete.connect(bump_catalog_version_on_change, sender=_model)
+
+
+def collect_company_catalog_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._kiosk_catalog_changed = False
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(KIOSK_CATALOG_COMPANY_FIELDS):
+        return
+    previous = (
+        Company.objects.filter(pk=instance.pk)
+        .values_list(*KIOSK_CATALOG_COMPANY_FIELDS)
+        .first()
+    )
+    current = tuple(getattr(instance, field) for field in KIOSK_CATALOG_COMPANY_FIELDS)
+    instance._kiosk_catalog_changed = previous is not None and previous != current
+
+
+def bump_catalog_version_on_company_change(sender, instance, created=False, **kwargs):
+    if created or not getattr(instance, '_kiosk_catalog_changed', False):
+        return
+    # update() nao dispara post_save de novo; o objeto em memoria acompanha a versao.
+    bump_catalog_version(instance.pk)
+    instance.catalog_version = (
+        Company.objects.filter(pk=instance.pk).values_list('catalog_version', flat=True).first()
+    )
+
+
+pre_save.connect(collect_company_catalog_fields, sender=Company)
+post_save.connect(bump_catalog_version_on_company_change, sender=Company)
+
+
+def invalidate_master_dashboard_on_change(sender, instance, **kwargs):
+    invalidate_master_dashboard_counters()
+
+
+for _model in (Company, Campaign):
+    post_save.connect(invalidate_master_dashboard_on_change, sender=_model)
+    post_delete.connect(invalidate_master_dashboard_on_change, sender=_model)
+
+
+# As respostas somem em cascata com a campanha: tira a parte dela dos
+# contadores mensais e de dominio (pre_delete roda antes do cascade).
+def collect_campaign_contributions(sender, instance, **kwargs):
+    instance._response_contributions = campaign_contributions(instance)
+
+
+def subtract_campaign_contributions(sender, instance, **kwargs):
+    contributions = getattr(instance, '_response_contributions', None)
+    if contributions:
+        subtract_campaign_response_counters(instance.company_id, contributions)
+
+
+pre_delete.connect(collect_campaign_contributions, sender=Campaign)
+post_delete.connect(subtract_campaign_contributions, sender=Campaign)
+
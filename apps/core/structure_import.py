@@ -0,0 +1,322 @@
+"""Importacao em lote de GHEs, setores e funcoes a partir de CSV/XLSX.
+
+Cada linha pode trazer as colunas ``ghe``, ``setor`` e ``funcao``. O arquivo
+e lido em blocos; os nomes sao resolvidos com mapas em memoria e a gravacao
+usa bulk_create/bulk_update, inclusive nas tabelas M2M das funcoes.
+"""
+
+import csv
+import io
+import logging
+import unicodedata
+from itertools import chain, islice
+from pathlib import Path
+from uuid import uuid4
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from ciss_gestao.page_cache import invalidate_page_cache
+
+from .models import Department, GHE, JobFunction
+from .signals import bump_catalog_version
+
+try:
+    import openpyxl
+except ImportError:  # optional dependency in local setup
+    openpyxl = None
+
+try:
+    import django_rq
+    from rq import get_current_job
+except ImportError:  # optional dependency in local setup
+    django_rq = None
+    get_current_job = None
+
+
+logger = logging.getLogger(__name__)
+
+IMPORT_QUEUE = 'default'
+IMPORT_CHUNK_SIZE = 500
+IMPORT_EXTENSIONS = ('.csv', '.xlsx')
+COLUMN_ALIASES = {
+    'ghe': 'ghe',
+    'setor': 'department',
+    'departamento': 'department',
+    'funcao': 'job_function',
+    'cargo': 'job_function',
+}
+
+
+def _normalize(value):
+    value = unicodedata.normalize('NFKD', str(value or '').strip())
+    return ''.join(char for char in value if not unicodedata.combining(char)).casefold()
+
+
+def _clean(value):
+    return ' '.join(str(value).split())[:150] if value is not None else ''
+
+
+def _iter_csv(file_obj):
+    text = io.TextIOWrapper(file_obj, encoding='utf-8-sig', newline='')
+    first_line = text.readline()
+    delimiter = ';' if first_line.count(';') > first_line.count(',') else ','
+    yield from csv.reader(chain([first_line], text), delimiter=delimiter)
+
+
+def _iter_xlsx(file_obj):
+    if openpyxl is None:
+        raise ValueError('Importacao de XLSX indisponivel (openpyxl nao instalado).')
+    workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_structure_rows(file_obj, file_name):
+    extension = Path(file_name).suffix.lower()
+    if extension not in IMPORT_EXTENSIONS:
+        raise ValueError('Formato invalido. Envie um arquivo CSV ou XLSX.')
+    raw_rows = _iter_xlsx(file_obj) if extension == '.xlsx' else _iter_csv(file_obj)
+
+    header = next(raw_rows, None) or []
+    columns = {
+        index: COLUMN_ALIASES[_normalize(name)]
+        for index, name in enumerate(header)
+        if _normalize(name) in COLUMN_ALIASES
+    }
+    if not columns:
+        raise ValueError('Cabecalho invalido. Use as colunas ghe, setor e funcao.')
+
+    for raw_row in raw_rows:
+        row = {'ghe': '', 'department': '', 'job_function': ''}
+        for index, field in columns.items():
+            if index < len(raw_row):
+                row[field] = _clean(raw_row[index])
+        yield row
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class StructureImporter:
+    def __init__(self, company_id):
+        self.company_id = company_id
+        self.ghes = {
+            _normalize(name): ghe_id
+            for ghe_id, name in GHE.all_objects.filter(company_id=company_id).values_list('id', 'name')
+        }
+        self.departments = {
+            _normalize(name): [department_id, ghe_id]
+            for department_id, name, ghe_id in Department.all_objects.filter(
+                company_id=company_id,
+            ).values_list('id', 'name', 'ghe_id')
+        }
+        self.job_functions = {
+            _normalize(name): job_function_id
+            for job_function_id, name in JobFunction.all_objects.filter(
+                company_id=company_id,
+            ).values_list('id', 'name')
+        }
+        self.job_function_ghes = set(
+            JobFunction.ghes.through.objects.filter(
+                jobfunction__company_id=company_id,
+            ).values_list('jobfunction_id', 'ghe_id')
+        )
+        self.job_function_departments = set(
+            JobFunction.departments.through.objects.filter(
+                jobfunction__company_id=company_id,
+            ).values_list('jobfunction_id', 'department_id')
+        )
+        self.stats = {
+            'rows': 0,
+            'skipped_rows': 0,
+            'ghes_created': 0,
+            'departments_created': 0,
+            'departments_updated': 0,
+            'job_functions_created': 0,
+            'links_created': 0,
+        }
+
+    def _create_missing(self, model, names, mapping):
+        new_names = {}
+        for name in names:
+            key = _normalize(name)
+            if key not in mapping and key not in new_names:
+                new_names[key] = name
+        if not new_names:
+            return 0
+        model.all_objects.bulk_create(
+            [model(company_id=self.company_id, name=name, is_active=True) for name in new_names.values()],
+            ignore_conflicts=True,
+        )
+        for object_id, name in model.all_objects.filter(
+            company_id=self.company_id,
+            name__in=list(new_names.values()),
+        ).values_list('id', 'name'):
+            mapping[_normalize(name)] = object_id
+        return len(new_names)
+
+    def _upsert_departments(self, rows):
+        department_ghes = {}
+        for row in rows:
+            if row['department']:
+                ghe_id = self.ghes.get(_normalize(row['ghe'])) if row['ghe'] else None
+                department_ghes[_normalize(row['department'])] = (row['department'], ghe_id)
+
+        to_create = []
+        to_update = []
+        for key, (name, ghe_id) in department_ghes.items():
+            current = self.departments.get(key)
+            if current is None:
+                to_create.append(
+                    Department(company_id=self.company_id, name=name, ghe_id=ghe_id, is_active=True)
+                )
+            elif ghe_id and current[1] != ghe_id:
+                current[1] = ghe_id
+                to_update.append(Department(id=current[0], ghe_id=ghe_id))
+
+        if to_create:
+            Department.all_objects.bulk_create(to_create, ignore_conflicts=True)
+            for department_id, name, ghe_id in Department.all_objects.filter(
+                company_id=self.company_id,
+                name__in=[department.name for department in to_create],
+            ).values_list('id', 'name', 'ghe_id'):
+                self.departments[_normalize(name)] = [department_id, ghe_id]
+        if to_update:
+            Department.all_objects.bulk_update(to_update, ['ghe'])
+        self.stats['departments_created'] += len(to_create)
+        self.stats['departments_updated'] += len(to_update)
+
+    def _link_job_functions(self, rows):
+        ghe_links = set()
+        department_links = set()
+        for row in rows:
+            if not row['job_function']:
+                continue
+            job_function_id = self.job_functions[_normalize(row['job_function'])]
+            if row['ghe']:
+                ghe_links.add((job_function_id, self.ghes[_normalize(row['ghe'])]))
+            if row['department']:
+                department_links.add(
+                    (job_function_id, self.departments[_normalize(row['department'])][0])
+                )
+
+        ghe_links -= self.job_function_ghes
+        department_links -= self.job_function_departments
+        if ghe_links:
+            through = JobFunction.ghes.through
+            through.objects.bulk_create(
+                [through(jobfunction_id=jf_id, ghe_id=ghe_id) for jf_id, ghe_id in ghe_links],
+                ignore_conflicts=True,
+            )
+            self.job_function_ghes |= ghe_links
+        if department_links:
+            through = JobFunction.departments.through
+            through.objects.bulk_create(
+                [
+                    through(jobfunction_id=jf_id, department_id=department_id)
+                    for jf_id, department_id in department_links
+                ],
+                ignore_conflicts=True,
+            )
+            self.job_function_departments |= department_links
+        self.stats['links_created'] += len(ghe_links) + len(department_links)
+
+    def import_chunk(self, rows):
+        filled_rows = [row for row in rows if row['ghe'] or row['department'] or row['job_function']]
+        self.stats['rows'] += len(rows)
+        self.stats['skipped_rows'] += len(rows) - len(filled_rows)
+        rows = filled_rows
+        with transaction.atomic():
+            self.stats['ghes_created'] += self._create_missing(
+                GHE, [row['ghe'] for row in rows if row['ghe']], self.ghes,
+            )
+            self._upsert_departments(rows)
+            self.stats['job_functions_created'] += self._create_missing(
+                JobFunction, [row['job_function'] for row in rows if row['job_function']], self.job_functions,
+            )
+            self._link_job_functions(rows)
+
+
+def _report_progress(job, **values):
+    if job is None:
+        return
+    job.meta.update(values)
+    job.save_meta()
+
+
+def run_structure_import(company_id, file_name, chunk_size=IMPORT_CHUNK_SIZE):
+    job = get_current_job() if get_current_job is not None else None
+    try:
+        with default_storage.open(file_name, 'rb') as file_obj:
+            total_rows = sum(1 for _ in iter_structure_rows(file_obj, file_name))
+        _report_progress(job, processed_rows=0, total_rows=total_rows)
+
+        importer = StructureImporter(company_id)
+        with default_storage.open(file_name, 'rb') as file_obj:
+            for chunk in _chunks(iter_structure_rows(file_obj, file_name), chunk_size):
+                importer.import_chunk(chunk)
+                _report_progress(job, processed_rows=importer.stats['rows'], total_rows=total_rows)
+    except ValueError as exc:
+        _report_progress(job, error=str(exc))
+        raise
+    finally:
+        default_storage.delete(file_name)
+        # bulk_create/bulk_update nao disparam post_save; blocos ja gravados
+        # contam mesmo se um posterior falhar.
+        bump_catalog_version(company_id)
+        invalidate_page_cache(company_id)
+    return importer.stats
+
+
+def start_structure_import(company_id, uploaded_file):
+    """Salva o arquivo e agenda a importacao no RQ.
+
+    Retorna ``(job_id, None)`` ou, sem django_rq, ``(None, stats)`` apos
+    importar no proprio processo.
+    """
+    extension = Path(uploaded_file.name).suffix.lower()
+    if extension not in IMPORT_EXTENSIONS:
+        raise ValueError('Formato invalido. Envie um arquivo CSV ou XLSX.')
+    file_name = default_storage.save(
+        f'structure_imports/{company_id}/{uuid4().hex}{extension}',
+        uploaded_file,
+    )
+    if django_rq is None:
+        return None, run_structure_import(company_id, file_name)
+    job = django_rq.get_queue(IMPORT_QUEUE).enqueue(
+        run_structure_import,
+        company_id,
+        file_name,
+        meta={'company_id': company_id, 'processed_rows': 0, 'total_rows': None},
+        job_timeout=60 * 30,
+    )
+    return job.id, None
+
+
+def get_structure_import_status(company_id, job_id):
+    if django_rq is None:
+        return None
+    job = django_rq.get_queue(IMPORT_QUEUE).fetch_job(job_id)
+    if job is None or job.meta.get('company_id') != company_id:
+        return None
+    status = job.get_status()
+    payload = {
+        'status': str(getattr(status, 'value', status)),
+        'processed_rows': job.meta.get('processed_rows', 0),
+        'total_rows': job.meta.get('total_rows'),
+    }
+    if job.is_finished:
+        payload['result'] = job.return_value()
+    elif job.is_failed:
+        logger.warning('Importacao de estrutura %s falhou.', job_id)
+        payload['error'] = job.meta.get('error') or 'Falha ao importar o arquivo. Verifique o formato e tente novamente.'
+    return payload
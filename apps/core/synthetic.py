@@ -0,0 +1,269 @@
+"""Gerador de empresas sinteticas para benchmarks (dados reprodutiveis por seed).
+
+Usado pelo comando ``generate_synthetic_tenants``. Todas as empresas geradas
+usam slug com prefixo ``SYNTHETIC_SLUG_PREFIX`` para poderem ser removidas.
+"""
+
+import hashlib
+import random
+from datetime import date, timedelta
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import ProtectedError
+
+from apps.tenancy.models import Company, TenantModel
+from apps.tenancy.tasks import DEFAULT_GHE_SECTOR_FUNCTIONS, DEFAULT_MOOD_TYPES, seed_company_defaults
+
+from .counters import rebuild_alert_counters, rebuild_campaign_response_counters
+from .models import (
+    AlertDailyCounter,
+    Campaign,
+    CampaignDomainScoreCounter,
+    CampaignResponse,
+    CampaignResponseMonthlyCounter,
+    Complaint,
+    Department,
+    GHE,
+    HelpRequest,
+    JobFunction,
+    MoodRecord,
+    Totem,
+)
+
+
+SYNTHETIC_SLUG_PREFIX = 'synthetic-'
+COMPLAINT_CATEGORIES = [value for value, _ in Complaint.CATEGORY_CHOICES]
+COMPLAINT_STATUSES = [value for value, _ in Complaint.STATUS_CHOICES]
+HELP_REQUEST_STATUSES = [value for value, _ in HelpRequest.Status.choices]
+SENTIMENT_WEIGHTS = {'very_good': 3, 'good': 4, 'neutral': 3, 'bad': 1, 'very_bad': 0.5}
+
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _random_day(rng, start, days):
+    # Mais registros em dias uteis, como no uso real dos totens.
+    while True:
+        day = start + timedelta(days=rng.randrange(days))
+        if day.weekday() < 5 or rng.random() < 0.2:
+            return day
+
+
+def delete_synthetic_tenants():
+    company_ids = list(
+        Company.objects.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX).values_list('id', flat=True)
+    )
+    if not company_ids:
+        return 0
+    # Contadores saem direto e as tabelas de eventos volumosas (sem FKs
+    # apontando para elas) com DELETE em massa: sem carregar instancias nem
+    # rodar signals por linha (o pre_delete de Campaign leria cada resposta).
+    with transaction.atomic():
+        for model in (AlertDailyCounter, CampaignResponseMonthlyCounter, CampaignDomainScoreCounter):
+            model.all_objects.filter(company_id__in=company_ids).delete()
+        for model in (MoodRecord, CampaignResponse):
+            queryset = model.all_objects.filter(company_id__in=company_ids)
+            queryset._raw_delete(queryset.db)
+    # TenantModel.company e PROTECT: apaga os dados de cada modelo antes da
+    # empresa, repetindo os que ainda tem dependentes.
+    pending = [model for model in django_apps.get_models() if issubclass(model, TenantModel)]
+    while pending:
+        blocked = []
+        for model in pending:
+            try:
+                with transaction.atomic():
+                    model.all_objects.filter(company_id__in=company_ids).delete()
+            except ProtectedError:
+                blocked.append(model)
+        if len(blocked) == len(pending):
+            raise RuntimeError('Nao foi possivel remover os dados sinteticos: ' + ', '.join(m.__name__ for m in blocked))
+        pending = blocked
+    Company.objects.filter(id__in=company_ids).delete()
+    return len(company_ids)
+
+
+def _structure_maps(company):
+    ghes = dict(GHE.all_objects.filter(company=company).values_list('name', 'id'))
+    departments = dict(Department.all_objects.filter(company=company).values_list('name', 'id'))
+    job_functions = dict(JobFunction.all_objects.filter(company=company).values_list('name', 'id'))
+    return [
+        (ghes.get(ghe_name), departments.get(sector_name), job_functions.get(function_name), sector_name)
+        for ghe_name, sector_name, function_name in DEFAULT_GHE_SECTOR_FUNCTIONS
+        if departments.get(sector_name)
+    ]
+
+
+def _mood_records(rng, company, totem_ids, structure, count, start, days, negative_bias):
+    # negative_bias varia por empresa para que algumas cruzem os limites de alerta.
+    weights = [
+        SENTIMENT_WEIGHTS[sentiment] * (negative_bias if sentiment in ('bad', 'very_bad') else 1)
+        for _, _, sentiment, _ in DEFAULT_MOOD_TYPES
+    ]
+    for _ in range(count):
+        _, _, sentiment, score = rng.choices(DEFAULT_MOOD_TYPES, weights=weights)[0]
+        record_date = _random_day(rng, start, days)
+        yield MoodRecord(
+            company_id=company.id,
+            totem_id=rng.choice(totem_ids),
+            department_id=rng.choice(structure)[1],
+            sentiment=sentiment,
+            mood_score=score,
+            record_date=record_date,
+            period_start=record_date.replace(day=1),
+            period_end=record_date,
+            channel='totem',
+        )
+
+
+def _complaints(rng, company, totem_ids, count, start, days):
+    for _ in range(count):
+        record_date = _random_day(rng, start, days)
+        yield Complaint(
+            company_id=company.id,
+            totem_id=rng.choice(totem_ids),
+            category=rng.choice(COMPLAINT_CATEGORIES),
+            complaint_status=rng.choice(COMPLAINT_STATUSES),
+            record_date=record_date,
+            period_start=record_date.replace(day=1),
+            period_end=record_date,
+            channel='totem',
+        )
+
+
+def _help_requests(rng, company, totem_ids, structure, count):
+    for index in range(count):
+        yield HelpRequest(
+            company_id=company.id,
+            totem_id=rng.choice(totem_ids),
+            requester_name=f'Colaborador {index + 1}',
+            department_name=rng.choice(structure)[3],
+            status=rng.choice(HELP_REQUEST_STATUSES),
+        )
+
+
+def _campaign_responses(rng, company, campaign, structure, count):
+    from ciss_gestao.views import CampaignReportView
+
+    answers = list(CampaignReportView.ANSWER_SCORE)
+    for index in range(count):
+        ghe_id, department_id, job_function_id, _ = rng.choice(structure)
+        responses = {
+            step_key: [
+                {'question': question, 'answer': rng.choice(answers)}
+                for question in questions
+            ]
+            for step_key, questions in CampaignReportView.STEP_QUESTIONS.items()
+        }
+        yield CampaignResponse(
+            company_id=company.id,
+            campaign=campaign,
+            cpf_hash=hashlib.sha256(f'{campaign.uuid}:{index}'.encode()).hexdigest(),
+            first_name=f'Colaborador {index + 1}',
+            age=rng.randint(18, 65),
+            sex=rng.choice(['M', 'F']),
+            ghe_id=ghe_id,
+            department_id=department_id,
+            job_function_id=job_function_id,
+            responses=responses,
+        )
+
+
+def generate_synthetic_tenants(
+    companies=1,
+    totems=3,
+    mood_records=100000,
+    complaints=2000,
+    help_requests=200,
+    campaigns=1,
+    campaign_responses=5000,
+    days=365,
+    seed=42,
+    batch_size=5000,
+    log=None,
+):
+    log = log or (lambda message: None)
+    today = date.today()
+    start = today - timedelta(days=days - 1)
+    generated = []
+
+    for company_index in range(companies):
+        rng = random.Random(f'{seed}:{company_index}')
+        slug = f'{SYNTHETIC_SLUG_PREFIX}{seed}-{company_index + 1}'
+        if Company.objects.filter(slug=slug).exists():
+            log(f'{slug}: ja existe, ignorando (use --reset para recriar).')
+            continue
+
+        with transaction.atomic():
+            company = Company.objects.create(
+                name=f'Empresa Sintetica {company_index + 1}',
+                slug=slug,
+                assessment_type='setor' if company_index % 2 == 0 else 'ghe',
+                employee_count=max(int(campaign_responses * 1.2), 10),
+                is_active=True,
+            )
+            seed_company_defaults(company.id)
+            Totem.all_objects.bulk_create(
+                [
+                    Totem(company=company, name=f'Totem {number}', slug=f'totem-{number}', is_active=True)
+                    for number in range(1, max(totems, 1) + 1)
+                ]
+            )
+        totem_ids = list(Totem.all_objects.filter(company=company).values_list('id', flat=True))
+        structure = _structure_maps(company)
+        negative_bias = rng.uniform(0.5, 2.0)
+
+        for label, rows in (
+            ('humores', _mood_records(rng, company, totem_ids, structure, mood_records, start, days, negative_bias)),
+            ('denuncias', _complaints(rng, company, totem_ids, complaints, start, days)),
+            ('pedidos de ajuda', _help_requests(rng, company, totem_ids, structure, help_requests)),
+        ):
+            created = 0
+            for batch in _batched(rows, batch_size):
+                type(batch[0]).all_objects.bulk_create(batch)
+                created += len(batch)
+            log(f'{slug}: {created} {label}.')
+
+        for campaign_index in range(campaigns):
+            end_date = today - timedelta(days=30 * campaign_index)
+            campaign = Campaign.all_objects.create(
+                company=company,
+                title=f'Campanha Sintetica {campaign_index + 1}',
+                start_date=end_date - timedelta(days=30),
+                end_date=end_date,
+                status=Campaign.Status.FINISHED,
+            )
+            created = 0
+            for batch in _batched(
+                _campaign_responses(rng, company, campaign, structure, campaign_responses),
+                batch_size,
+            ):
+                CampaignResponse.all_objects.bulk_create(batch)
+                created += len(batch)
+            log(f'{slug}: campanha {campaign.uuid} com {created} respostas.')
+
+        rebuild_alert_counters([company.id])
+        rebuild_campaign_response_counters([company.id])
+        generated.append(company)
+
+    return generated
+
+
+def synthetic_dataset_summary():
+    companies = Company.objects.filter(slug__startswith=SYNTHETIC_SLUG_PREFIX)
+    company_ids = list(companies.values_list('id', flat=True))
+    return {
+        'companies': len(company_ids),
+        'mood_records': MoodRecord.all_objects.filter(company_id__in=company_ids).count(),
+        'complaints': Complaint.all_objects.filter(company_id__in=company_ids).count(),
+        'help_requests': HelpRequest.all_objects.filter(company_id__in=company_ids).count(),
+        'campaign_responses': CampaignResponse.all_objects.filter(company_id__in=company_ids).count(),
+    }
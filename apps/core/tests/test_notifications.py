@@ -0,0 +1,182 @@
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.core import notifications
+from apps.core.models import AlertRecipient
+from apps.tenancy.models import Company
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return call
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """Subconjunto do Redis usado pela caixa de saida de alertas."""
+
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+        self.sets = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.lists.pop(key, None)
+            self.sets.pop(key, None)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def expire(self, key, seconds):
+        return True
+
+    def rpush(self, key, *items):
+        self.lists.setdefault(key, []).extend(item.encode() for item in items)
+
+    def lpush(self, key, *items):
+        for item in items:
+            self.lists.setdefault(key, []).insert(0, item.encode())
+
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(str(member).encode() for member in members)
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+
+class FakeQueue:
+    def __init__(self):
+        self.connection = FakeRedis()
+        self.enqueued = []
+
+    def enqueue(self, func, *args, **kwargs):
+        self.enqueued.append(func)
+
+    def enqueue_in(self, delay, func, *args, **kwargs):
+        self.enqueued.append(func)
+
+    def enqueue_at(self, when, func, *args, **kwargs):
+        self.enqueued.append(func)
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    ALERT_EMAIL_DIGEST_SECONDS=300,
+    ALERT_EMAIL_RATE_LIMIT_PER_HOUR=0,
+)
+class AlertDigestTests(TestCase):
+    def setUp(self):
+        self.queue = FakeQueue()
+        fake_rq = mock.Mock()
+        fake_rq.get_queue.return_value = self.queue
+        patcher = mock.patch.object(notifications, 'django_rq', fake_rq)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.company_a = Company.objects.create(name='Empresa A', slug='empresa-a')
+        self.company_b = Company.objects.create(name='Empresa B', slug='empresa-b')
+        for email in ('rh@a.example.com', 'seguranca@a.example.com'):
+            AlertRecipient.all_objects.create(company=self.company_a, email=email)
+        AlertRecipient.all_objects.create(company=self.company_b, email='rh@b.example.com')
+
+    def test_digest_sends_one_grouped_message_per_recipient(self):
+        for index in range(3):
+            notifications.queue_alert_notification(self.company_a.id, f'Alerta A{index}', f'Corpo A{index}')
+        notifications.queue_alert_notification(self.company_b.id, 'Alerta B0', 'Corpo B0')
+
+        # Debounce: varios alertas agendam um unico job de entrega.
+        self.assertEqual(self.queue.enqueued, [notifications.deliver_alert_notifications_job])
+        self.assertEqual(mail.outbox, [])
+
+        sent = notifications.deliver_alert_notifications_job()
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(len(mail.outbox), 2)
+        messages_by_recipient = {}
+        for message in mail.outbox:
+            for recipient in message.to:
+                messages_by_recipient.setdefault(recipient, []).append(message)
+        self.assertEqual(
+            sorted(messages_by_recipient),
+            ['rh@a.example.com', 'rh@b.example.com', 'seguranca@a.example.com'],
+        )
+        self.assertTrue(all(len(messages) == 1 for messages in messages_by_recipient.values()))
+
+        digest = messages_by_recipient['rh@a.example.com'][0]
+        self.assertEqual(digest.subject, 'Alertas automaticos (3)')
+        for index in range(3):
+            self.assertIn(f'Alerta A{index}', digest.body)
+        self.assertEqual(messages_by_recipient['rh@b.example.com'][0].subject, 'Alerta B0')
+
+    def test_delivery_without_pending_alerts_sends_nothing(self):
+        self.assertEqual(notifications.deliver_alert_notifications_job(), 0)
+        self.assertEqual(mail.outbox, [])
+
+    @override_settings(ALERT_EMAIL_RATE_LIMIT_PER_HOUR=5)
+    def test_failed_send_restores_only_unsent_digests_and_counts_only_sent(self):
+        notifications.queue_alert_notification(self.company_a.id, 'Alerta A0', 'Corpo A0')
+        notifications.queue_alert_notification(self.company_b.id, 'Alerta B0', 'Corpo B0')
+        delivered = []
+
+        def send_first_only(messages, connection=None):
+            if delivered:
+                raise ConnectionError('smtp fora do ar')
+            delivered.extend(messages)
+            return len(messages)
+
+        with mock.patch.object(notifications, 'send_alert_emails', side_effect=send_first_only):
+            with self.assertRaises(ConnectionError):
+                notifications.deliver_alert_notifications_job()
+
+        sent_company = self.company_a if 'rh@a.example.com' in delivered[0].to else self.company_b
+        failed_company = self.company_b if sent_company == self.company_a else self.company_a
+        redis = self.queue.connection
+        self.assertNotIn(notifications._outbox_key(sent_company.id), redis.lists)
+        self.assertEqual(len(redis.lists[notifications._outbox_key(failed_company.id)]), 1)
+
+        now = timezone.now()
+        self.assertEqual(redis.values.get(notifications._rate_key(sent_company.id, now)), 1)
+        self.assertIsNone(redis.values.get(notifications._rate_key(failed_company.id, now)))
+
+    def test_enqueue_falls_back_to_inline_send_when_redis_is_down(self):
+        self.queue.connection.pipeline = mock.Mock(side_effect=ConnectionError('redis fora do ar'))
+
+        notifications.queue_alert_notification(self.company_b.id, 'Alerta B0', 'Corpo B0')
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['rh@b.example.com'])
+        self.assertEqual(self.queue.enqueued, [])
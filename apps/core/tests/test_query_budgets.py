@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.core.benchmarks import _benchmark_client, benchmark_targets
+from apps.core.models import Campaign
+from apps.core.synthetic import generate_synthetic_tenants
+from ciss_gestao.metrics import QueryBudgetExceeded
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QueryBudgetTests(TestCase):
+    """Telas com orcamento em QUERY_BUDGETS falham se estourarem ou tiverem N+1."""
+
+    @classmethod
+    def setUpTestData(cls):
+        [cls.company] = generate_synthetic_tenants(
+            companies=1,
+            totems=2,
+            mood_records=400,
+            complaints=40,
+            help_requests=5,
+            campaign_responses=30,
+            days=60,
+            batch_size=500,
+        )
+        cls.campaign = Campaign.all_objects.get(company=cls.company)
+
+    def setUp(self):
+        # cache_page/metricas em cache esconderiam as consultas da view.
+        cache.clear()
+        self.client = _benchmark_client(self.company)
+
+    def test_budgeted_views_stay_within_budget(self):
+        for name, url in benchmark_targets(self.company, self.campaign):
+            with self.subTest(view=name):
+                response = self.client.get(url)
+                self.assertLess(response.status_code, 400)
+
+    @override_settings(QUERY_BUDGETS={'dashboard': 1})
+    def test_strict_mode_fails_on_budget_overrun(self):
+        client = _benchmark_client(self.company)
+        with self.assertRaises(QueryBudgetExceeded):
+            client.get(benchmark_targets(self.company, self.campaign)[0][1])
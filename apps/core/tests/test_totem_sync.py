@@ -0,0 +1,69 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.db import IntegrityError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.models import Department, MoodRecord, MoodType, Totem
+from apps.tenancy.models import Company
+from apps.tenancy.tasks import seed_company_defaults
+
+
+class TotemSyncViewTests(TestCase):
+    """Fila offline do totem: reenvio idempotente e recusa do que nao da para gravar."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name='Empresa Totem', slug='empresa-totem', assessment_type='setor')
+        seed_company_defaults(cls.company.id)
+        cls.totem = Totem.all_objects.create(company=cls.company, name='Totem 1', slug='totem-1')
+        cls.department = Department.all_objects.create(company=cls.company, name='Expedicao Teste')
+        cls.mood_type = MoodType.all_objects.filter(company=cls.company, is_active=True).first()
+        cls.url = reverse('totem-sync', args=[cls.company.slug, cls.totem.slug])
+
+    def _mood_event(self, event_id, occurred_at=None):
+        return {
+            'id': event_id,
+            'type': 'mood',
+            'occurred_at': (occurred_at or timezone.now()).isoformat(),
+            'mood_option': self.mood_type.id,
+            'department_id': self.department.id,
+        }
+
+    def _sync(self, events):
+        return self.client.post(self.url, data=json.dumps({'events': events}), content_type='application/json')
+
+    def test_resent_events_are_deduplicated_by_client_event_id(self):
+        event = self._mood_event('evt-1')
+
+        first = self._sync([event, event])
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()['accepted'], ['evt-1'])
+
+        second = self._sync([event])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['accepted'], [])
+        self.assertEqual(second.json()['duplicates'], ['evt-1'])
+        self.assertEqual(MoodRecord.all_objects.filter(company=self.company, client_event_id='evt-1').count(), 1)
+
+    def test_stale_occurred_at_is_rejected(self):
+        stale = timezone.now() - timedelta(days=30)
+        with self.settings(TOTEM_SYNC_MAX_EVENT_AGE_DAYS=7):
+            response = self._sync([self._mood_event('evt-old', occurred_at=stale), self._mood_event('evt-new')])
+
+        payload = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(payload['accepted'], ['evt-new'])
+        self.assertEqual([item['id'] for item in payload['rejected']], ['evt-old'])
+        self.assertFalse(MoodRecord.all_objects.filter(client_event_id='evt-old').exists())
+
+    def test_concurrent_insert_returns_409_without_partial_writes(self):
+        with mock.patch.object(MoodRecord.all_objects, 'bulk_create', side_effect=IntegrityError):
+            response = self._sync([self._mood_event('evt-race')])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.json()['ok'])
+        self.assertFalse(MoodRecord.all_objects.filter(client_event_id='evt-race').exists())
@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from contextvars import ContextVar
 
 
@@ -17,3 +18,12 @@ def reset_current_company_id(token) -> None:
 
 def get_current_company_id() -> int | None:
     return _current_company_id.get()
+
+
+@contextmanager
+def tenant_context(company_id: int | None):
+    token = set_current_company_id(company_id)
+    try:
+        yield company_id
+    finally:
+        reset_current_company_id(token)
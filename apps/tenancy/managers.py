@@ -10,8 +10,10 @@ class TenantQuerySet(models.QuerySet):
 
 class TenantManager(models.Manager):
     def get_queryset(self):
+        return self.for_tenant(get_current_company_id())
+
+    def for_tenant(self, company_id: int | None):
         queryset = TenantQuerySet(self.model, using=self._db)
-        company_id = get_current_company_id()
         if company_id is None:
             return queryset.none()
         return queryset.for_company(company_id)
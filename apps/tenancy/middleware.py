@@ -1,11 +1,12 @@
 from urllib.parse import quote
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
 from django.core.exceptions import PermissionDenied
 from django.shortcuts import redirect, render
 from django.urls import reverse
 
-from .context import reset_current_company_id, set_current_company_id
+from .context import tenant_context
 from .session import (
     get_active_memberships_for_user,
     resolve_default_company_id,
@@ -14,46 +15,63 @@ from .session import (
 
 
 class CompanyContextMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.exempt_path_prefixes = tuple(settings.TENANCY_EXEMPT_PATH_PREFIXES)
+        self.fast_path_prefixes = tuple(
+            getattr(settings, 'TENANCY_FAST_PATH_PREFIXES', ())
+        )
 
     def __call__(self, request):
-        if self._is_exempt(request.path):
-            token = set_current_company_id(None)
-            try:
-                request.company_id = None
-                return self.get_response(request)
-            finally:
-                reset_current_company_id(token)
+        if self.async_mode:
+            return self.__acall__(request)
+
+        if self._is_public(request):
+            return self._call_with_company(request, None)
 
+        response, company_id = self._resolve_request(request)
+        if response is not None:
+            return response
+        return self._call_with_company(request, company_id)
+
+    async def __acall__(self, request):
+        company_id = None
+        if not self._is_public(request):
+            # Resolucao via sessao/usuario usa ORM sincrono.
+            response, company_id = await sync_to_async(self._resolve_request)(request)
+            if response is not None:
+                return response
+
+        with tenant_context(company_id):
+            request.company_id = company_id
+            return await self.get_response(request)
+
+    def _is_public(self, request):
+        path = request.path
+        if self.fast_path_prefixes and path.startswith(self.fast_path_prefixes):
+            # Rotas publicas (healthz/totem): nao toca em request.user nem na sessao.
+            request.tenancy_fast_path = True
+            return True
+        return self._is_exempt(path)
+
+    def _resolve_request(self, request):
         company_id = self._resolve_company_id(request)
-        if company_id is None:
-            if request.user.is_authenticated:
-                if request.user.is_superuser:
-                    token = set_current_company_id(None)
-                    try:
-                        request.company_id = None
-                        return self.get_response(request)
-                    finally:
-                        reset_current_company_id(token)
-                if (not request.user.is_superuser) and (
-                    not get_active_memberships_for_user(request.user).exists()
-                ):
-                    return render(request, 'errors/inactive_company.html', status=403)
-                return self._redirect_to_company_select(request)
-            token = set_current_company_id(None)
-            try:
-                request.company_id = None
-                return self.get_response(request)
-            finally:
-                reset_current_company_id(token)
+        if company_id is None and request.user.is_authenticated and not request.user.is_superuser:
+            if not get_active_memberships_for_user(request.user).exists():
+                return render(request, 'errors/inactive_company.html', status=403), None
+            return self._redirect_to_company_select(request), None
+        return None, company_id
 
-        token = set_current_company_id(company_id)
-        try:
+    def _call_with_company(self, request, company_id):
+        with tenant_context(company_id):
             request.company_id = company_id
             return self.get_response(request)
-        finally:
-            reset_current_company_id(token)
 
     def _resolve_company_id(self, request):
         if request.user.is_authenticated:
@@ -90,12 +108,8 @@ class CompanyContextMiddleware:
         except ValueError as exc:
             raise PermissionDenied(f'Invalid {header_name} value.') from exc
 
-    @staticmethod
-    def _is_exempt(path: str) -> bool:
-        return any(
-            path.startswith(prefix)
-            for prefix in settings.TENANCY_EXEMPT_PATH_PREFIXES
-        )
+    def _is_exempt(self, path: str) -> bool:
+        return path.startswith(self.exempt_path_prefixes)
 
     @staticmethod
     def _redirect_to_company_select(request):
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('tenancy', '0014_alter_company_logo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='defaults_seed_version',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('tenancy', '0015_company_defaults_seed_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='catalog_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('tenancy', '0016_company_catalog_version'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='company',
+            old_name='defaults_seed_version',
+            new_name='totem_types_seed_version',
+        ),
+    ]
@@ -60,6 +60,8 @@ class Company(models.Model):
     )
     slug = models.SlugField(max_length=80, unique=True)
     is_active = models.BooleanField(default=True)
+    totem_types_seed_version = models.PositiveSmallIntegerField(default=0)
+    catalog_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
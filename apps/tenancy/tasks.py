@@ -1,9 +1,16 @@
 from django.db import transaction
+from django.db.models import F
 
 from apps.core.models import AlertSetting, ComplaintType, Department, GHE, JobFunction, MoodType
 from apps.tenancy.models import Company
 
 
+# Versao dos tipos de humor/denuncia do totem. Ao incrementar, o proximo acesso
+# ao totem de cada empresa completa so esses tipos (ensure_default_totem_types);
+# GHEs, setores e funcoes novos chegam as empresas existentes apenas rodando
+# ``manage.py seed_company_defaults``.
+TOTEM_TYPES_SEED_VERSION = 1
+
 DEFAULT_MOOD_TYPES = [
     ('Muito bem', '\U0001F600', 'very_good', 5),
     ('Bem', '\U0001F642', 'good', 4),
@@ -84,6 +91,19 @@ DEFAULT_GHE_SECTOR_FUNCTIONS = [
 ]
 
 
+def totem_types_seeded(company) -> bool:
+    return (company.totem_types_seed_version or 0) >= TOTEM_TYPES_SEED_VERSION
+
+
+def mark_totem_types_seeded(company) -> None:
+    # bulk_create nao dispara signals: invalida o catalogo do totem aqui.
+    Company.objects.filter(pk=company.pk).update(
+        totem_types_seed_version=TOTEM_TYPES_SEED_VERSION,
+        catalog_version=F('catalog_version') + 1,
+    )
+    company.totem_types_seed_version = TOTEM_TYPES_SEED_VERSION
+
+
 def seed_company_defaults(company_id: int) -> None:
     company = Company.objects.filter(pk=company_id).first()
     if not company:
@@ -250,3 +270,5 @@ def seed_company_defaults(company_id: int) -> None:
             ]
             if dept_relations_to_create:
                 dept_through.objects.bulk_create(dept_relations_to_create)
+
+        mark_totem_types_seeded(company)
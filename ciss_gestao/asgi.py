@@ -9,8 +9,44 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
-
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ciss_gestao.settings')
+# Tira o WhiteNoiseMiddleware (so sincrono) da pilha; ver MIDDLEWARE em settings.
+os.environ['DJANGO_ASGI'] = '1'
+
+from asgiref.wsgi import WsgiToAsgi  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.asgi import get_asgi_application  # noqa: E402
+from whitenoise import WhiteNoise  # noqa: E402
+
+django_application = get_asgi_application()
+
+
+def _static_not_found(environ, start_response):
+    start_response('404 Not Found', [('Content-Type', 'text/plain; charset=utf-8')])
+    return [b'Not Found']
+
+
+def _build_static_application():
+    static_files = WhiteNoise(
+        _static_not_found,
+        root=settings.STATIC_ROOT,
+        prefix=settings.STATIC_URL,
+        autorefresh=settings.DEBUG,
+        # Nomes com hash do ManifestStaticFilesStorage podem ficar em cache para sempre.
+        immutable_file_test=r'\.[0-9a-f]{12}\.\w+$',
+    )
+    if settings.DEBUG:
+        for directory in settings.STATICFILES_DIRS:
+            static_files.add_files(directory, prefix=settings.STATIC_URL)
+    # So os arquivos estaticos passam pela thread do adaptador WSGI.
+    return WsgiToAsgi(static_files)
+
+
+static_application = _build_static_application()
+
 
-application = get_asgi_application()
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'].startswith(settings.STATIC_URL):
+        await static_application(scope, receive, send)
+        return
+    await django_application(scope, receive, send)
@@ -3,6 +3,13 @@ from apps.tenancy.session import get_membership_for_company
 
 
 def current_company(request):
+    if getattr(request, 'tenancy_fast_path', False):
+        return {
+            'current_company_name': '',
+            'current_company_id': None,
+            'is_master': False,
+            'user_role_label': '',
+        }
     company_id = request.session.get('company_id')
     company_name = ''
     user_role_label = ''
@@ -0,0 +1,254 @@
+"""Metricas por requisicao (tempo, SQL, cache) e registro Prometheus em memoria.
+
+As consultas sao medidas por um execute_wrapper instalado em cada conexao
+(signal ``connection_created``); o cache, pelos backends ``Instrumented*``.
+O registro e por processo: com varios workers, cada um expoe suas metricas.
+
+Cada SQL tambem vira uma impressao digital (literais e listas IN
+normalizados) para apontar N+1 e checar os orcamentos de ``QUERY_BUDGETS``.
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+_current_metrics: ContextVar['RequestMetrics | None'] = ContextVar('current_request_metrics', default=None)
+_MISSING = object()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\?")
+_SQL_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_SQL_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@lru_cache(maxsize=2048)
+def fingerprint_sql(sql):
+    normalized = _SQL_LITERAL_RE.sub('?', sql)
+    normalized = _SQL_IN_LIST_RE.sub('IN (...)', normalized)
+    return _SQL_WHITESPACE_RE.sub(' ', normalized).strip()
+
+
+class RequestMetrics:
+    __slots__ = (
+        'started_at',
+        'sql_time',
+        'query_count',
+        'duplicate_queries',
+        'cache_hits',
+        'cache_misses',
+        'fingerprints',
+        '_seen_queries',
+    )
+
+    def __init__(self):
+        self.started_at = perf_counter()
+        self.sql_time = 0.0
+        self.query_count = 0
+        self.duplicate_queries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.fingerprints = {}
+        self._seen_queries = set()
+
+    def record_query(self, sql, params, elapsed):
+        self.query_count += 1
+        self.sql_time += elapsed
+        fingerprint = fingerprint_sql(sql)
+        self.fingerprints[fingerprint] = self.fingerprints.get(fingerprint, 0) + 1
+        try:
+            signature = hash((sql, repr(params)))
+        except Exception:
+            return
+        if signature in self._seen_queries:
+            self.duplicate_queries += 1
+        else:
+            self._seen_queries.add(signature)
+
+    def repeated_fingerprints(self, threshold):
+        return sorted(
+            ((fingerprint, total) for fingerprint, total in self.fingerprints.items() if total >= threshold),
+            key=lambda item: -item[1],
+        )
+
+
+def find_query_problems(metrics, max_queries=None, n_plus_one_threshold=None):
+    problems = []
+    if max_queries is not None and metrics.query_count > max_queries:
+        problems.append(f'{metrics.query_count} consultas (orcamento: {max_queries})')
+    if n_plus_one_threshold:
+        for fingerprint, total in metrics.repeated_fingerprints(n_plus_one_threshold):
+            problems.append(f'possivel N+1: {total}x {fingerprint[:200]}')
+    return problems
+
+
+@contextmanager
+def query_budget(max_queries=None, n_plus_one_threshold=None):
+    """Falha (QueryBudgetExceeded) se o bloco estourar o orcamento de consultas."""
+    metrics, token = start_request_metrics()
+    try:
+        yield metrics
+    finally:
+        finish_request_metrics(token)
+    problems = find_query_problems(metrics, max_queries, n_plus_one_threshold)
+    if problems:
+        raise QueryBudgetExceeded('; '.join(problems))
+
+
+def start_request_metrics():
+    metrics = RequestMetrics()
+    return metrics, _current_metrics.set(metrics)
+
+
+def finish_request_metrics(token):
+    _current_metrics.reset(token)
+
+
+def current_request_metrics():
+    return _current_metrics.get()
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started_at = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.record_query(sql, params, perf_counter() - started_at)
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _record_cache_lookup(hit):
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+class CacheMetricsMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        _record_cache_lookup(value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version)
+        metrics = _current_metrics.get()
+        if metrics is not None:
+            metrics.cache_hits += len(values)
+            metrics.cache_misses += len(keys) - len(values)
+        return values
+
+
+class InstrumentedLocMemCache(CacheMetricsMixin, LocMemCache):
+    pass
+
+
+class InstrumentedRedisCache(CacheMetricsMixin, RedisCache):
+    pass
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._latency = {}
+        self._sql_seconds = {}
+        self._queries = {}
+        self._duplicate_queries = {}
+        self._budget_violations = {}
+        self._cache = {'hit': 0, 'miss': 0}
+
+    def observe(self, view, method, status, duration, metrics):
+        request_key = (view, method, str(status))
+        with self._lock:
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+            histogram = self._latency.get(view)
+            if histogram is None:
+                histogram = self._latency[view] = [[0] * len(LATENCY_BUCKETS), 0, 0.0]
+            bucket_index = bisect_left(LATENCY_BUCKETS, duration)
+            if bucket_index < len(LATENCY_BUCKETS):
+                histogram[0][bucket_index] += 1
+            histogram[1] += 1
+            histogram[2] += duration
+            self._sql_seconds[view] = self._sql_seconds.get(view, 0.0) + metrics.sql_time
+            self._queries[view] = self._queries.get(view, 0) + metrics.query_count
+            self._duplicate_queries[view] = self._duplicate_queries.get(view, 0) + metrics.duplicate_queries
+            self._cache['hit'] += metrics.cache_hits
+            self._cache['miss'] += metrics.cache_misses
+
+    def observe_budget_violation(self, view):
+        with self._lock:
+            self._budget_violations[view] = self._budget_violations.get(view, 0) + 1
+
+    def render(self):
+        with self._lock:
+            lines = [
+                '# HELP http_requests_total Requisicoes HTTP por view, metodo e status.',
+                '# TYPE http_requests_total counter',
+            ]
+            for (view, method, status), total in sorted(self._requests.items()):
+                lines.append(
+                    f'http_requests_total{{view="{_escape(view)}",method="{method}",status="{status}"}} {total}'
+                )
+
+            lines += [
+                '# HELP http_request_duration_seconds Latencia das requisicoes por view.',
+                '# TYPE http_request_duration_seconds histogram',
+            ]
+            for view, (buckets, count, total) in sorted(self._latency.items()):
+                label = f'view="{_escape(view)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+                    cumulative += bucket_count
+                    lines.append(f'http_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_duration_seconds_bucket{{{label},le="+Inf"}} {count}')
+                lines.append(f'http_request_duration_seconds_sum{{{label}}} {total:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{label}}} {count}')
+
+            for name, help_text, values in (
+                ('db_query_duration_seconds_total', 'Tempo de SQL acumulado por view.', self._sql_seconds),
+                ('db_queries_total', 'Consultas SQL por view.', self._queries),
+                ('db_duplicate_queries_total', 'Consultas SQL repetidas na mesma requisicao por view.', self._duplicate_queries),
+                ('db_query_budget_violations_total', 'Requisicoes acima do orcamento de consultas ou com N+1.', self._budget_violations),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for view, value in sorted(values.items()):
+                    formatted = f'{value:.6f}' if isinstance(value, float) else value
+                    lines.append(f'{name}{{view="{_escape(view)}"}} {formatted}')
+
+            lines += [
+                '# HELP cache_lookups_total Leituras de cache por resultado.',
+                '# TYPE cache_lookups_total counter',
+                f'cache_lookups_total{{result="hit"}} {self._cache["hit"]}',
+                f'cache_lookups_total{{result="miss"}} {self._cache["miss"]}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+registry = MetricsRegistry()
@@ -1,24 +1,110 @@
+import json
+import logging
 import time
-from django.db import connection
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import (
+    QueryBudgetExceeded,
+    find_query_problems,
+    finish_request_metrics,
+    registry,
+    start_request_metrics,
+)
+
+
+logger = logging.getLogger('ciss_gestao.requests')
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
 
-class RequestTimingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.ignored_path_prefixes = tuple(settings.REQUEST_METRICS_IGNORED_PATH_PREFIXES)
+        self.query_budgets = dict(settings.QUERY_BUDGETS)
+        self.n_plus_one_threshold = settings.QUERY_BUDGET_N_PLUS_ONE_THRESHOLD
+        self.strict_budgets = settings.QUERY_BUDGET_STRICT
 
     def __call__(self, request):
-        start = time.perf_counter()
-        response = self.get_response(request)
-        elapsed_ms = (time.perf_counter() - start) * 1000
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.path.startswith(self.ignored_path_prefixes):
+            return self.get_response(request)
+        metrics, token = start_request_metrics()
         try:
-            queries = getattr(connection, 'queries', [])
-            sql_time_ms = sum(float(q.get('time', 0)) for q in queries) * 1000
-            query_count = len(queries)
-        except Exception:
-            sql_time_ms = 0.0
-            query_count = 0
-        print(
-            f"[perf] {request.method} {request.path} -> {response.status_code} | "
-            f"{elapsed_ms:.1f} ms total | {sql_time_ms:.1f} ms SQL | {query_count} queries"
-        )
+            response = self.get_response(request)
+        finally:
+            finish_request_metrics(token)
+        self._record(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        if request.path.startswith(self.ignored_path_prefixes):
+            return await self.get_response(request)
+        metrics, token = start_request_metrics()
+        try:
+            response = await self.get_response(request)
+        finally:
+            finish_request_metrics(token)
+        self._record(request, response, metrics)
         return response
+
+    def _record(self, request, response, metrics):
+        duration = time.perf_counter() - metrics.started_at
+        resolver_match = getattr(request, 'resolver_match', None)
+        view = (resolver_match.view_name if resolver_match else '') or 'unresolved'
+        registry.observe(view, request.method, response.status_code, duration, metrics)
+        self._check_query_budget(request, view, metrics)
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        logger.info(
+            json.dumps(
+                {
+                    'event': 'request',
+                    'method': request.method,
+                    'path': request.path,
+                    'view': view,
+                    'status': response.status_code,
+                    'duration_ms': round(duration * 1000, 1),
+                    'sql_ms': round(metrics.sql_time * 1000, 1),
+                    'queries': metrics.query_count,
+                    'duplicate_queries': metrics.duplicate_queries,
+                    'cache_hits': metrics.cache_hits,
+                    'cache_misses': metrics.cache_misses,
+                    'company_id': getattr(request, 'company_id', None),
+                },
+                separators=(',', ':'),
+            )
+        )
+
+    def _check_query_budget(self, request, view, metrics):
+        problems = find_query_problems(
+            metrics,
+            max_queries=self.query_budgets.get(view),
+            n_plus_one_threshold=self.n_plus_one_threshold,
+        )
+        if not problems:
+            return
+        registry.observe_budget_violation(view)
+        logger.warning(
+            json.dumps(
+                {
+                    'event': 'query_budget',
+                    'path': request.path,
+                    'view': view,
+                    'queries': metrics.query_count,
+                    'budget': self.query_budgets.get(view),
+                    'problems': problems,
+                },
+                separators=(',', ':'),
+            )
+        )
+        if self.strict_budgets:
+            # Em testes/CI a regressao vira erro em vez de dashboard lento.
+            raise QueryBudgetExceeded(f'{view}: ' + '; '.join(problems))
@@ -0,0 +1,60 @@
+"""Cache das listagens (cache_page) com invalidacao por empresa.
+
+Cada pagina fica no cache com o prefixo ``pages:<escopo>:<versao>``; o escopo
+e a empresa da requisicao ou ``master`` nas telas do painel master. Depois de
+gravar, a view troca a versao do proprio escopo em vez de ``cache.clear()``,
+que no Redis compartilhado apagaria o cache de todas as empresas (contadores
+do painel master, catalogo dos totens). Se a versao for descartada pelo
+cache, volta com um valor novo e as paginas antigas nunca sao reaproveitadas.
+"""
+
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.views.decorators.cache import cache_page
+
+
+MASTER_SCOPE = 'master'
+
+
+def _version_key(scope):
+    return f'page-cache-version:{scope}'
+
+
+def page_cache_version(scope):
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_now(scopes):
+    for scope in scopes:
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            cache.set(_version_key(scope), time.time_ns(), None)
+
+
+def invalidate_page_cache(*scopes):
+    scopes = {scope for scope in scopes if scope}
+    if scopes:
+        # Apos o commit: antes dele a listagem seria recalculada com os dados antigos.
+        transaction.on_commit(lambda: _bump_now(scopes))
+
+
+def scoped_cache_page(timeout, master=False):
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            scope = MASTER_SCOPE if master else getattr(request, 'current_company_id', None) or 'none'
+            key_prefix = f'pages:{scope}:{page_cache_version(scope)}'
+            return cache_page(timeout, key_prefix=key_prefix)(view_func)(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,339 @@
+"""Profiler opcional para requisicoes lentas (PROFILING_ENABLED=1).
+
+Toda requisicao e acompanhada por um amostrador de pilhas (thread unica que le
+``sys._current_frames()`` a cada ``PROFILING_INTERVAL_MS``); custo baixo, sem
+instrumentar o codigo. Uma fracao ``PROFILING_SAMPLE_RATE`` tambem roda com
+``cProfile``. So e gravado o que passar de ``PROFILING_SLOW_MS`` ou tiver sido
+sorteado: ``<id>.json`` (metadados e top-N funcoes), ``<id>.collapsed``
+(pilhas no formato do flamegraph.pl/speedscope) e ``<id>.prof`` (pstats).
+
+Os arquivos ficam em disco local (``PROFILING_STORAGE_DIR``) de cada servidor
+e sao listados em /master/profiles/.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+from .metrics import current_request_metrics
+
+
+logger = logging.getLogger('ciss_gestao.requests')
+
+PROFILE_ID_RE = re.compile(r'^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$')
+PROFILE_FILE_SUFFIXES = ('.json', '.collapsed', '.prof')
+MAX_STACK_DEPTH = 128
+
+# cProfile (sys.monitoring no 3.12+) aceita um profiler ativo por vez.
+_cprofile_lock = threading.Lock()
+
+
+def profiling_enabled():
+    return settings.PROFILING_ENABLED
+
+
+def profile_storage_dir():
+    return Path(settings.PROFILING_STORAGE_DIR)
+
+
+def _frame_label(code):
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def _collapse_frame(frame):
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return ';'.join(labels)
+
+
+class StackSampler:
+    """Thread daemon que amostra as pilhas das threads registradas."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread = None
+
+    def register(self, thread_id):
+        samples = Counter()
+        with self._lock:
+            self._targets[thread_id] = samples
+            self._active.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+                self._thread.start()
+        return samples
+
+    def unregister(self, thread_id):
+        with self._lock:
+            self._targets.pop(thread_id, None)
+            if not self._targets:
+                self._active.clear()
+
+    def _run(self):
+        sampler_id = threading.get_ident()
+        while True:
+            self._active.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                targets = list(self._targets.items())
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for thread_id, samples in targets:
+                frame = frames.get(thread_id)
+                if frame is not None and thread_id != sampler_id:
+                    samples[_collapse_frame(frame)] += 1
+            del frames
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+    return _sampler
+
+
+class ProfilingSession:
+    def __init__(self, threshold_ms=None, sample_rate=None):
+        self.threshold_ms = settings.PROFILING_SLOW_MS if threshold_ms is None else threshold_ms
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.sampled = random.random() < self.sample_rate
+        self.thread_id = threading.get_ident()
+        self.samples = None
+        self.profiler = None
+        self.started_at = None
+        self.duration = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.samples = get_sampler().register(self.thread_id)
+
+    def stop(self):
+        get_sampler().unregister(self.thread_id)
+        self.duration = time.perf_counter() - self.started_at
+
+    def configure(self, threshold_ms=None, sample_rate=None):
+        # Usado por @profile_request quando o middleware ja abriu a sessao.
+        if threshold_ms is not None:
+            self.threshold_ms = threshold_ms
+        if sample_rate is not None and not self.sampled:
+            self.sampled = random.random() < sample_rate
+
+    def call(self, func, *args, **kwargs):
+        if not self.sampled or self.profiler is not None or not _cprofile_lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Outro profiler (debugger, coverage) ja esta ativo no processo.
+                return func(*args, **kwargs)
+            self.profiler = profiler
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+        finally:
+            _cprofile_lock.release()
+
+    def should_save(self):
+        return self.sampled or self.duration * 1000 >= self.threshold_ms
+
+    def save(self, request, response):
+        try:
+            return save_profile(self, request, response)
+        except OSError:
+            logger.exception('Falha ao gravar profile de %s', request.path)
+            return None
+
+
+def _top_from_profiler(profiler, limit):
+    stats = pstats.Stats(profiler).stats
+    rows = [
+        {
+            'function': f'{name} ({os.path.basename(filename)}:{line})',
+            'calls': calls,
+            'self_ms': round(self_time * 1000, 2),
+            'cumulative_ms': round(cumulative * 1000, 2),
+        }
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in stats.items()
+    ]
+    rows.sort(key=lambda row: -row['self_ms'])
+    return rows[:limit]
+
+
+def _top_from_samples(samples, interval_ms, limit):
+    self_counts = Counter()
+    cumulative_counts = Counter()
+    for stack, count in samples.items():
+        frames = stack.split(';')
+        self_counts[frames[-1]] += count
+        for label in set(frames):
+            cumulative_counts[label] += count
+    return [
+        {
+            'function': label,
+            'calls': None,
+            'self_ms': round(count * interval_ms, 2),
+            'cumulative_ms': round(cumulative_counts[label] * interval_ms, 2),
+        }
+        for label, count in self_counts.most_common(limit)
+    ]
+
+
+def save_profile(session, request, response):
+    storage_dir = profile_storage_dir()
+    storage_dir.mkdir(parents=True, exist_ok=True)
+    now = timezone.now()
+    profile_id = f'{now:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}'
+    interval_ms = settings.PROFILING_INTERVAL_MS
+    limit = settings.PROFILING_TOP_N
+
+    samples = dict(session.samples or {})
+    (storage_dir / f'{profile_id}.collapsed').write_text(
+        ''.join(f'{stack} {count}\n' for stack, count in sorted(samples.items())),
+        encoding='utf-8',
+    )
+    if session.profiler is not None:
+        session.profiler.dump_stats(str(storage_dir / f'{profile_id}.prof'))
+        top_functions = _top_from_profiler(session.profiler, limit)
+    else:
+        top_functions = _top_from_samples(samples, interval_ms, limit)
+
+    resolver_match = getattr(request, 'resolver_match', None)
+    metrics = current_request_metrics()
+    metadata = {
+        'id': profile_id,
+        'created_at': now.isoformat(),
+        'method': request.method,
+        'path': request.path,
+        'view': (resolver_match.view_name if resolver_match else '') or 'unresolved',
+        'status': response.status_code,
+        'duration_ms': round(session.duration * 1000, 1),
+        'threshold_ms': session.threshold_ms,
+        'reason': 'sampled' if session.sampled else 'slow',
+        'mode': 'cprofile' if session.profiler is not None else 'sampling',
+        'samples': sum(samples.values()),
+        'interval_ms': interval_ms,
+        'queries': metrics.query_count if metrics else None,
+        'sql_ms': round(metrics.sql_time * 1000, 1) if metrics else None,
+        'company_id': getattr(request, 'company_id', None),
+        'top_functions': top_functions,
+    }
+    (storage_dir / f'{profile_id}.json').write_text(
+        json.dumps(metadata, ensure_ascii=False, indent=2),
+        encoding='utf-8',
+    )
+    prune_profiles(storage_dir, settings.PROFILING_MAX_FILES)
+    return profile_id
+
+
+def prune_profiles(storage_dir, keep):
+    profiles = sorted(storage_dir.glob('*.json'), reverse=True)
+    for metadata_path in profiles[keep:]:
+        for suffix in PROFILE_FILE_SUFFIXES:
+            metadata_path.with_suffix(suffix).unlink(missing_ok=True)
+
+
+def list_profiles():
+    storage_dir = profile_storage_dir()
+    if not storage_dir.is_dir():
+        return []
+    profiles = []
+    for metadata_path in sorted(storage_dir.glob('*.json'), reverse=True):
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        metadata['has_prof'] = metadata_path.with_suffix('.prof').exists()
+        profiles.append(metadata)
+    return profiles
+
+
+def profile_file_path(profile_id, suffix):
+    if not PROFILE_ID_RE.match(profile_id) or suffix not in PROFILE_FILE_SUFFIXES:
+        return None
+    path = profile_storage_dir() / f'{profile_id}{suffix}'
+    return path if path.is_file() else None
+
+
+def profile_request(threshold_ms=None, sample_rate=None):
+    """Limite/amostragem proprios para uma view (use method_decorator em CBVs)."""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapped(request, *args, **kwargs):
+            if not profiling_enabled():
+                return view_func(request, *args, **kwargs)
+            session = getattr(request, 'profiling_session', None)
+            if session is not None:
+                session.configure(threshold_ms, sample_rate)
+                return session.call(view_func, request, *args, **kwargs)
+
+            session = ProfilingSession(threshold_ms, sample_rate)
+            session.start()
+            try:
+                response = session.call(view_func, request, *args, **kwargs)
+            finally:
+                session.stop()
+            if session.should_save():
+                session.save(request, response)
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+class ProfilingMiddleware:
+    # O amostrador acompanha a thread da requisicao; so faz sentido em WSGI.
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        if not profiling_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.ignored_path_prefixes = tuple(settings.REQUEST_METRICS_IGNORED_PATH_PREFIXES)
+
+    def __call__(self, request):
+        if request.path.startswith(self.ignored_path_prefixes):
+            return self.get_response(request)
+        session = ProfilingSession()
+        request.profiling_session = session
+        session.start()
+        try:
+            response = session.call(self.get_response, request)
+        finally:
+            session.stop()
+        if session.should_save():
+            session.save(request, response)
+        return response
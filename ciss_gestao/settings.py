@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -84,7 +85,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'ciss_gestao.middleware.RequestMetricsMiddleware',
+    'ciss_gestao.profiling.ProfilingMiddleware',
 
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -94,6 +96,12 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+# WhiteNoiseMiddleware e so sincrono: no ASGI (DJANGO_ASGI=1, definido em
+# ciss_gestao.asgi) cada requisicao ocuparia uma thread ate o fim. La os
+# estaticos sao servidos antes do Django e o restante fica assincrono.
+SERVE_STATIC_VIA_ASGI = get_bool('DJANGO_ASGI', False)
+if not SERVE_STATIC_VIA_ASGI:
+    MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
 
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 WHITENOISE_MANIFEST_STRICT = False
@@ -103,12 +111,18 @@ RQ_QUEUES = {
     'default': {
         'URL': REDIS_URL or 'redis://localhost:6379/0',
         'DEFAULT_TIMEOUT': 300,
-    }
+    },
+    'alerts_email': {
+        'URL': REDIS_URL or 'redis://localhost:6379/0',
+        'DEFAULT_TIMEOUT': 120,
+    },
 }
+# Janela (s) que agrupa eventos do totem numa unica avaliacao de alertas por
+# empresa. Requer worker com scheduler (rqworker --with-scheduler); 0 desativa.
+ALERT_EVALUATION_DEBOUNCE_SECONDS = int(os.getenv('ALERT_EVALUATION_DEBOUNCE_SECONDS', '60'))
 
-if DEBUG:
-    # MIDDLEWARE.insert(0, 'debug_toolbar.middleware.DebugToolbarMiddleware')
-    MIDDLEWARE.append('ciss_gestao.middleware.RequestTimingMiddleware')
+# if DEBUG:
+#     MIDDLEWARE.insert(0, 'debug_toolbar.middleware.DebugToolbarMiddleware')
 
 ROOT_URLCONF = 'ciss_gestao.urls'
 
@@ -149,6 +163,8 @@ else:
             'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
             'HOST': os.getenv('DB_HOST', 'localhost'),
             'PORT': os.getenv('DB_PORT', '5432'),
+            # Necessario atras de pgbouncer em modo transaction (iterator() usa cursor no servidor).
+            'DISABLE_SERVER_SIDE_CURSORS': get_bool('DB_DISABLE_SERVER_SIDE_CURSORS', False),
         }
     }
 
@@ -252,24 +268,102 @@ INTERNAL_IPS = [
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'cissconsult-local',
+# Com varios workers o cache precisa ser compartilhado (contadores do painel
+# master, versoes das metricas de periodo). Usa outro banco do Redis do RQ:
+# cache.clear() faz FLUSHDB e nao pode levar as filas junto.
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', '').strip()
+if not CACHE_REDIS_URL and REDIS_URL:
+    _redis_url = urlsplit(REDIS_URL)
+    _redis_db = int(_redis_url.path.strip('/') or 0)
+    CACHE_REDIS_URL = urlunsplit(_redis_url._replace(path=f'/{_redis_db + 1}'))
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'ciss_gestao.metrics.InstrumentedRedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': 'cissconsult',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'ciss_gestao.metrics.InstrumentedLocMemCache',
+            'LOCATION': 'cissconsult-local',
+        }
     }
-}
 
 TENANCY_COMPANY_HEADER = os.getenv('TENANCY_COMPANY_HEADER', 'X-Company-Id')
 TENANCY_EXEMPT_PATH_PREFIXES = [
     '/admin/',
     '/auth/',
     '/healthz/',
+    '/metrics/',
     '/static/',
     '/media/',
     '/master/',
     '/campaigns/',
     '/__debug__/',
 ]
+# Rotas publicas de alto volume: sem resolucao de empresa por sessao/usuario.
+TENANCY_FAST_PATH_PREFIXES = [
+    '/healthz/',
+    '/metrics/',
+    '/totem/',
+]
+TOTEM_BOOTSTRAP_MAX_AGE = int(os.getenv('TOTEM_BOOTSTRAP_MAX_AGE', '60'))
+TOTEM_SYNC_MAX_EVENTS = int(os.getenv('TOTEM_SYNC_MAX_EVENTS', '200'))
+# Eventos offline mais antigos que isso sao recusados (nao reabrem meses fechados).
+TOTEM_SYNC_MAX_EVENT_AGE_DAYS = int(os.getenv('TOTEM_SYNC_MAX_EVENT_AGE_DAYS', '7'))
+# 'sync' grava o humor na requisicao; 'stream' usa o Redis (drain_mood_stream).
+TOTEM_MOOD_INGESTION = os.getenv('TOTEM_MOOD_INGESTION', 'sync').strip().lower()
+TOTEM_MOOD_STREAM_KEY = os.getenv('TOTEM_MOOD_STREAM_KEY', 'totem:mood-events')
+TOTEM_MOOD_STREAM_MAXLEN = int(os.getenv('TOTEM_MOOD_STREAM_MAXLEN', '1000000'))
+TOTEM_MOOD_STREAM_BATCH_SIZE = int(os.getenv('TOTEM_MOOD_STREAM_BATCH_SIZE', '500'))
+
+# Metricas por requisicao: log JSON em ciss_gestao.requests e /metrics (Prometheus).
+REQUEST_METRICS_IGNORED_PATH_PREFIXES = ['/static/', '/media/', '/metrics/']
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '').strip()
+# Orcamento de consultas SQL por view (nome da rota). Estouro ou N+1 gera log
+# de aviso; com QUERY_BUDGET_STRICT=1 (testes/CI) a requisicao falha.
+QUERY_BUDGETS = {
+    'dashboard': 40,
+    'master-dashboard': 15,
+    'complaints-list': 15,
+    'campaigns-report': 30,
+    'campaigns-report-pdf': 25,
+    'reports-detail': 30,
+}
+QUERY_BUDGET_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_BUDGET_N_PLUS_ONE_THRESHOLD', '10'))
+QUERY_BUDGET_STRICT = get_bool('QUERY_BUDGET_STRICT', False)
+# Relatorios com periodo maior que isso (dias) congelam as metricas num job do RQ.
+REPORT_SNAPSHOT_INLINE_MAX_DAYS = int(os.getenv('REPORT_SNAPSHOT_INLINE_MAX_DAYS', '31'))
+# Lote de respostas de campanha lido por vez nos relatorios (apps.core.analytics).
+CAMPAIGN_ANALYTICS_CHUNK_SIZE = int(os.getenv('CAMPAIGN_ANALYTICS_CHUNK_SIZE', '1000'))
+# Profiler opcional (ciss_gestao.profiling): amostra as pilhas de toda
+# requisicao e grava as que passam de PROFILING_SLOW_MS; uma fracao
+# PROFILING_SAMPLE_RATE roda tambem com cProfile. Lista em /master/profiles/.
+PROFILING_ENABLED = get_bool('PROFILING_ENABLED', False)
+PROFILING_SLOW_MS = int(os.getenv('PROFILING_SLOW_MS', '1500'))
+PROFILING_PDF_SLOW_MS = int(os.getenv('PROFILING_PDF_SLOW_MS', '8000'))
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0.001'))
+PROFILING_INTERVAL_MS = int(os.getenv('PROFILING_INTERVAL_MS', '10'))
+PROFILING_TOP_N = int(os.getenv('PROFILING_TOP_N', '30'))
+PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '200'))
+PROFILING_STORAGE_DIR = Path(os.getenv('PROFILING_STORAGE_DIR', BASE_DIR / 'profiles'))
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'ciss_gestao.requests': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
 
 LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
@@ -288,3 +382,6 @@ EMAIL_USE_TLS = get_bool('EMAIL_USE_TLS', True)
 EMAIL_USE_SSL = get_bool('EMAIL_USE_SSL', False)
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'no-reply@localhost')
 SERVER_EMAIL = os.getenv('SERVER_EMAIL', DEFAULT_FROM_EMAIL)
+# Alertas do mesmo periodo viram um unico e-mail de resumo por empresa.
+ALERT_EMAIL_DIGEST_SECONDS = int(os.getenv('ALERT_EMAIL_DIGEST_SECONDS', '300'))
+ALERT_EMAIL_RATE_LIMIT_PER_HOUR = int(os.getenv('ALERT_EMAIL_RATE_LIMIT_PER_HOUR', '6'))
@@ -55,6 +55,8 @@ from .views import (
     JobFunctionUpdateView,
     MasterDashboardView,
     MasterCompanyMetricsView,
+    MasterProfileDownloadView,
+    MasterProfilesView,
     MasterTechnicalSettingsView,
     DashboardView,
     ComplaintTypeCreateView,
@@ -71,6 +73,8 @@ from .views import (
     DepartmentDeleteView,
     DepartmentListView,
     DepartmentUpdateView,
+    StructureImportStatusView,
+    StructureImportView,
     HelpRequestDeleteView,
     HelpRequestHistoryView,
     HelpRequestListView,
@@ -88,6 +92,8 @@ from .views import (
     TotemDeleteView,
     TotemComplaintSubmitView,
     TotemDepartmentsView,
+    TotemBootstrapView,
+    TotemSyncView,
     TotemHelpRequestSubmitView,
     TotemListView,
     TotemMoodSubmitView,
@@ -100,6 +106,7 @@ from .views import (
     MasterReportSettingsUpdateView,
     campaign_qr,
     healthz,
+    metrics,
     home,
 )
 
@@ -165,6 +172,8 @@ urlpatterns = [
     path('master/settings/technical/<int:responsible_id>/delete/', TechnicalResponsibleDeleteView.as_view(), name='master-settings-technical-delete'),
     path('master/settings/technical/<int:responsible_id>/remove/', TechnicalResponsibleRemoveView.as_view(), name='master-settings-technical-remove'),
     path('master/settings/report/', MasterReportSettingsUpdateView.as_view(), name='master-settings-report-update'),
+    path('master/profiles/', MasterProfilesView.as_view(), name='master-profiles'),
+    path('master/profiles/<str:profile_id>/<str:kind>/', MasterProfileDownloadView.as_view(), name='master-profiles-download'),
     path('users/', InternalUserListView.as_view(), name='users-list'),
     path('users/new/', InternalUserCreateView.as_view(), name='users-create'),
     path('users/<int:membership_id>/edit/', InternalUserUpdateView.as_view(), name='users-update'),
@@ -182,6 +191,8 @@ urlpatterns = [
     path('job-functions/new/', JobFunctionCreateView.as_view(), name='job-functions-create'),
     path('job-functions/<int:job_function_id>/edit/', JobFunctionUpdateView.as_view(), name='job-functions-update'),
     path('job-functions/<int:job_function_id>/delete/', JobFunctionDeleteView.as_view(), name='job-functions-delete'),
+    path('structure-import/', StructureImportView.as_view(), name='structure-import'),
+    path('structure-import/<str:job_id>/', StructureImportStatusView.as_view(), name='structure-import-status'),
     path('help-requests/', HelpRequestListView.as_view(), name='help-requests-list'),
     path('help-requests/<int:help_request_id>/edit/', HelpRequestUpdateView.as_view(), name='help-requests-update'),
     path('help-requests/<int:help_request_id>/history/', HelpRequestHistoryView.as_view(), name='help-requests-history'),
@@ -211,10 +222,13 @@ urlpatterns = [
     path('relatorios/<int:report_id>/', ReportDetailView.as_view(), name='reports-detail'),
     path('totem/<slug:company_slug>/<slug:totem_slug>/', TotemView.as_view(), name='totem-home'),
     path('totem/<slug:company_slug>/<slug:totem_slug>/departments/', TotemDepartmentsView.as_view(), name='totem-departments'),
+    path('totem/<slug:company_slug>/<slug:totem_slug>/bootstrap/', TotemBootstrapView.as_view(), name='totem-bootstrap'),
+    path('totem/<slug:company_slug>/<slug:totem_slug>/sync/', TotemSyncView.as_view(), name='totem-sync'),
     path('totem/<slug:company_slug>/<slug:totem_slug>/mood/', TotemMoodSubmitView.as_view(), name='totem-mood'),
     path('totem/<slug:company_slug>/<slug:totem_slug>/complaint/', TotemComplaintSubmitView.as_view(), name='totem-complaint'),
     path('totem/<slug:company_slug>/<slug:totem_slug>/help/', TotemHelpRequestSubmitView.as_view(), name='totem-help'),
     path('healthz/', healthz, name='healthz'),
+    path('metrics/', metrics, name='metrics'),
 ]
 
 if settings.DEBUG:
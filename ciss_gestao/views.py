@@ -13,27 +13,29 @@ from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView
 from django.core.exceptions import PermissionDenied
-from django.core.mail import send_mail
 from django.core.paginator import Paginator
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.db.models import Count, Q
-from django.db.models.functions import TruncMonth
-from django.http import HttpResponse, JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_datetime
 from django.utils.text import slugify
 from django.utils.text import get_valid_filename
 from django.views import View
 from django.core.cache import cache
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.utils.http import quote_etag
 from django.views.decorators.vary import vary_on_headers
 from datetime import date, datetime, timedelta
 from uuid import uuid4
 from io import BytesIO
+from asgiref.sync import sync_to_async
 
 try:
     from google import genai
@@ -50,7 +52,9 @@ from apps.core.models import (
     Campaign,
     CampaignReportSettings,
     CampaignReportAction,
+    CampaignDomainScoreCounter,
     CampaignResponse,
+    CampaignResponseMonthlyCounter,
     Complaint,
     ComplaintType,
     Department,
@@ -65,8 +69,23 @@ from apps.core.models import (
     TechnicalResponsible,
     Totem,
 )
+from apps.core.analytics import iter_campaign_answers
+from apps.core.counters import (
+    NEGATIVE_SENTIMENTS,
+    increment_alert_counters,
+    increment_campaign_response_counters,
+    increment_counters_for_records,
+    master_dashboard_counters,
+    window_totals,
+    window_totals_by_company,
+)
+from apps.core.ingestion import append_mood_event, stream_ingestion_enabled
+from apps.core.notifications import queue_alert_notification
+from apps.core.structure_import import get_structure_import_status, start_structure_import
 from masterdata.models import MasterReportSettings
+from apps.tenancy.context import tenant_context
 from apps.tenancy.models import Company, CompanyMembership
+from apps.tenancy.tasks import mark_totem_types_seeded, totem_types_seeded
 from apps.tenancy.session import (
     get_active_memberships_for_user,
     get_membership_for_company,
@@ -74,6 +93,9 @@ from apps.tenancy.session import (
     user_has_company_access,
     user_is_company_admin,
 )
+from .metrics import registry as metrics_registry
+from .page_cache import MASTER_SCOPE, invalidate_page_cache, scoped_cache_page
+from .profiling import list_profiles, profile_file_path, profile_request
 from .report_pdf import build_campaign_report_pdf
 
 try:
@@ -184,21 +206,69 @@ def build_period_metrics(company_id, period_start, period_end, sentiment_labels)
             top_sentiment['sentiment'],
             'Sem registros',
         ) if top_sentiment else 'Sem registros',
-        'complaint_status': complaint_status,
-        'mood_by_department': mood_by_department,
-        'complaint_by_totem': complaint_by_totem,
+        'complaint_status': list(complaint_status),
+        'mood_by_department': list(mood_by_department),
+        'complaint_by_totem': list(complaint_by_totem),
         'mood_distribution': mood_distribution,
         'complaint_distribution': complaint_distribution,
     }
 
 
-def build_report_metrics(company_id, report, sentiment_labels):
-    return build_period_metrics(
-        company_id,
+REPORT_SNAPSHOT_VERSION = 1
+# Passado esse tempo sem o job terminar, a visualizacao gera o snapshot na hora.
+REPORT_SNAPSHOT_JOB_GRACE = timedelta(minutes=10)
+
+
+def capture_report_snapshot(report):
+    metrics = build_period_metrics(
+        report.company_id,
         report.period_start,
         report.period_end,
-        sentiment_labels,
+        ReportDetailView.SENTIMENT_LABELS,
     )
+    now = timezone.now()
+    report.metrics_snapshot = {
+        'version': REPORT_SNAPSHOT_VERSION,
+        'captured_at': now.isoformat(),
+        'metrics': metrics,
+    }
+    report.status = 'ready'
+    if report.generated_at is None:
+        report.generated_at = now
+    report.save(update_fields=['metrics_snapshot', 'status', 'generated_at', 'updated_at'])
+    return metrics
+
+
+def get_report_metrics(report):
+    snapshot = report.metrics_snapshot or {}
+    if snapshot.get('version') == REPORT_SNAPSHOT_VERSION:
+        return snapshot['metrics']
+    # Relatorios anteriores ao snapshot congelam na primeira visualizacao.
+    return capture_report_snapshot(report)
+
+
+def _capture_report_snapshot_job(report_id):
+    report = Report.all_objects.filter(pk=report_id).first()
+    if report is None:
+        return
+    with tenant_context(report.company_id):
+        Report.all_objects.filter(pk=report.pk).update(status='processing')
+        try:
+            capture_report_snapshot(report)
+        except Exception:
+            Report.all_objects.filter(pk=report.pk).update(status='failed')
+            raise
+
+
+def enqueue_report_snapshot(report):
+    if django_rq is None:
+        return False
+    try:
+        django_rq.get_queue('default').enqueue(_capture_report_snapshot_job, report.id)
+    except Exception:
+        logger.exception('Falha ao enfileirar snapshot do relatorio %s.', report.id)
+        return False
+    return True
 
 
 def _compare_counts(metrics_a, metrics_b, key):
@@ -254,12 +324,9 @@ def build_campaign_metrics(campaign):
     step_offsets = CampaignReportView.STEP_OFFSETS
     step_questions = CampaignReportView.STEP_QUESTIONS
 
-    response_rows = responses_qs.values('responses', group_id_field).iterator(chunk_size=500)
-    for response in response_rows:
+    for answers_by_step, group_id in iter_campaign_answers(responses_qs, group_id_field):
         responses_count += 1
-        answers_by_step = response.get('responses') or {}
-        group_id = response.get(group_id_field)
-        for step_key, answers in answers_by_step.items():
+        for step_key, answers in (answers_by_step or {}).items():
             if step_key not in domain_by_step or not answers:
                 continue
             question_offset = step_offsets.get(step_key, 0)
@@ -448,6 +515,21 @@ def healthz(request):
     return JsonResponse({'status': 'ok'})
 
 
+def metrics(request):
+    # Fechado por padrao: sem METRICS_TOKEN so o superusuario logado ve as metricas.
+    user = getattr(request, 'user', None)
+    if not (user is not None and user.is_superuser):
+        token = settings.METRICS_TOKEN
+        if not token:
+            raise Http404
+        if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return HttpResponse(status=401)
+    return HttpResponse(
+        metrics_registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
 def inactive_company(request, exception=None):
     return render(request, 'errors/inactive_company.html', status=403)
 
@@ -1058,29 +1140,10 @@ class MasterDashboardView(MasterRequiredMixin, View):
 
     @staticmethod
     def _build_context():
-        companies_qs = Company.objects.order_by('-created_at')
-        active_companies_qs = Company.objects.filter(is_active=True).order_by('name')
-        initial_company = active_companies_qs.only('id', 'name').first()
-        total_companies = companies_qs.count()
-        active_companies = companies_qs.filter(is_active=True).count()
-        campaigns_qs = Campaign.all_objects.all()
-        total_campaigns = campaigns_qs.count()
-        active_campaigns = campaigns_qs.filter(status=Campaign.Status.ACTIVE).count()
-        paused_campaigns = campaigns_qs.filter(status=Campaign.Status.PAUSED).count()
-        planned_campaigns = campaigns_qs.filter(status=Campaign.Status.PLANNED).count()
-        finished_campaigns = campaigns_qs.filter(status=Campaign.Status.FINISHED).count()
         return {
             'active_menu': 'master-dashboard',
             'is_master': True,
-            'initial_company_id': initial_company.id if initial_company else '',
-            'initial_company_name': initial_company.name if initial_company else '',
-            'total_companies': total_companies,
-            'active_companies': active_companies,
-            'total_campaigns': total_campaigns,
-            'active_campaigns': active_campaigns,
-            'paused_campaigns': paused_campaigns,
-            'planned_campaigns': planned_campaigns,
-            'finished_campaigns': finished_campaigns,
+            **master_dashboard_counters(),
         }
 
 
@@ -1104,34 +1167,47 @@ class MasterCompanyMetricsView(MasterRequiredMixin, View):
             month_cursor = _month_start_offset(month_cursor, 1)
 
         month_counts = {
-            item['month'].strftime('%m/%Y'): item['total']
-            for item in CampaignResponse.all_objects.filter(
+            month.strftime('%m/%Y'): total
+            for month, total in CampaignResponseMonthlyCounter.all_objects.filter(
                 company_id=company_id,
-                completed_at__date__gte=start_month,
-            )
-            .annotate(month=TruncMonth('completed_at'))
-            .values('month')
-            .annotate(total=Count('id'))
+                month__gte=start_month,
+            ).values_list('month', 'response_count')
         }
         history_values = [month_counts.get(label, 0) for label in month_labels]
 
-        responses_qs = CampaignResponse.all_objects.filter(company_id=company_id)
-        results = CampaignReportView()._build_results(responses_qs, {}, {})
-        segment_labels = [item['label'] for item in results.get('domains', [])]
-        segment_values = [float(item['percent'] or 0) for item in results.get('domains', [])]
-
-        return JsonResponse(
-            {
-                'history': {
-                    'labels': month_labels,
-                    'values': history_values,
-                },
-                'segments': {
-                    'labels': segment_labels,
-                    'values': segment_values,
-                },
-            }
-        )
+        domain_totals = {
+            step_key: (score_sum, answer_count)
+            for step_key, score_sum, answer_count in CampaignDomainScoreCounter.all_objects.filter(
+                company_id=company_id,
+            ).values_list('step_key', 'score_sum', 'answer_count')
+        }
+        segment_labels = []
+        segment_values = []
+        for step_key, label in CampaignReportView.DOMAIN_BY_STEP.items():
+            score_sum, answer_count = domain_totals.get(step_key, (0, 0))
+            # Mesmo arredondamento de CampaignReportView._build_results.
+            percent = round((score_sum / answer_count) / 5 * 100, 1) if answer_count else 0
+            segment_labels.append(label)
+            segment_values.append(float(percent))
+
+        payload = {
+            'history': {
+                'labels': month_labels,
+                'values': history_values,
+            },
+            'segments': {
+                'labels': segment_labels,
+                'values': segment_values,
+            },
+        }
+        content = json.dumps(payload, separators=(',', ':'))
+        etag = quote_etag(hashlib.md5(content.encode()).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        return response
 
 
 def _month_start_offset(source_date, offset):
@@ -1219,7 +1295,7 @@ class CompanyListView(MasterRequiredMixin, View):
     template_name = 'companies/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30, master=True))
     def get(self, request):
         companies_qs = Company.objects.order_by('-created_at')
         search_name = (request.GET.get('name') or '').strip()
@@ -1348,7 +1424,7 @@ class CompanyCreateView(MasterRequiredMixin, View):
             unit_name=(form.cleaned_data.get('unit_name') or '').strip(),
             is_active=create_is_active,
         )
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE)
         messages.success(request, 'Empresa cadastrada com sucesso.')
         if is_ajax_request(request):
             return render_companies_table(request)
@@ -1404,7 +1480,7 @@ class CompanyUpdateView(MasterRequiredMixin, View):
         if form.cleaned_data.get('logo'):
             company.logo = form.cleaned_data['logo']
         company.save()
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE, company.id)
         messages.success(request, 'Empresa atualizada com sucesso.')
         if is_ajax_request(request):
             return render_companies_table(request)
@@ -1416,7 +1492,7 @@ class CompanyDeleteView(MasterRequiredMixin, View):
         company = get_object_or_404(Company, pk=company_id)
         company.is_active = not company.is_active
         company.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE, company.id)
         if company.is_active:
             messages.success(request, 'Empresa ativada com sucesso.')
         else:
@@ -1428,7 +1504,7 @@ class CampaignListView(MasterRequiredMixin, View):
     template_name = 'campaigns/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30, master=True))
     def get(self, request):
         filters = get_campaigns_filters(request)
         campaigns_qs = get_campaigns_queryset(filters)
@@ -1468,7 +1544,7 @@ class CampaignCreateView(MasterRequiredMixin, View):
             status=form.cleaned_data['status'],
             created_by=request.user,
         )
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE, company.id)
         messages.success(request, 'Campanha criada com sucesso.')
         if is_ajax_request(request):
             return render_campaigns_table(request)
@@ -1513,7 +1589,7 @@ class CampaignUpdateView(MasterRequiredMixin, View):
         campaign.end_date = form.cleaned_data['end_date']
         campaign.status = new_status
         campaign.save()
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE, campaign.company_id)
         messages.success(request, 'Campanha atualizada com sucesso.')
         if is_ajax_request(request):
             return render_campaigns_table(request)
@@ -1524,7 +1600,7 @@ class CampaignDeleteView(MasterRequiredMixin, View):
     def post(self, request, campaign_id):
         campaign = get_object_or_404(Campaign, pk=campaign_id)
         campaign.delete()
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE, campaign.company_id)
         messages.success(request, 'Campanha removida com sucesso.')
         if is_ajax_request(request):
             return render_campaigns_table(request)
@@ -1535,7 +1611,7 @@ class MasterTechnicalSettingsView(MasterRequiredMixin, View):
     template_name = 'master/technical_settings.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30, master=True))
     def get(self, request):
         report_settings = ensure_master_report_settings()
         responsibles_qs = TechnicalResponsible.objects.filter(
@@ -1583,7 +1659,7 @@ class TechnicalResponsibleCreateView(MasterRequiredMixin, View):
             sort_order=sort_order,
             is_active=True,
         )
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE)
         messages.success(request, 'Responsável técnico criado com sucesso.')
         if is_ajax_request(request):
             return render_technical_responsibles_table(request)
@@ -1619,7 +1695,7 @@ class TechnicalResponsibleUpdateView(MasterRequiredMixin, View):
         responsible.sort_order = sort_order
         responsible.is_active = form.cleaned_data['is_active']
         responsible.save()
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE)
         messages.success(request, 'Responsável técnico atualizado com sucesso.')
         if is_ajax_request(request):
             return render_technical_responsibles_table(request)
@@ -1634,7 +1710,7 @@ class TechnicalResponsibleDeleteView(MasterRequiredMixin, View):
         )
         responsible.is_active = not responsible.is_active
         responsible.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE)
         if responsible.is_active:
             messages.success(request, 'Responsável técnico ativado com sucesso.')
         else:
@@ -1651,7 +1727,7 @@ class TechnicalResponsibleRemoveView(MasterRequiredMixin, View):
             pk=responsible_id,
         )
         responsible.delete()
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE)
         messages.success(request, 'Responsável técnico excluído com sucesso.')
         if is_ajax_request(request):
             return render_technical_responsibles_table(request)
@@ -1673,11 +1749,36 @@ class MasterReportSettingsUpdateView(MasterRequiredMixin, View):
             form.cleaned_data['evaluation_representative_location'] or ''
         ).strip()
         report_settings.save()
-        cache.clear()
+        invalidate_page_cache(MASTER_SCOPE)
         messages.success(request, 'Representante legal atualizado com sucesso.')
         return redirect('master-settings')
 
 
+class MasterProfilesView(MasterRequiredMixin, View):
+    template_name = 'master/profiles.html'
+
+    def get(self, request):
+        return render(
+            request,
+            self.template_name,
+            {
+                'profiles': list_profiles(),
+                'profiling_enabled': settings.PROFILING_ENABLED,
+                'profiling_slow_ms': settings.PROFILING_SLOW_MS,
+                'profiling_sample_rate': settings.PROFILING_SAMPLE_RATE,
+            },
+        )
+
+
+class MasterProfileDownloadView(MasterRequiredMixin, View):
+    def get(self, request, profile_id, kind):
+        path = profile_file_path(profile_id, f'.{kind}')
+        if path is None:
+            raise Http404('Profile nao encontrado.')
+        content_type = 'text/plain; charset=utf-8' if kind == 'collapsed' else 'application/octet-stream'
+        return FileResponse(path.open('rb'), as_attachment=True, filename=path.name, content_type=content_type)
+
+
 class CampaignAccessView(View):
     template_name = 'campaigns/access.html'
     questions_template_name = 'campaigns/step2.html'
@@ -1849,19 +1950,21 @@ class CampaignAccessView(View):
             self._store_session_data(request, campaign.uuid, session_data)
 
             try:
-                CampaignResponse.all_objects.create(
-                    company=campaign.company,
-                    campaign=campaign,
-                    cpf_hash=session_data['cpf_hash'],
-                    first_name=session_data.get('first_name', ''),
-                    age=session_data.get('age', 0),
-                    sex=session_data.get('sex', ''),
-                    ghe_id=session_data.get('ghe_id'),
-                    department_id=session_data.get('department_id'),
-                    job_function_id=session_data.get('job_function_id'),
-                    responses=session_data.get('responses', {}),
-                    comments=session_data.get('comments', ''),
-                )
+                with transaction.atomic():
+                    campaign_response = CampaignResponse.all_objects.create(
+                        company=campaign.company,
+                        campaign=campaign,
+                        cpf_hash=session_data['cpf_hash'],
+                        first_name=session_data.get('first_name', ''),
+                        age=session_data.get('age', 0),
+                        sex=session_data.get('sex', ''),
+                        ghe_id=session_data.get('ghe_id'),
+                        department_id=session_data.get('department_id'),
+                        job_function_id=session_data.get('job_function_id'),
+                        responses=session_data.get('responses', {}),
+                        comments=session_data.get('comments', ''),
+                    )
+                    increment_campaign_response_counters(campaign_response)
             except Exception:
                 messages.error(request, 'Nao foi possivel registrar sua avaliacao. Tente novamente.')
                 return render(request, self.questions_step9_template_name, self._build_step9_context(context), status=400)
@@ -2151,9 +2254,9 @@ class CampaignAccessView(View):
 
 
 class CampaignDepartmentsView(View):
-    def get(self, request, campaign_uuid):
-        campaign = get_object_or_404(
-            Campaign.all_objects.select_related('company'),
+    async def get(self, request, campaign_uuid):
+        campaign = await aget_object_or_404(
+            Campaign.all_objects.only('id', 'company_id'),
             uuid=campaign_uuid,
         )
         ghe_id_raw = (request.GET.get('ghe_id') or '').strip()
@@ -2162,26 +2265,23 @@ class CampaignDepartmentsView(View):
         except (TypeError, ValueError):
             return JsonResponse({'departments': []})
 
-        departments = list(
-            Department.all_objects.filter(
+        departments = [
+            dept
+            async for dept in Department.all_objects.filter(
                 company_id=campaign.company_id,
                 is_active=True,
                 ghe_id=ghe_id,
             )
             .order_by('name')
-            .only('id', 'name')
-        )
-        return JsonResponse(
-            {
-                'departments': [{'id': dept.id, 'name': dept.name} for dept in departments],
-            }
-        )
+            .values('id', 'name')
+        ]
+        return JsonResponse({'departments': departments})
 
 
 class CampaignJobFunctionsView(View):
-    def get(self, request, campaign_uuid):
-        campaign = get_object_or_404(
-            Campaign.all_objects.select_related('company'),
+    async def get(self, request, campaign_uuid):
+        campaign = await aget_object_or_404(
+            Campaign.all_objects.only('id', 'company_id'),
             uuid=campaign_uuid,
         )
         department_id_raw = (request.GET.get('department_id') or '').strip()
@@ -2190,26 +2290,23 @@ class CampaignJobFunctionsView(View):
         except (TypeError, ValueError):
             return JsonResponse({'job_functions': []})
 
-        job_functions = list(
-            JobFunction.all_objects.filter(
+        job_functions = [
+            item
+            async for item in JobFunction.all_objects.filter(
                 company_id=campaign.company_id,
                 is_active=True,
                 departments__id=department_id,
             )
             .order_by('name')
-            .only('id', 'name')
-        )
-        return JsonResponse(
-            {
-                'job_functions': [{'id': item.id, 'name': item.name} for item in job_functions],
-            }
-        )
+            .values('id', 'name')
+        ]
+        return JsonResponse({'job_functions': job_functions})
 
 
 class CampaignCpfCheckView(View):
-    def get(self, request, campaign_uuid):
-        campaign = get_object_or_404(
-            Campaign.all_objects.only('uuid'),
+    async def get(self, request, campaign_uuid):
+        campaign = await aget_object_or_404(
+            Campaign.all_objects.only('id', 'uuid'),
             uuid=campaign_uuid,
         )
         cpf_raw = (request.GET.get('cpf') or '').strip()
@@ -2223,7 +2320,7 @@ class CampaignCpfCheckView(View):
             )
 
         cpf_hash = CampaignAccessView._hash_cpf(campaign.uuid, cpf_digits)
-        exists = CampaignResponse.all_objects.filter(campaign=campaign, cpf_hash=cpf_hash).exists()
+        exists = await CampaignResponse.all_objects.filter(campaign=campaign, cpf_hash=cpf_hash).aexists()
         return JsonResponse(
             {
                 'available': not exists,
@@ -2405,10 +2502,8 @@ class CampaignReportView(MasterRequiredMixin, View):
         overall_sum = 0
         overall_count = 0
 
-        for response in responses_qs:
-            answers_by_step = response.responses or {}
-            group_id = getattr(response, group_id_field, None)
-            for step_key, answers in answers_by_step.items():
+        for answers_by_step, group_id in iter_campaign_answers(responses_qs, group_id_field):
+            for step_key, answers in (answers_by_step or {}).items():
                 if step_key not in self.DOMAIN_BY_STEP or not answers:
                     continue
                 for idx, item in enumerate(answers):
@@ -2709,6 +2804,8 @@ class CampaignReportSaveView(MasterRequiredMixin, View):
 
 
 class CampaignReportPdfView(MasterRequiredMixin, View):
+    # O PDF normalmente passa de PROFILING_SLOW_MS; so interessa quando foge do normal.
+    @method_decorator(profile_request(threshold_ms=settings.PROFILING_PDF_SLOW_MS))
     def get(self, request, campaign_uuid):
         campaign = get_object_or_404(
             Campaign.all_objects.select_related('company'),
@@ -2767,8 +2864,16 @@ class CampaignReportPdfView(MasterRequiredMixin, View):
             group_label_singular = 'GHE'
         evaluation_date = campaign.end_date.strftime('%d/%m/%Y') if campaign.end_date else '-'
         total_workers = company.employee_count or 0
-        response_rate = (responses_qs.count() / total_workers * 100) if total_workers else 0
+        responses_count = responses_qs.count()
+        response_rate = (responses_count / total_workers * 100) if total_workers else 0
         response_label = CampaignReportView._response_rate_label(response_rate, total_workers)
+        master_report_settings = ensure_master_report_settings()
+        campaign_report_settings = (
+            CampaignReportSettings.all_objects.filter(campaign=campaign)
+            .values('reevaluate_months', 'attachments')
+            .first()
+            or {}
+        )
         standard_actions = {
             item['question_number']: item['actions']
             for item in StandardActionPlan.all_objects.filter(
@@ -2800,7 +2905,7 @@ class CampaignReportPdfView(MasterRequiredMixin, View):
             'company_group_list': company_group_list,
             'group_label_singular': group_label_singular,
             'group_label_plural': company_group_list_label,
-            'responses_count': responses_qs.count(),
+            'responses_count': responses_count,
             'evaluation_date': evaluation_date,
             'total_workers': total_workers,
             'response_rate': round(response_rate, 1) if total_workers else 0,
@@ -2808,8 +2913,8 @@ class CampaignReportPdfView(MasterRequiredMixin, View):
             'results': results,
             'company_legal_representative_name': company.legal_representative_name or '-',
             'company_legal_representative_company': company.legal_name or company.name or '-',
-            'evaluation_representative_name': ensure_master_report_settings().evaluation_representative_name or '-',
-            'evaluation_representative_location': ensure_master_report_settings().evaluation_representative_location or '-',
+            'evaluation_representative_name': master_report_settings.evaluation_representative_name or '-',
+            'evaluation_representative_location': master_report_settings.evaluation_representative_location or '-',
             'evaluation_company_name': 'CISS CONSULTORIA',
               'technical_responsibles': list(
                   technical_responsibles_qs.values('name', 'education', 'registration')
@@ -2823,14 +2928,8 @@ class CampaignReportPdfView(MasterRequiredMixin, View):
                 'concluded_on',
             )
         ),
-    'reevaluate_months': (
-        CampaignReportSettings.all_objects.filter(campaign=campaign).values_list('reevaluate_months', flat=True).first()
-        or 3
-    ),
-    'attachments': (
-        CampaignReportSettings.all_objects.filter(campaign=campaign).values_list('attachments', flat=True).first()
-        or []
-    ),
+    'reevaluate_months': campaign_report_settings.get('reevaluate_months') or 3,
+    'attachments': campaign_report_settings.get('attachments') or [],
 }
         pdf_bytes = build_campaign_report_pdf(report_context)
         filename = f"relatorio-campanha-{campaign.uuid}.pdf"
@@ -2867,6 +2966,11 @@ DEFAULT_COMPLAINT_TYPE_SEED = [
 
 
 def ensure_default_totem_types(company):
+    # Empresas novas ja sao semeadas via seed_company_defaults (signal);
+    # aqui so completa os tipos do totem de empresas antigas, uma vez por versao.
+    if totem_types_seeded(company):
+        return
+
     existing_mood_labels = set(
         MoodType.all_objects.filter(company=company).values_list('label', flat=True)
     )
@@ -2883,7 +2987,7 @@ def ensure_default_totem_types(company):
         if label not in existing_mood_labels
     ]
     if mood_to_create:
-        MoodType.all_objects.bulk_create(mood_to_create)
+        MoodType.all_objects.bulk_create(mood_to_create, ignore_conflicts=True)
 
     existing_complaint_labels = set(
         ComplaintType.all_objects.filter(company=company).values_list('label', flat=True)
@@ -2898,7 +3002,8 @@ def ensure_default_totem_types(company):
         if label not in existing_complaint_labels
     ]
     if complaint_to_create:
-        ComplaintType.all_objects.bulk_create(complaint_to_create)
+        ComplaintType.all_objects.bulk_create(complaint_to_create, ignore_conflicts=True)
+    mark_totem_types_seeded(company)
 
 
 def ensure_alert_settings(company):
@@ -2925,126 +3030,114 @@ def ensure_master_report_settings():
 
 
 def _notify_alert_recipients(company_id, subject, body):
-    recipients = list(
-        AlertRecipient.all_objects.filter(
-            company_id=company_id,
-            is_active=True,
-        ).values_list('email', flat=True)
-    )
-    if not recipients:
-        return
-    send_mail(
-        subject,
-        body,
-        None,
-        recipients,
-        fail_silently=True,
-    )
+    queue_alert_notification(company_id, subject, body)
 
 
 def _create_automatic_alert_if_missing(company_id, alert_type, level, period_start, period_end, message):
-    today = date.today()
-    already_exists = Alert.all_objects.filter(
-        company_id=company_id,
-        alert_type=alert_type,
-        record_date=today,
-        status='open',
-    ).exists()
-    if already_exists:
-        return
+    # Um unico INSERT; a constraint core_alerts_open_unique_per_day barra o
+    # segundo alerta aberto do dia mesmo com workers concorrentes.
+    try:
+        with transaction.atomic():
+            Alert.all_objects.create(
+                company_id=company_id,
+                alert_type=alert_type,
+                level=level,
+                status='open',
+                record_date=date.today(),
+                period_start=period_start,
+                period_end=period_end,
+            )
+    except IntegrityError:
+        return False
 
-    Alert.all_objects.create(
-        company_id=company_id,
-        alert_type=alert_type,
-        level=level,
-        status='open',
-        record_date=today,
-        period_start=period_start,
-        period_end=period_end,
-    )
     _notify_alert_recipients(
         company_id,
         f'Alerta automático: {alert_type}',
         message,
     )
+    return True
 
 
-def evaluate_automatic_alerts(company):
-    settings_obj = ensure_alert_settings(company)
-    if not settings_obj.is_active or not settings_obj.auto_alerts_enabled:
-        return
-
-    today = date.today()
+def _automatic_alert_findings(settings_obj, totals, open_help_requests, today):
     days = max(int(settings_obj.analysis_window_days or 30), 1)
     period_start = today - timedelta(days=days - 1)
     period_end = today
+    findings = []
 
-    complaint_count = Complaint.all_objects.filter(
-        company=company,
-        record_date__gte=period_start,
-        record_date__lte=period_end,
-    ).count()
+    complaint_count = totals['complaint_count']
     if complaint_count >= settings_obj.max_critical_complaints:
         level = 'critical' if complaint_count >= (settings_obj.max_critical_complaints * 1.5) else 'high'
-        _create_automatic_alert_if_missing(
-            company.id,
-            'complaint',
-            level,
-            period_start,
-            period_end,
-            (
+        findings.append({
+            'alert_type': 'complaint',
+            'level': level,
+            'period_start': period_start,
+            'period_end': period_end,
+            'message': (
                 f'Foram registradas {complaint_count} denuncias nos ultimos {days} dias. '
                 f'Limite configurado: {settings_obj.max_critical_complaints}.'
             ),
-        )
+        })
 
-    mood_qs = MoodRecord.all_objects.filter(
-        company=company,
-        record_date__gte=period_start,
-        record_date__lte=period_end,
-    )
-    mood_total = mood_qs.count()
+    mood_total = totals['mood_count']
     if mood_total > 0:
-        negative_total = mood_qs.filter(sentiment__in=['bad', 'very_bad']).count()
+        negative_total = totals['negative_mood_count']
         negative_percent = (negative_total * 100) / mood_total
         if negative_percent >= float(settings_obj.max_negative_mood_percent):
             level = 'critical' if negative_percent >= float(settings_obj.max_negative_mood_percent) + 10 else 'high'
-            _create_automatic_alert_if_missing(
-                company.id,
-                'risk',
-                level,
-                period_start,
-                period_end,
-                (
+            findings.append({
+                'alert_type': 'risk',
+                'level': level,
+                'period_start': period_start,
+                'period_end': period_end,
+                'message': (
                     f'O percentual de humor negativo esta em {negative_percent:.1f}% nos últimos {days} dias. '
                     f'Limite configurado: {settings_obj.max_negative_mood_percent}%.'
                 ),
-            )
+            })
 
-    open_help_requests = HelpRequest.all_objects.filter(
-        company=company,
-        status__in=[HelpRequest.Status.OPEN, HelpRequest.Status.IN_PROGRESS],
-    ).count()
     if open_help_requests >= settings_obj.max_open_help_requests:
         level = 'critical' if open_help_requests >= (settings_obj.max_open_help_requests * 1.5) else 'high'
-        _create_automatic_alert_if_missing(
-            company.id,
-            'operational',
-            level,
-            period_start,
-            period_end,
-            (
+        findings.append({
+            'alert_type': 'operational',
+            'level': level,
+            'period_start': period_start,
+            'period_end': period_end,
+            'message': (
                 f'Existem {open_help_requests} pedidos de ajuda em aberto/em atendimento. '
                 f'Limite configurado: {settings_obj.max_open_help_requests}.'
             ),
-        )
+        })
+    return findings
+
+
+def evaluate_automatic_alerts(company):
+    settings_obj = ensure_alert_settings(company)
+    if not settings_obj.is_active or not settings_obj.auto_alerts_enabled:
+        return
+
+    today = date.today()
+    days = max(int(settings_obj.analysis_window_days or 30), 1)
+    totals = window_totals(company.id, today - timedelta(days=days - 1), today)
+    open_help_requests = HelpRequest.objects.for_tenant(company.id).filter(
+        status__in=[HelpRequest.Status.OPEN, HelpRequest.Status.IN_PROGRESS],
+    ).count()
+    for finding in _automatic_alert_findings(settings_obj, totals, open_help_requests, today):
+        _create_automatic_alert_if_missing(company.id, **finding)
+
+
+def _alerts_evaluation_pending_key(company_id):
+    return f'alerts:evaluation-pending:{company_id}'
 
 
 def _evaluate_automatic_alerts_job(company_id):
-    company = Company.all_objects.filter(id=company_id, is_active=True).first()
+    if django_rq is not None:
+        # Libera a janela antes de avaliar: eventos durante a avaliacao agendam a proxima.
+        django_rq.get_connection('default').delete(_alerts_evaluation_pending_key(company_id))
+    company = Company.objects.filter(id=company_id, is_active=True).first()
     if company is None:
         return
-    evaluate_automatic_alerts(company)
+    with tenant_context(company.id):
+        evaluate_automatic_alerts(company)
 
 
 def enqueue_automatic_alerts_evaluation(company):
@@ -3053,11 +3146,109 @@ def enqueue_automatic_alerts_evaluation(company):
         return
     try:
         queue = django_rq.get_queue('default')
-        queue.enqueue(_evaluate_automatic_alerts_job, company.id)
+        delay = settings.ALERT_EVALUATION_DEBOUNCE_SECONDS
+        if delay <= 0:
+            queue.enqueue(_evaluate_automatic_alerts_job, company.id)
+            return
+        # No maximo uma avaliacao pendente por empresa; a chave expira sozinha
+        # caso o job se perca.
+        is_first = queue.connection.set(
+            _alerts_evaluation_pending_key(company.id),
+            1,
+            nx=True,
+            ex=delay * 2 + 60,
+        )
+        if not is_first:
+            return
+        queue.enqueue_in(timedelta(seconds=delay), _evaluate_automatic_alerts_job, company.id)
     except Exception:
         logger.exception('Falha ao enfileirar avaliacao automatica de alertas.')
 
 
+def collect_automatic_alert_findings(today=None):
+    """Avalia os limites de todas as empresas ativas com consultas agrupadas.
+
+    Uma consulta agrupada por janela de analise nos contadores diarios e uma
+    para os pedidos de ajuda abertos, em vez de COUNTs por empresa.
+    """
+    today = today or date.today()
+    for company in Company.objects.filter(is_active=True).exclude(
+        id__in=AlertSetting.all_objects.values('company_id'),
+    ):
+        ensure_alert_settings(company)
+
+    settings_by_company = {
+        settings_obj.company_id: settings_obj
+        for settings_obj in AlertSetting.all_objects.filter(
+            company__is_active=True,
+            is_active=True,
+            auto_alerts_enabled=True,
+        )
+    }
+    if not settings_by_company:
+        return {}
+
+    company_ids_by_window = {}
+    for company_id, settings_obj in settings_by_company.items():
+        days = max(int(settings_obj.analysis_window_days or 30), 1)
+        company_ids_by_window.setdefault(days, []).append(company_id)
+    totals_by_company = {}
+    for days, company_ids in company_ids_by_window.items():
+        totals_by_company.update(
+            window_totals_by_company(company_ids, today - timedelta(days=days - 1), today)
+        )
+
+    open_help_requests_by_company = dict(
+        HelpRequest.all_objects.filter(
+            company_id__in=settings_by_company,
+            status__in=[HelpRequest.Status.OPEN, HelpRequest.Status.IN_PROGRESS],
+        ).values('company_id').annotate(total=Count('id')).order_by().values_list('company_id', 'total')
+    )
+    open_alerts_today = set(
+        Alert.all_objects.filter(
+            company_id__in=settings_by_company,
+            record_date=today,
+            status='open',
+        ).values_list('company_id', 'alert_type')
+    )
+
+    empty_totals = {'mood_count': 0, 'negative_mood_count': 0, 'complaint_count': 0}
+    findings_by_company = {}
+    for company_id, settings_obj in settings_by_company.items():
+        findings = [
+            finding
+            for finding in _automatic_alert_findings(
+                settings_obj,
+                totals_by_company.get(company_id, empty_totals),
+                open_help_requests_by_company.get(company_id, 0),
+                today,
+            )
+            if (company_id, finding['alert_type']) not in open_alerts_today
+        ]
+        if findings:
+            findings_by_company[company_id] = findings
+    return findings_by_company
+
+
+def _create_automatic_alerts_job(company_id, findings):
+    with tenant_context(company_id):
+        for finding in findings:
+            _create_automatic_alert_if_missing(company_id, **finding)
+
+
+def sweep_automatic_alerts(inline=False):
+    findings_by_company = collect_automatic_alert_findings()
+    if inline or django_rq is None:
+        for company_id, findings in findings_by_company.items():
+            _create_automatic_alerts_job(company_id, findings)
+        return len(findings_by_company)
+    # Um job por empresa: a criacao dos alertas se espalha pelos workers do RQ.
+    queue = django_rq.get_queue('default')
+    for company_id, findings in findings_by_company.items():
+        queue.enqueue(_create_automatic_alerts_job, company_id, findings)
+    return len(findings_by_company)
+
+
 class TotemView(View):
     template_name = 'totem/index.html'
 
@@ -3096,53 +3287,150 @@ class TotemView(View):
         )
 
 
+async def _aget_active_totem(company_slug, totem_slug):
+    company = await aget_object_or_404(Company, slug=company_slug, is_active=True)
+    totem = await aget_object_or_404(
+        Totem.all_objects,
+        company=company,
+        slug=totem_slug,
+        is_active=True,
+    )
+    return company, totem
+
+
 class TotemDepartmentsView(View):
-    def get(self, request, company_slug, totem_slug):
-        company = get_object_or_404(Company, slug=company_slug, is_active=True)
-        totem = get_object_or_404(
-            Totem.all_objects,
-            company=company,
-            slug=totem_slug,
-            is_active=True,
-        )
+    async def get(self, request, company_slug, totem_slug):
+        company, totem = await _aget_active_totem(company_slug, totem_slug)
         ghe_id_raw = (request.GET.get('ghe_id') or '').strip()
         try:
             ghe_id = int(ghe_id_raw)
         except (TypeError, ValueError):
             return JsonResponse({'departments': []})
 
-        departments = list(
-            Department.all_objects.filter(
+        departments = [
+            dept
+            async for dept in Department.all_objects.filter(
                 company=company,
                 is_active=True,
                 ghe_id=ghe_id,
             )
             .order_by('name')
             .values('id', 'name')
-        )
+        ]
         return JsonResponse({'departments': departments})
 
 
-class TotemMoodSubmitView(View):
-    def post(self, request, company_slug, totem_slug):
-        company = get_object_or_404(Company, slug=company_slug, is_active=True)
-        ensure_default_totem_types(company)
-        totem = get_object_or_404(
-            Totem.all_objects,
-            company=company,
+def build_totem_bootstrap_payload(company, totem):
+    ghes = [
+        {'id': ghe['id'], 'name': ghe['name'], 'departments': []}
+        for ghe in GHE.all_objects.filter(company=company, is_active=True)
+        .order_by('name')
+        .values('id', 'name')
+    ]
+    ghe_index = {ghe['id']: ghe for ghe in ghes}
+    departments = list(
+        Department.all_objects.filter(company=company, is_active=True)
+        .order_by('name')
+        .values('id', 'name', 'ghe_id')
+    )
+    for dept in departments:
+        ghe = ghe_index.get(dept['ghe_id'])
+        if ghe is not None:
+            ghe['departments'].append({'id': dept['id'], 'name': dept['name']})
+    return {
+        'version': company.catalog_version,
+        'company': {'name': company.name, 'slug': company.slug},
+        'totem': {
+            'name': totem.name,
+            'slug': totem.slug,
+            'group_label': 'GHE' if (totem.assessment_type or '').strip().lower() == 'ghe' else 'Setor',
+        },
+        'ghes': ghes,
+        'departments': departments,
+        'moods': list(
+            MoodType.all_objects.filter(company=company, is_active=True)
+            .order_by('label')
+            .values('id', 'label', 'emoji', 'sentiment', 'mood_score')
+        ),
+        'complaint_types': list(
+            ComplaintType.all_objects.filter(company=company, is_active=True)
+            .order_by('label')
+            .values('id', 'label')
+        ),
+    }
+
+
+def get_totem_bootstrap_payload(company, totem):
+    cache_key = f'totem-bootstrap:{totem.id}:{company.catalog_version}'
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = build_totem_bootstrap_payload(company, totem)
+        cache.set(cache_key, payload, 60 * 60)
+    return payload
+
+
+class TotemBootstrapView(View):
+    async def get(self, request, company_slug, totem_slug):
+        totem = await aget_object_or_404(
+            Totem.all_objects.select_related('company'),
+            company__slug=company_slug,
+            company__is_active=True,
             slug=totem_slug,
             is_active=True,
         )
+        company = totem.company
+        etag = quote_etag(f'{company.id}.{totem.id}.{company.catalog_version}')
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            payload = await sync_to_async(get_totem_bootstrap_payload)(company, totem)
+            response = JsonResponse(payload)
+        response['ETag'] = etag
+        patch_cache_control(
+            response,
+            max_age=settings.TOTEM_BOOTSTRAP_MAX_AGE,
+            must_revalidate=True,
+        )
+        return response
+
+
+def _create_totem_mood(company, totem, department, mood_type, record_date, period_start, period_end):
+    # Registro e contador diario juntos: uma falha entre os dois nao desalinha os alertas.
+    with transaction.atomic():
+        MoodRecord.all_objects.create(
+            company=company,
+            totem=totem,
+            department=department,
+            sentiment=mood_type.sentiment,
+            mood_score=mood_type.mood_score,
+            record_date=record_date,
+            period_start=period_start,
+            period_end=period_end,
+            channel='totem',
+        )
+        increment_alert_counters(
+            company.id,
+            record_date,
+            moods=1,
+            negative_moods=int(mood_type.sentiment in NEGATIVE_SENTIMENTS),
+        )
+
+
+class TotemMoodSubmitView(View):
+    async def post(self, request, company_slug, totem_slug):
+        company, totem = await _aget_active_totem(company_slug, totem_slug)
+        if not totem_types_seeded(company):
+            # So empresas antigas ainda sem semente; nas demais nao sai da thread do loop.
+            await sync_to_async(ensure_default_totem_types)(company)
         raw_mood_type_id = (request.POST.get('mood_option') or '').strip()
         try:
             mood_type_id = int(raw_mood_type_id)
         except (TypeError, ValueError):
             mood_type_id = None
-        mood_type = MoodType.all_objects.filter(
+        mood_type = await MoodType.all_objects.filter(
             company=company,
             id=mood_type_id,
             is_active=True,
-        ).first()
+        ).afirst()
         if mood_type is None:
             if request.headers.get('x-requested-with') == 'XMLHttpRequest':
                 return JsonResponse({'ok': False, 'message': 'Nao foi possivel registrar o humor.'}, status=400)
@@ -3156,11 +3444,11 @@ class TotemMoodSubmitView(View):
 
         department = None
         if department_id:
-            department = Department.all_objects.filter(
+            department = await Department.all_objects.filter(
                 id=department_id,
                 company=company,
                 is_active=True,
-            ).first()
+            ).afirst()
         if department is None:
             if request.headers.get('x-requested-with') == 'XMLHttpRequest':
                 return JsonResponse({'ok': False, 'message': 'Selecione um setor valido para registrar o humor.'}, status=400)
@@ -3168,19 +3456,19 @@ class TotemMoodSubmitView(View):
             return redirect('totem-home', company_slug=company.slug, totem_slug=totem.slug)
 
         record_date, period_start, period_end = build_period()
-        MoodRecord.all_objects.create(
-            company=company,
-            totem=totem,
-            department=department,
-            sentiment=mood_type.sentiment,
-            mood_score=mood_type.mood_score,
-            record_date=record_date,
-            period_start=period_start,
-            period_end=period_end,
-            channel='totem',
+        queued = stream_ingestion_enabled() and await sync_to_async(append_mood_event)(
+            company.id,
+            totem.id,
+            department.id,
+            mood_type.sentiment,
+            mood_type.mood_score,
+            record_date,
         )
-        cache.clear()
-        enqueue_automatic_alerts_evaluation(company)
+        if not queued:
+            await sync_to_async(_create_totem_mood)(
+                company, totem, department, mood_type, record_date, period_start, period_end,
+            )
+            await sync_to_async(enqueue_automatic_alerts_evaluation)(company)
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({'ok': True, 'message': 'Humor registrado com sucesso.'})
         messages.success(request, 'Humor registrado com sucesso.')
@@ -3211,9 +3499,16 @@ class TotemComplaintSubmitView(View):
             is_active=True,
         ).first()
         if complaint_type is None:
+            if is_ajax_request(request):
+                return JsonResponse({'ok': False, 'message': 'Nao foi possivel registrar a denuncia.'}, status=400)
             messages.error(request, 'Nao foi possivel registrar a denuncia.')
             return redirect('totem-home', company_slug=company.slug, totem_slug=totem.slug)
         if not complaint_department_name or not complaint_additional_details:
+            if is_ajax_request(request):
+                return JsonResponse(
+                    {'ok': False, 'message': 'Informe setor e detalhes do ocorrido para concluir a denuncia.'},
+                    status=400,
+                )
             messages.error(request, 'Informe setor e detalhes do ocorrido para concluir a denuncia.')
             return redirect('totem-home', company_slug=company.slug, totem_slug=totem.slug)
         details_parts = [
@@ -3225,26 +3520,30 @@ class TotemComplaintSubmitView(View):
         details = ' | '.join(details_parts)
 
         record_date, period_start, period_end = build_period()
-        complaint = Complaint.all_objects.create(
-            company=company,
-            totem=totem,
-            category=complaint_type.label[:40].lower().replace(' ', '_'),
-            complaint_status='RECEIVED',
-            occurrence_count=1,
-            record_date=record_date,
-            period_start=period_start,
-            period_end=period_end,
-            channel='totem',
-            details=details,
-        )
-        ComplaintActionHistory.all_objects.create(
-            company=company,
-            complaint=complaint,
-            complaint_status='RECEIVED',
-            action_note='Denuncia recebida via totem.',
-        )
-        cache.clear()
+        with transaction.atomic():
+            complaint = Complaint.all_objects.create(
+                company=company,
+                totem=totem,
+                category=complaint_type.label[:40].lower().replace(' ', '_'),
+                complaint_status='RECEIVED',
+                occurrence_count=1,
+                record_date=record_date,
+                period_start=period_start,
+                period_end=period_end,
+                channel='totem',
+                details=details,
+            )
+            ComplaintActionHistory.all_objects.create(
+                company=company,
+                complaint=complaint,
+                complaint_status='RECEIVED',
+                action_note='Denuncia recebida via totem.',
+            )
+            increment_alert_counters(company.id, record_date, complaints=1)
+        invalidate_page_cache(company.id)
         enqueue_automatic_alerts_evaluation(company)
+        if is_ajax_request(request):
+            return JsonResponse({'ok': True, 'message': 'Denuncia registrada com sucesso.'})
         messages.success(request, 'Denuncia registrada com sucesso.')
         return redirect('totem-home', company_slug=company.slug, totem_slug=totem.slug)
 
@@ -3263,6 +3562,8 @@ class TotemHelpRequestSubmitView(View):
         department_name = (request.POST.get('department_name') or '').strip()
 
         if not requester_name or not department_name:
+            if is_ajax_request(request):
+                return JsonResponse({'ok': False, 'message': 'Informe nome e setor para solicitar ajuda.'}, status=400)
             messages.error(request, 'Informe nome e setor para solicitar ajuda.')
             return redirect('totem-home', company_slug=company.slug, totem_slug=totem.slug)
 
@@ -3273,12 +3574,210 @@ class TotemHelpRequestSubmitView(View):
             department_name=department_name,
             status=HelpRequest.Status.OPEN,
         )
-        cache.clear()
+        invalidate_page_cache(company.id)
         enqueue_automatic_alerts_evaluation(company)
+        if is_ajax_request(request):
+            return JsonResponse({'ok': True, 'message': 'Pedido de ajuda registrado. Nossa equipe vai ate voce.'})
         messages.success(request, 'Pedido de ajuda registrado. Nossa equipe vai ate voce.')
         return redirect('totem-home', company_slug=company.slug, totem_slug=totem.slug)
 
 
+def _parse_int(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _totem_event_period(raw_occurred_at):
+    today = timezone.localdate()
+    occurred_at = parse_datetime(raw_occurred_at) if isinstance(raw_occurred_at, str) else None
+    if occurred_at is None:
+        event_date = today
+    elif timezone.is_aware(occurred_at):
+        event_date = timezone.localtime(occurred_at).date()
+    else:
+        event_date = occurred_at.date()
+    if event_date < today - timedelta(days=settings.TOTEM_SYNC_MAX_EVENT_AGE_DAYS):
+        return None
+    event_date = min(event_date, today)
+    return event_date, event_date.replace(day=1), event_date
+
+
+class TotemSyncView(View):
+    def post(self, request, company_slug, totem_slug):
+        totem = get_object_or_404(
+            Totem.all_objects.select_related('company'),
+            company__slug=company_slug,
+            company__is_active=True,
+            slug=totem_slug,
+            is_active=True,
+        )
+        company = totem.company
+        try:
+            body = json.loads(request.body.decode('utf-8') or '{}')
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return JsonResponse({'ok': False, 'message': 'Payload invalido.'}, status=400)
+        events = body.get('events') if isinstance(body, dict) else None
+        if not isinstance(events, list):
+            return JsonResponse({'ok': False, 'message': 'Payload invalido.'}, status=400)
+        if len(events) > settings.TOTEM_SYNC_MAX_EVENTS:
+            return JsonResponse(
+                {'ok': False, 'message': f'Maximo de {settings.TOTEM_SYNC_MAX_EVENTS} eventos por envio.'},
+                status=400,
+            )
+
+        catalog = get_totem_bootstrap_payload(company, totem)
+        mood_types = {item['id']: item for item in catalog['moods']}
+        complaint_types = {item['id']: item for item in catalog['complaint_types']}
+        department_ids = {item['id'] for item in catalog['departments']}
+
+        rejected = []
+        seen_ids = set()
+        moods, complaints, help_requests = [], [], []
+        for event in events:
+            if not isinstance(event, dict):
+                continue
+            event_id = str(event.get('id') or '').strip()[:64]
+            if not event_id or event_id in seen_ids:
+                continue
+            seen_ids.add(event_id)
+            event_type = event.get('type')
+            event_period = _totem_event_period(event.get('occurred_at'))
+            if event_period is None:
+                rejected.append({'id': event_id, 'message': 'Registro antigo demais para sincronizar.'})
+                continue
+            record_date, period_start, period_end = event_period
+
+            if event_type == 'mood':
+                mood_type = mood_types.get(_parse_int(event.get('mood_option')))
+                department_id = _parse_int(event.get('department_id'))
+                if mood_type is None or department_id not in department_ids:
+                    rejected.append({'id': event_id, 'message': 'Nao foi possivel registrar o humor.'})
+                    continue
+                moods.append(
+                    MoodRecord(
+                        company=company,
+                        totem=totem,
+                        department_id=department_id,
+                        sentiment=mood_type['sentiment'],
+                        mood_score=mood_type['mood_score'],
+                        record_date=record_date,
+                        period_start=period_start,
+                        period_end=period_end,
+                        channel='totem',
+                        client_event_id=event_id,
+                    )
+                )
+            elif event_type == 'complaint':
+                complaint_type = complaint_types.get(_parse_int(event.get('complaint_category')))
+                department_name = str(event.get('complaint_department_name') or '').strip()
+                additional_details = str(event.get('complaint_additional_details') or '').strip()
+                if complaint_type is None or not department_name or not additional_details:
+                    rejected.append({'id': event_id, 'message': 'Nao foi possivel registrar a denuncia.'})
+                    continue
+                details_parts = [
+                    f'Setor: {department_name}',
+                    f'Relato: {additional_details}',
+                ]
+                details = str(event.get('details') or '').strip()
+                if details:
+                    details_parts.append(f'Complemento: {details}')
+                complaints.append(
+                    Complaint(
+                        company=company,
+                        totem=totem,
+                        category=complaint_type['label'][:40].lower().replace(' ', '_'),
+                        complaint_status='RECEIVED',
+                        occurrence_count=1,
+                        record_date=record_date,
+                        period_start=period_start,
+                        period_end=period_end,
+                        channel='totem',
+                        details=' | '.join(details_parts),
+                        client_event_id=event_id,
+                    )
+                )
+            elif event_type == 'help':
+                requester_name = str(event.get('requester_name') or '').strip()[:150]
+                department_name = str(event.get('department_name') or '').strip()[:150]
+                if not requester_name or not department_name:
+                    rejected.append({'id': event_id, 'message': 'Informe nome e setor para solicitar ajuda.'})
+                    continue
+                help_requests.append(
+                    HelpRequest(
+                        company=company,
+                        totem=totem,
+                        requester_name=requester_name,
+                        department_name=department_name,
+                        status=HelpRequest.Status.OPEN,
+                        client_event_id=event_id,
+                    )
+                )
+            else:
+                rejected.append({'id': event_id, 'message': 'Tipo de evento invalido.'})
+
+        duplicates = []
+        try:
+            with transaction.atomic():
+                moods = self._drop_duplicates(MoodRecord, company, moods, duplicates)
+                complaints = self._drop_duplicates(Complaint, company, complaints, duplicates)
+                help_requests = self._drop_duplicates(HelpRequest, company, help_requests, duplicates)
+                if moods:
+                    MoodRecord.all_objects.bulk_create(moods)
+                if complaints:
+                    created_complaints = Complaint.all_objects.bulk_create(complaints)
+                    if any(item.pk is None for item in created_complaints):
+                        created_complaints = Complaint.all_objects.filter(
+                            company=company,
+                            client_event_id__in=[item.client_event_id for item in complaints],
+                        )
+                    ComplaintActionHistory.all_objects.bulk_create(
+                        [
+                            ComplaintActionHistory(
+                                company=company,
+                                complaint=complaint,
+                                complaint_status='RECEIVED',
+                                action_note='Denuncia recebida via totem.',
+                            )
+                            for complaint in created_complaints
+                        ]
+                    )
+                if help_requests:
+                    HelpRequest.all_objects.bulk_create(help_requests)
+                increment_counters_for_records(mood_records=moods, complaints=complaints)
+        except IntegrityError:
+            # Envio concorrente do mesmo lote: o totem reenvia e os duplicados sao descartados.
+            return JsonResponse({'ok': False, 'message': 'Conflito ao sincronizar. Tente novamente.'}, status=409)
+
+        accepted = [item.client_event_id for item in (*moods, *complaints, *help_requests)]
+        if accepted:
+            if complaints or help_requests:
+                invalidate_page_cache(company.id)
+            enqueue_automatic_alerts_evaluation(company)
+        return JsonResponse(
+            {
+                'ok': True,
+                'accepted': accepted,
+                'duplicates': duplicates,
+                'rejected': rejected,
+            }
+        )
+
+    @staticmethod
+    def _drop_duplicates(model, company, objs, duplicates):
+        if not objs:
+            return objs
+        existing = set(
+            model.all_objects.filter(
+                company=company,
+                client_event_id__in=[obj.client_event_id for obj in objs],
+            ).values_list('client_event_id', flat=True)
+        )
+        duplicates.extend(sorted(existing))
+        return [obj for obj in objs if obj.client_event_id not in existing]
+
+
 class CompanyAdminRequiredMixin(LoginRequiredMixin):
     allow_superuser_without_company = False
 
@@ -3575,7 +4074,7 @@ class TotemListView(CompanyAdminRequiredMixin, View):
     template_name = 'totems/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         totems_qs = Totem.all_objects.filter(company_id=request.current_company_id).order_by('name')
         page_obj = paginate_queryset(request, totems_qs)
@@ -3623,7 +4122,7 @@ class TotemCreateView(CompanyAdminRequiredMixin, View):
             location=form.cleaned_data['location'],
             assessment_type=form.cleaned_data['assessment_type'],
         )
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Totem criado com sucesso.')
         if is_ajax_request(request):
             return render_totems_table(request)
@@ -3646,7 +4145,7 @@ class TotemUpdateView(CompanyAdminRequiredMixin, View):
         totem.location = form.cleaned_data['location']
         totem.assessment_type = form.cleaned_data['assessment_type']
         totem.save()
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Totem atualizado com sucesso.')
         if is_ajax_request(request):
             return render_totems_table(request)
@@ -3662,7 +4161,7 @@ class TotemDeleteView(CompanyAdminRequiredMixin, View):
         )
         totem.is_active = not totem.is_active
         totem.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         if totem.is_active:
             messages.success(request, 'Totem ativado com sucesso.')
         else:
@@ -4067,7 +4566,7 @@ class MoodTypeListView(CompanyAdminRequiredMixin, View):
     template_name = 'mood_types/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         mood_types_qs = MoodType.all_objects.filter(
             company_id=request.current_company_id
@@ -4115,7 +4614,7 @@ class MoodTypeCreateView(CompanyAdminRequiredMixin, View):
             mood_score=form.cleaned_data['mood_score'],
             is_active=True,
         )
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Tipo de humor criado com sucesso.')
         if is_ajax_request(request):
             return render_mood_types_table(request, request.current_company_id)
@@ -4151,7 +4650,7 @@ class MoodTypeUpdateView(CompanyAdminRequiredMixin, View):
         mood_type.sentiment = form.cleaned_data['sentiment']
         mood_type.mood_score = form.cleaned_data['mood_score']
         mood_type.save()
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Tipo de humor atualizado com sucesso.')
         if is_ajax_request(request):
             return render_mood_types_table(request, request.current_company_id)
@@ -4167,7 +4666,7 @@ class MoodTypeDeleteView(CompanyAdminRequiredMixin, View):
         )
         mood_type.is_active = not mood_type.is_active
         mood_type.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         if mood_type.is_active:
             messages.success(request, 'Tipo de humor ativado com sucesso.')
         else:
@@ -4181,7 +4680,7 @@ class ComplaintTypeListView(CompanyAdminRequiredMixin, View):
     template_name = 'complaint_types/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         complaint_types_qs = ComplaintType.all_objects.filter(
             company_id=request.current_company_id
@@ -4221,7 +4720,7 @@ class ComplaintTypeCreateView(CompanyAdminRequiredMixin, View):
             label=label,
             is_active=True,
         )
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Tipo de denúncia criado com sucesso.')
         if is_ajax_request(request):
             return render_complaint_types_table(request, request.current_company_id)
@@ -4254,7 +4753,7 @@ class ComplaintTypeUpdateView(CompanyAdminRequiredMixin, View):
 
         complaint_type.label = label
         complaint_type.save()
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Tipo de denúncia atualizado com sucesso.')
         if is_ajax_request(request):
             return render_complaint_types_table(request, request.current_company_id)
@@ -4270,7 +4769,7 @@ class ComplaintTypeDeleteView(CompanyAdminRequiredMixin, View):
         )
         complaint_type.is_active = not complaint_type.is_active
         complaint_type.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         if complaint_type.is_active:
             messages.success(request, 'Tipo de denúncia ativado com sucesso.')
         else:
@@ -4284,7 +4783,7 @@ class ComplaintListView(CompanyAdminRequiredMixin, View):
     template_name = 'complaints/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         filters = get_complaint_filters(request)
         complaints_all = load_complaints_for_company(request.current_company_id, filters=filters)
@@ -4349,18 +4848,26 @@ class ReportListView(CompanyAdminRequiredMixin, View):
             period_label = dict(Report.REPORT_TYPE_CHOICES).get(report_type, report_type)
             title = f'{template_label} ({period_label}) - {period_start.strftime("%d/%m/%Y")} a {period_end.strftime("%d/%m/%Y")}'
 
-        Report.all_objects.create(
+        report = Report.all_objects.create(
             company_id=request.current_company_id,
             report_template=report_template,
             report_type=report_type,
-            status='ready',
+            status='queued',
             title=title,
-            generated_at=timezone.now(),
             storage_path='',
             record_date=today,
             period_start=period_start,
             period_end=period_end,
         )
+        period_days = (period_end - period_start).days + 1
+        if period_days > settings.REPORT_SNAPSHOT_INLINE_MAX_DAYS and enqueue_report_snapshot(report):
+            messages.success(request, 'Relatorio em processamento. Ele fica disponivel na lista assim que estiver pronto.')
+            return redirect('reports-list')
+        try:
+            capture_report_snapshot(report)
+        except Exception:
+            Report.all_objects.filter(pk=report.pk).update(status='failed')
+            raise
         messages.success(request, 'Relatorio gerado com sucesso.')
         return redirect('reports-list')
 
@@ -4388,17 +4895,20 @@ class ReportDetailView(CompanyAdminRequiredMixin, View):
         'very_bad': 'Irritado',
     }
 
-    @staticmethod
-    def _build_metrics(company_id, report):
-        return build_report_metrics(company_id, report, ReportDetailView.SENTIMENT_LABELS)
-
     def get(self, request, report_id):
         report = get_object_or_404(
             Report.all_objects,
             pk=report_id,
             company_id=request.current_company_id,
         )
-        metrics = self._build_metrics(request.current_company_id, report)
+        if (
+            not report.metrics_snapshot
+            and report.status in {'queued', 'processing'}
+            and report.updated_at > timezone.now() - REPORT_SNAPSHOT_JOB_GRACE
+        ):
+            messages.warning(request, 'Relatorio ainda em processamento. Tente novamente em instantes.')
+            return redirect('reports-list')
+        metrics = get_report_metrics(report)
         recommendations = self._parse_recommendations(report.technical_recommendations)
         context = {
             'report': report,
@@ -4429,7 +4939,7 @@ class ReportDetailView(CompanyAdminRequiredMixin, View):
 
         action = (request.POST.get('action') or 'save').strip().lower()
         if action in {'generate_mood_analysis', 'generate_complaint_analysis', 'generate_recommendations'}:
-            metrics = self._build_metrics(request.current_company_id, report)
+            metrics = get_report_metrics(report)
             if action == 'generate_mood_analysis':
                 generated_text = self._generate_single_with_gemini('mood', report, metrics)
                 if not generated_text:
@@ -4516,9 +5026,6 @@ class ReportDetailView(CompanyAdminRequiredMixin, View):
         messages.success(request, 'Conteudo do relatorio atualizado com sucesso.')
         return redirect('reports-detail', report_id=report.id)
 
-    def _build_metrics(self, company_id, report):
-        return build_report_metrics(company_id, report, self.SENTIMENT_LABELS)
-
 
 class ReportCompareView(CompanyAdminRequiredMixin, View):
     template_name = 'reports/compare.html'
@@ -4892,7 +5399,7 @@ class ComplaintUpdateView(CompanyAdminRequiredMixin, View):
             action_note=action_note,
             created_by=request.user,
         )
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Denuncia atualizada com sucesso.')
         if is_ajax_request(request):
             return render_complaints_table(request, request.current_company_id)
@@ -4936,7 +5443,7 @@ class DepartmentListView(CompanyAdminRequiredMixin, View):
     template_name = 'departments/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         filters = get_departments_filters(request)
         departments_qs = get_departments_queryset(request.current_company_id, filters)
@@ -4997,7 +5504,7 @@ class DepartmentCreateView(CompanyAdminRequiredMixin, View):
             ghe_id=form.cleaned_data['ghe_id'],
             is_active=True,
         )
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Setor criado com sucesso.')
         if is_ajax_request(request):
             return render_departments_table(request, request.current_company_id)
@@ -5042,7 +5549,7 @@ class DepartmentUpdateView(CompanyAdminRequiredMixin, View):
         department.ghe_id = form.cleaned_data['ghe_id']
         department.is_active = form.cleaned_data['is_active']
         department.save()
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Setor atualizado com sucesso.')
         if is_ajax_request(request):
             return render_departments_table(request, request.current_company_id)
@@ -5058,7 +5565,7 @@ class DepartmentDeleteView(CompanyAdminRequiredMixin, View):
         )
         department.is_active = not department.is_active
         department.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         if department.is_active:
             messages.success(request, 'Setor ativado com sucesso.')
         else:
@@ -5072,7 +5579,7 @@ class GHEListView(CompanyAdminRequiredMixin, View):
     template_name = 'ghes/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         ghes_qs = GHE.all_objects.filter(company_id=request.current_company_id).order_by('name')
         page_obj = paginate_queryset(request, ghes_qs)
@@ -5133,7 +5640,7 @@ class GHECreateView(CompanyAdminRequiredMixin, View):
             name=name,
             is_active=True,
         )
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'GHE criado com sucesso.')
         if is_ajax_request(request):
             return render_ghes_table(request, request.current_company_id)
@@ -5172,7 +5679,7 @@ class GHEUpdateView(CompanyAdminRequiredMixin, View):
 
         ghe.name = name
         ghe.save()
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'GHE atualizado com sucesso.')
         if is_ajax_request(request):
             return render_ghes_table(request, request.current_company_id)
@@ -5188,7 +5695,7 @@ class GHEDeleteView(CompanyAdminRequiredMixin, View):
         )
         ghe.is_active = not ghe.is_active
         ghe.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         if ghe.is_active:
             messages.success(request, 'GHE ativado com sucesso.')
         else:
@@ -5202,7 +5709,7 @@ class JobFunctionListView(CompanyAdminRequiredMixin, View):
     template_name = 'job_functions/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         filters = get_job_functions_filters(request)
         job_functions_qs = get_job_functions_queryset(request.current_company_id, filters)
@@ -5284,7 +5791,7 @@ class JobFunctionCreateView(CompanyAdminRequiredMixin, View):
             job_function.ghes.set(ghes_ids)
         if departments_ids:
             job_function.departments.set(departments_ids)
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Funcao criada com sucesso.')
         if is_ajax_request(request):
             return render_job_functions_table(request, request.current_company_id)
@@ -5341,7 +5848,7 @@ class JobFunctionUpdateView(CompanyAdminRequiredMixin, View):
         job_function.save()
         job_function.ghes.set(ghes_ids)
         job_function.departments.set(departments_ids)
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Funcao atualizada com sucesso.')
         if is_ajax_request(request):
             return render_job_functions_table(request, request.current_company_id)
@@ -5357,7 +5864,7 @@ class JobFunctionDeleteView(CompanyAdminRequiredMixin, View):
         )
         job_function.is_active = not job_function.is_active
         job_function.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         if job_function.is_active:
             messages.success(request, 'Funcao ativada com sucesso.')
         else:
@@ -5367,11 +5874,56 @@ class JobFunctionDeleteView(CompanyAdminRequiredMixin, View):
         return redirect('job-functions-list')
 
 
+class StructureImportView(CompanyAdminRequiredMixin, View):
+    def post(self, request):
+        uploaded_file = request.FILES.get('file')
+        if not uploaded_file:
+            error = 'Selecione um arquivo CSV ou XLSX.'
+        else:
+            try:
+                job_id, stats = start_structure_import(request.current_company_id, uploaded_file)
+                error = None
+            except ValueError as exc:
+                error = str(exc)
+            except Exception:
+                # Sem RQ a importacao roda nesta requisicao: falha vira mensagem, nao 500.
+                logger.exception('Falha ao importar estrutura da empresa %s.', request.current_company_id)
+                error = 'Falha ao importar o arquivo. Verifique o formato e tente novamente.'
+
+        if is_ajax_request(request):
+            if error:
+                return JsonResponse({'error': error}, status=400)
+            payload = {'job_id': job_id, 'result': stats}
+            if job_id:
+                payload['status_url'] = reverse('structure-import-status', args=[job_id])
+            return JsonResponse(payload, status=202 if job_id else 200)
+
+        if error:
+            messages.error(request, error)
+        elif job_id:
+            messages.success(request, 'Importacao iniciada. Os registros aparecem conforme o arquivo e processado.')
+        else:
+            messages.success(
+                request,
+                f"Importacao concluida: {stats['ghes_created']} GHEs, {stats['departments_created']} setores "
+                f"e {stats['job_functions_created']} funcoes criados.",
+            )
+        return redirect('departments-list')
+
+
+class StructureImportStatusView(CompanyAdminRequiredMixin, View):
+    def get(self, request, job_id):
+        payload = get_structure_import_status(request.current_company_id, job_id)
+        if payload is None:
+            return JsonResponse({'error': 'Importacao nao encontrada.'}, status=404)
+        return JsonResponse(payload)
+
+
 class AlertSettingsView(CompanyAdminRequiredMixin, View):
     template_name = 'settings/alerts.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         company = get_object_or_404(Company, pk=request.current_company_id, is_active=True)
         settings_obj = ensure_alert_settings(company)
@@ -5418,7 +5970,7 @@ class AlertSettingsUpdateView(CompanyAdminRequiredMixin, View):
 
         if settings_obj.is_active and settings_obj.auto_alerts_enabled:
             evaluate_automatic_alerts(company)
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Configurações de alerta atualizadas com sucesso.')
         if is_ajax_request(request):
             return render_alert_settings_container(request, request.current_company_id)
@@ -5450,7 +6002,7 @@ class AlertRecipientCreateView(CompanyAdminRequiredMixin, View):
             email=email,
             is_active=form.cleaned_data['is_active'],
         )
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Destinatario de alerta criado com sucesso.')
         if is_ajax_request(request):
             return render_alert_settings_container(request, request.current_company_id)
@@ -5485,7 +6037,7 @@ class AlertRecipientUpdateView(CompanyAdminRequiredMixin, View):
         recipient.email = email
         recipient.is_active = form.cleaned_data['is_active']
         recipient.save()
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Destinatario atualizado com sucesso.')
         if is_ajax_request(request):
             return render_alert_settings_container(request, request.current_company_id)
@@ -5501,7 +6053,7 @@ class AlertRecipientDeleteView(CompanyAdminRequiredMixin, View):
         )
         recipient.is_active = not recipient.is_active
         recipient.save(update_fields=['is_active', 'updated_at'])
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         if recipient.is_active:
             messages.success(request, 'Destinatario ativado com sucesso.')
         else:
@@ -5515,7 +6067,7 @@ class HelpRequestListView(CompanyAdminRequiredMixin, View):
     template_name = 'help_requests/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         filters = get_help_request_filters(request)
         help_requests_qs = get_help_requests_queryset(request.current_company_id, filters)
@@ -5565,7 +6117,7 @@ class HelpRequestUpdateView(CompanyAdminRequiredMixin, View):
             created_by=request.user,
         )
         evaluate_automatic_alerts(help_request.company)
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Pedido de ajuda atualizado com sucesso.')
         if is_ajax_request(request):
             return render_help_requests_table(request, request.current_company_id)
@@ -5601,7 +6153,7 @@ class HelpRequestDeleteView(CompanyAdminRequiredMixin, View):
             company_id=request.current_company_id,
         )
         help_request.delete()
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Pedido de ajuda removido com sucesso.')
         return redirect('help-requests-list')
 
@@ -5610,7 +6162,7 @@ class InternalUserListView(CompanyAdminRequiredMixin, View):
     template_name = 'users/list.html'
 
     @method_decorator(vary_on_headers('Cookie'))
-    @method_decorator(cache_page(30))
+    @method_decorator(scoped_cache_page(30))
     def get(self, request):
         memberships_qs = (
             CompanyMembership.objects.select_related('user', 'company')
@@ -5675,7 +6227,7 @@ class InternalUserCreateView(CompanyAdminRequiredMixin, View):
                 is_active=True,
             )
 
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Usuario criado com sucesso.')
         return redirect('users-list')
 
@@ -5730,7 +6282,7 @@ class InternalUserUpdateView(CompanyAdminRequiredMixin, View):
             membership.is_active = form.cleaned_data['is_active']
             membership.save()
 
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Usuario atualizado com sucesso.')
         return redirect('users-list')
 
@@ -5754,6 +6306,6 @@ class InternalUserDeleteView(CompanyAdminRequiredMixin, View):
             return redirect('users-list')
 
         membership.delete()
-        cache.clear()
+        invalidate_page_cache(request.current_company_id)
         messages.success(request, 'Acesso removido com sucesso.')
         return redirect('users-list')
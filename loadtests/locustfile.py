@@ -0,0 +1,151 @@
+"""Cenarios de carga: toques de humor nos totens e o questionario da campanha.
+
+Uso (servidor local com SQLite ou PostgreSQL):
+
+    python manage.py prepare_load_test
+    locust -f loadtests/locustfile.py --host http://127.0.0.1:8000 \
+        --headless -u 200 -r 20 -t 5m --csv loadtests/results/run
+
+Ao final imprime p50/p95/p99 e taxa de erro por etapa e grava o resumo em
+``LOADTEST_REPORT`` (padrao ``loadtests/results/summary.json``).
+"""
+
+import json
+import os
+import random
+import uuid
+from pathlib import Path
+
+from locust import HttpUser, between, events, task
+
+
+CONFIG_PATH = Path(os.getenv('LOADTEST_CONFIG', Path(__file__).with_name('config.json')))
+REPORT_PATH = Path(os.getenv('LOADTEST_REPORT', Path(__file__).parent / 'results' / 'summary.json'))
+ANSWERS = ['Nunca', 'Raramente', 'As vezes', 'Frequentemente', 'Sempre']
+
+CONFIG = json.loads(CONFIG_PATH.read_text(encoding='utf-8'))
+
+
+def _csrf_headers(client, referer):
+    return {
+        'X-CSRFToken': client.cookies.get('csrftoken', ''),
+        'Referer': referer,
+    }
+
+
+class TotemUser(HttpUser):
+    """Um totem na troca de turno: fila de toques de humor em sequencia."""
+
+    weight = int(os.getenv('LOADTEST_TOTEM_WEIGHT', '4'))
+    wait_time = between(0.5, 3)
+
+    def on_start(self):
+        self.totem_slug = random.choice(CONFIG['totems'])
+        self.base_path = f"/totem/{CONFIG['company_slug']}/{self.totem_slug}/"
+        self.client.get(self.base_path, name='totem: pagina')
+        self.client.get(f'{self.base_path}bootstrap/', name='totem: bootstrap')
+
+    @task
+    def tap_mood(self):
+        headers = _csrf_headers(self.client, self.host + self.base_path)
+        headers['X-Requested-With'] = 'XMLHttpRequest'
+        with self.client.post(
+            f'{self.base_path}mood/',
+            data={
+                'mood_option': random.choice(CONFIG['mood_type_ids']),
+                'department_id': random.choice(CONFIG['department_ids']),
+            },
+            headers=headers,
+            name='totem: humor',
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200 or not response.json().get('ok'):
+                response.failure(f'HTTP {response.status_code}')
+
+
+class CampaignRespondent(HttpUser):
+    """Colaborador que abre o QR da campanha e responde o questionario inteiro."""
+
+    weight = int(os.getenv('LOADTEST_CAMPAIGN_WEIGHT', '1'))
+    wait_time = between(1, 5)
+
+    def on_start(self):
+        self.access_path = f"/campaigns/{CONFIG['campaign_uuid']}/"
+
+    def _post_step(self, step, data, expected_step):
+        headers = _csrf_headers(self.client, self.host + self.access_path)
+        with self.client.post(
+            self.access_path,
+            data={'step': step, **data},
+            headers=headers,
+            name=f'campanha: etapa {step}',
+            allow_redirects=False,
+            catch_response=True,
+        ) as response:
+            location = response.headers.get('Location', '')
+            if response.status_code != 302 or f'step={expected_step}' not in location:
+                response.failure(f'HTTP {response.status_code} {location}')
+                return False
+        return True
+
+    @task
+    def answer_campaign(self):
+        self.client.cookies.clear()
+        self.client.get(self.access_path, name='campanha: abertura')
+
+        profile = random.choice(CONFIG['campaign_profiles'])
+        cpf = f'{uuid.uuid4().int % 10 ** 11:011d}'
+        self.client.get(
+            f"{self.access_path}departments/?ghe_id={profile['ghe_id']}",
+            name='campanha: setores',
+        )
+        self.client.get(
+            f"{self.access_path}job-functions/?department_id={profile['department_id']}",
+            name='campanha: funcoes',
+        )
+        self.client.get(f'{self.access_path}cpf-check/?cpf={cpf}', name='campanha: cpf')
+
+        step_one = {
+            'cpf': cpf,
+            'age': random.randint(18, 65),
+            'first_name': 'Carga',
+            'sex': random.choice(['M', 'F']),
+            **profile,
+        }
+        if not self._post_step('1', step_one, expected_step=2):
+            return
+        for step in range(2, 9):
+            total_questions = CONFIG['campaign_step_questions'][str(step)]
+            answers = {f'q{index}': random.choice(ANSWERS) for index in range(1, total_questions + 1)}
+            if not self._post_step(str(step), answers, expected_step=step + 1):
+                return
+        if not self._post_step('9', {'comments': ''}, expected_step=10):
+            return
+        self.client.get(f'{self.access_path}?step=10', name='campanha: conclusao')
+
+
+@events.quitting.add_listener
+def write_summary(environment, **kwargs):
+    summary = {}
+    for entry in environment.stats.entries.values():
+        if not entry.num_requests:
+            continue
+        summary[entry.name] = {
+            'method': entry.method,
+            'requests': entry.num_requests,
+            'failures': entry.num_failures,
+            'error_rate': round(entry.num_failures / entry.num_requests, 4),
+            'p50_ms': entry.get_response_time_percentile(0.50),
+            'p95_ms': entry.get_response_time_percentile(0.95),
+            'p99_ms': entry.get_response_time_percentile(0.99),
+            'rps': round(entry.total_rps, 2),
+        }
+
+    print(f"{'etapa':<28} {'req':>7} {'erro%':>7} {'p50':>7} {'p95':>7} {'p99':>7}")
+    for name, row in sorted(summary.items()):
+        print(
+            f"{name:<28} {row['requests']:>7} {row['error_rate'] * 100:>6.2f}% "
+            f"{row['p50_ms']:>7} {row['p95_ms']:>7} {row['p99_ms']:>7}"
+        )
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding='utf-8')
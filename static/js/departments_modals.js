@@ -237,8 +237,122 @@
     }
   });
 
+  const IMPORT_POLL_INTERVAL_MS = 1500;
+  const IMPORT_DONE_STATUSES = ['finished', 'failed', 'canceled', 'stopped'];
+
+  const refreshTable = async () => {
+    const params = new URLSearchParams(getActiveFilterQuery());
+    params.set('partial', '1');
+    const response = await fetch(`${window.location.pathname}?${params.toString()}`, {
+      cache: 'no-store',
+      headers: {
+        'X-Requested-With': 'XMLHttpRequest',
+      },
+    });
+    if (response.ok) {
+      replaceTable(await response.text());
+    }
+  };
+
+  const setImportStatus = (form, message, tone = '') => {
+    const status = form.querySelector('[data-structure-import-status]');
+    if (!status) return;
+    status.className = tone ? `notice notice--${tone}` : 'notice';
+    status.textContent = message;
+    status.hidden = !message;
+  };
+
+  const describeImportResult = (result) => {
+    if (!result) return 'Importacao concluida.';
+    return (
+      `Importacao concluida: ${result.ghes_created || 0} GHEs, ${result.departments_created || 0} setores ` +
+      `e ${result.job_functions_created || 0} funcoes criados.`
+    );
+  };
+
+  const describeImportProgress = (payload) => {
+    const processed = payload.processed_rows || 0;
+    if (payload.total_rows === null || payload.total_rows === undefined) {
+      return payload.status === 'queued' ? 'Importacao na fila...' : 'Lendo o arquivo...';
+    }
+    return `Importando: ${processed} de ${payload.total_rows} linhas processadas.`;
+  };
+
+  const pollStructureImport = async (form, statusUrl) => {
+    for (;;) {
+      await new Promise((resolve) => window.setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+      const response = await fetch(statusUrl, {
+        cache: 'no-store',
+        headers: {
+          'X-Requested-With': 'XMLHttpRequest',
+        },
+      });
+      const payload = await response.json().catch(() => ({}));
+      if (!response.ok) {
+        throw new Error(payload.error || 'Nao foi possivel acompanhar a importacao.');
+      }
+      if (payload.error) {
+        throw new Error(payload.error);
+      }
+      if (IMPORT_DONE_STATUSES.includes(payload.status)) {
+        if (payload.status !== 'finished') {
+          throw new Error('A importacao foi interrompida. Tente novamente.');
+        }
+        return payload.result;
+      }
+      setImportStatus(form, describeImportProgress(payload));
+    }
+  };
+
+  const submitStructureImport = async (form) => {
+    setImportStatus(form, 'Enviando arquivo...');
+    const response = await fetch(form.action, {
+      method: 'POST',
+      body: new FormData(form),
+      headers: {
+        'X-Requested-With': 'XMLHttpRequest',
+      },
+    });
+    const payload = await response.json().catch(() => ({}));
+    if (!response.ok) {
+      throw new Error(payload.error || 'Falha ao importar o arquivo.');
+    }
+    let result = payload.result;
+    if (payload.status_url) {
+      setImportStatus(form, 'Importacao na fila...');
+      // Blocos ja gravados aparecem na tabela mesmo se um bloco posterior falhar.
+      try {
+        result = await pollStructureImport(form, payload.status_url);
+      } finally {
+        await refreshTable().catch(() => null);
+      }
+    } else {
+      await refreshTable().catch(() => null);
+    }
+    return describeImportResult(result);
+  };
+
   document.addEventListener('submit', async (event) => {
     const form = event.target;
+    if (form.matches('[data-structure-import-form]')) {
+      event.preventDefault();
+      // Botao desabilitado: ja ha uma importacao em andamento neste modal.
+      const restoreButton = setButtonLoading(event.submitter || form.querySelector('[type="submit"]'));
+      if (!restoreButton) return;
+      try {
+        const message = await submitStructureImport(form);
+        setImportStatus(form, '');
+        form.reset();
+        const modal = form.closest('.modal-backdrop');
+        if (modal) closeModal(modal);
+        showToast(message);
+      } catch (error) {
+        setImportStatus(form, error.message || 'Falha ao importar o arquivo.', 'error');
+      } finally {
+        restoreButton();
+      }
+      return;
+    }
     if (form.matches(filterFormSelector)) {
       if (form.hasAttribute('data-ajax-table-form')) {
         return;
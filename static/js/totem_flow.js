@@ -107,23 +107,176 @@
     helpDepartmentSelect.innerHTML = `<option value="">${state.label}</option>`;
   };
 
+  const syncUrl = moodForm ? moodForm.getAttribute('data-sync-url') || '' : '';
+  const outboxKey = `totem-outbox:${syncUrl}`;
+  const rejectedKey = `totem-outbox-rejected:${syncUrl}`;
+  const REJECTED_KEEP = 100;
+  const OUTBOX_BATCH_SIZE = 50;
+  const OUTBOX_FLUSH_INTERVAL_MS = 15000;
+  let outboxFlushing = false;
+
+  const readOutbox = () => {
+    try {
+      const items = JSON.parse(window.localStorage.getItem(outboxKey) || '[]');
+      return Array.isArray(items) ? items : [];
+    } catch (error) {
+      return [];
+    }
+  };
+
+  const writeOutbox = (items) => {
+    try {
+      window.localStorage.setItem(outboxKey, JSON.stringify(items));
+      return true;
+    } catch (error) {
+      return false;
+    }
+  };
+
+  const keepRejected = (items) => {
+    // Mantidos fora da fila (reenvio nao resolve), mas nunca descartados em silencio.
+    try {
+      const kept = JSON.parse(window.localStorage.getItem(rejectedKey) || '[]');
+      const merged = (Array.isArray(kept) ? kept : []).concat(items).slice(-REJECTED_KEEP);
+      window.localStorage.setItem(rejectedKey, JSON.stringify(merged));
+    } catch (error) {
+      // Sem espaco no armazenamento local: o aviso na tela continua valendo.
+    }
+  };
+
+  const newEventId = () => {
+    if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+      return window.crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+  };
+
+  const queueEvent = (type, fields) => {
+    if (!syncUrl) return false;
+    const items = readOutbox();
+    items.push({
+      id: newEventId(),
+      type,
+      occurred_at: new Date().toISOString(),
+      ...fields,
+    });
+    return writeOutbox(items);
+  };
+
+  const csrfToken = () => {
+    const input = document.querySelector('input[name="csrfmiddlewaretoken"]');
+    return input ? input.value : '';
+  };
+
+  // null quando o registro nao chegou a ser tratado (sem rede, erro 5xx ou
+  // resposta que nao e JSON, como a pagina de erro do proxy): o chamador guarda
+  // o evento na fila local. Erros de validacao (4xx com JSON) voltam no payload.
+  const postTotemForm = async (form) => {
+    if (!navigator.onLine) return null;
+    let response;
+    try {
+      response = await fetch(form.action, {
+        method: 'POST',
+        body: new FormData(form),
+        headers: {
+          'X-Requested-With': 'XMLHttpRequest',
+        },
+      });
+    } catch (error) {
+      return null;
+    }
+    if (response.status >= 500) return null;
+    try {
+      const payload = await response.json();
+      return payload && typeof payload === 'object' ? payload : null;
+    } catch (error) {
+      return null;
+    }
+  };
+
+  const flushOutbox = async () => {
+    if (!syncUrl || outboxFlushing) return;
+    const batch = readOutbox().slice(0, OUTBOX_BATCH_SIZE);
+    if (!batch.length) return;
+    outboxFlushing = true;
+    try {
+      const response = await fetch(syncUrl, {
+        method: 'POST',
+        body: JSON.stringify({ events: batch }),
+        headers: {
+          'Content-Type': 'application/json',
+          'X-CSRFToken': csrfToken(),
+          'X-Requested-With': 'XMLHttpRequest',
+        },
+      });
+      if (!response.ok) return;
+      const payload = await response.json();
+      const rejected = new Map((payload.rejected || []).map((item) => [item.id, item.message]));
+      const done = new Set([...(payload.accepted || []), ...(payload.duplicates || []), ...rejected.keys()]);
+      const pending = readOutbox();
+      if (rejected.size) {
+        keepRejected(
+          pending
+            .filter((item) => rejected.has(item.id))
+            .map((item) => ({ ...item, rejected_message: rejected.get(item.id) })),
+        );
+        const [firstMessage] = rejected.values();
+        showToast(
+          `${rejected.size} registro(s) salvos sem conexao foram recusados: ${firstMessage || 'dados invalidos.'}`,
+          'error',
+        );
+      }
+      writeOutbox(pending.filter((item) => !done.has(item.id)));
+    } catch (error) {
+      // Sem rede: os eventos continuam na fila local.
+    } finally {
+      outboxFlushing = false;
+    }
+  };
+
+  let bootstrapPromise = null;
+  const loadBootstrap = () => {
+    const url = helpGheSelect ? helpGheSelect.getAttribute('data-bootstrap-url') || '' : '';
+    if (!url) return Promise.resolve(null);
+    if (!bootstrapPromise) {
+      // ETag/Cache-Control: o navegador so baixa de novo quando o catalogo muda.
+      bootstrapPromise = fetch(url, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then((response) => (response.ok ? response.json() : null))
+        .catch(() => null)
+        .then((payload) => {
+          if (!payload) bootstrapPromise = null;
+          return payload;
+        });
+    }
+    return bootstrapPromise;
+  };
+
+  const fetchHelpDepartments = async (gheId) => {
+    const bootstrap = await loadBootstrap();
+    if (bootstrap && Array.isArray(bootstrap.ghes)) {
+      const ghe = bootstrap.ghes.find((item) => String(item.id) === String(gheId));
+      return ghe ? ghe.departments : [];
+    }
+    const url = helpGheSelect.getAttribute('data-departments-url') || '';
+    const response = await fetch(`${url}?ghe_id=${encodeURIComponent(gheId)}`, {
+      headers: { 'X-Requested-With': 'XMLHttpRequest' },
+    });
+    if (!response.ok) {
+      throw new Error('Falha ao carregar setores.');
+    }
+    const payload = await response.json();
+    return Array.isArray(payload.departments) ? payload.departments : [];
+  };
+
   const loadHelpDepartments = async (gheId) => {
     if (!helpDepartmentSelect || !helpGheSelect) return;
-    const url = helpGheSelect.getAttribute('data-departments-url') || '';
-    if (!gheId || !url) {
+    if (!gheId) {
       setHelpDepartmentState({ disabled: true, label: 'Selecione o GHE primeiro' });
       return;
     }
     setHelpDepartmentState({ disabled: true, label: 'Carregando...' });
     try {
-      const response = await fetch(`${url}?ghe_id=${encodeURIComponent(gheId)}`, {
-        headers: { 'X-Requested-With': 'XMLHttpRequest' },
-      });
-      if (!response.ok) {
-        throw new Error('Falha ao carregar setores.');
-      }
-      const payload = await response.json();
-      const departments = Array.isArray(payload.departments) ? payload.departments : [];
+      const departments = await fetchHelpDepartments(gheId);
       if (!departments.length) {
         setHelpDepartmentState({ disabled: true, label: 'Nenhum setor disponível' });
         return;
@@ -263,7 +416,7 @@
   }
 
   if (confirmComplaintSubmitButton) {
-    confirmComplaintSubmitButton.addEventListener('click', () => {
+    confirmComplaintSubmitButton.addEventListener('click', async () => {
       const departmentValue = complaintDepartmentSelect ? complaintDepartmentSelect.value.trim() : '';
       const extraValue = complaintExtraInput ? complaintExtraInput.value.trim() : '';
       if (!departmentValue) {
@@ -280,9 +433,35 @@
       if (complaintExtraHiddenInput) {
         complaintExtraHiddenInput.value = extraValue;
       }
+      if (!complaintForm) {
+        return;
+      }
       setButtonLoading(confirmComplaintSubmitButton, true, 'Enviando...');
-      if (complaintForm) {
-        complaintForm.submit();
+      try {
+        let message = 'Denuncia registrada com sucesso.';
+        const payload = await postTotemForm(complaintForm);
+        if (payload) {
+          if (!payload.ok) {
+            throw new Error(payload.message || 'Nao foi possivel registrar a denuncia.');
+          }
+          message = payload.message || message;
+        } else if (!queueEvent('complaint', {
+          complaint_category: complaintInput ? complaintInput.value : '',
+          complaint_department_name: departmentValue,
+          complaint_additional_details: extraValue,
+          details: (complaintForm.querySelector('[name="details"]')?.value || '').trim(),
+        })) {
+          throw new Error('Sem conexao e sem espaco para guardar a denuncia neste totem.');
+        }
+        closeComplaintModal();
+        clearSelection(complaintButtons, complaintInput);
+        complaintForm.reset();
+        showToast(message);
+        showStep('intro');
+      } catch (error) {
+        showAlert(error.message || 'Nao foi possivel registrar a denuncia.');
+      } finally {
+        setButtonLoading(confirmComplaintSubmitButton, false);
       }
     });
   }
@@ -341,19 +520,24 @@
       if (moodForm) {
         try {
           setButtonLoading(confirmMoodSubmitButton, true, 'Registrando...');
-          const response = await fetch(moodForm.action, {
-            method: 'POST',
-            body: new FormData(moodForm),
-            headers: {
-              'X-Requested-With': 'XMLHttpRequest',
-            },
+          let message = 'Humor registrado com sucesso.';
+          const queueMood = () => queueEvent('mood', {
+            mood_option: moodInput ? moodInput.value : '',
+            department_id: moodDepartmentSelect.value,
           });
-          const payload = await response.json();
-          if (!response.ok || !payload.ok) {
-            throw new Error(payload.message || 'Nao foi possivel registrar o humor.');
+          // Online vai direto para /mood/ (que pode usar o stream do Redis);
+          // a fila local guarda o toque quando o servidor nao o tratou.
+          const payload = await postTotemForm(moodForm);
+          if (payload) {
+            if (!payload.ok) {
+              throw new Error(payload.message || 'Nao foi possivel registrar o humor.');
+            }
+            message = payload.message || message;
+          } else if (!queueMood()) {
+            throw new Error('Sem conexao e sem espaco para guardar o registro neste totem.');
           }
 
-          showToast(payload.message || 'Humor registrado com sucesso.');
+          showToast(message);
           closeMoodDepartmentModal();
           clearSelection(moodButtons, moodInput);
           if (moodDepartmentInput) {
@@ -393,6 +577,43 @@
 
   consumeInlineMessages();
 
+  const helpForm = document.querySelector('form[action*="/help/"]');
+  if (helpForm) {
+    helpForm.addEventListener('submit', async (event) => {
+      event.preventDefault();
+      setButtonLoading(helpSubmitButton, true, 'Enviando...');
+      try {
+        let message = 'Pedido de ajuda registrado. Nossa equipe vai ate voce.';
+        const payload = await postTotemForm(helpForm);
+        if (payload) {
+          if (!payload.ok) {
+            throw new Error(payload.message || 'Nao foi possivel registrar o pedido de ajuda.');
+          }
+          message = payload.message || message;
+        } else if (!queueEvent('help', {
+          requester_name: (helpRequesterInput?.value || '').trim(),
+          department_name: (helpForm.querySelector('[name="department_name"]')?.value || '').trim(),
+        })) {
+          throw new Error('Sem conexao e sem espaco para guardar o pedido neste totem.');
+        }
+        helpForm.reset();
+        showToast(message);
+        showStep('intro');
+      } catch (error) {
+        showAlert(error.message || 'Nao foi possivel registrar o pedido de ajuda.');
+      } finally {
+        setButtonLoading(helpSubmitButton, false);
+        updateHelpSubmitState();
+      }
+    });
+  }
+
+  if (syncUrl) {
+    window.addEventListener('online', flushOutbox);
+    window.setInterval(flushOutbox, OUTBOX_FLUSH_INTERVAL_MS);
+    flushOutbox();
+  }
+
   if (helpGheSelect && helpDepartmentSelect) {
     helpGheSelect.addEventListener('change', (event) => {
       loadHelpDepartments(event.target.value);